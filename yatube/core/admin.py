@@ -0,0 +1,18 @@
+from django.contrib import admin
+
+from .models import Task
+
+
+@admin.register(Task)
+class TaskAdmin(admin.ModelAdmin):
+    list_display = ('pk', 'name', 'status', 'attempts', 'run_at', 'finished')
+    list_filter = ('status', 'name')
+    search_fields = ('name', 'key')
+    readonly_fields = ('created', 'finished', 'locked_at', 'last_error')
+    actions = ('retry',)
+
+    def retry(self, request, queryset):
+        queryset.filter(status=Task.FAILED).update(
+            status=Task.PENDING, attempts=0, finished=None
+        )
+    retry.short_description = 'Повторить упавшие задачи'
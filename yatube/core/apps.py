@@ -1,5 +1,36 @@
 from django.apps import AppConfig
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.module_loading import autodiscover_modules
+
+PER_PROCESS_CACHES = (
+    'django.core.cache.backends.dummy.DummyCache',
+    'django.core.cache.backends.locmem.LocMemCache',
+)
+
+
+def check_caches():
+    per_process = sorted(
+        alias for alias, cache in settings.CACHES.items()
+        if cache['BACKEND'] in PER_PROCESS_CACHES
+    )
+    if per_process:
+        raise ImproperlyConfigured(
+            'CACHES_SHARED is set, but these caches are per process: '
+            f'{", ".join(per_process)}.'
+        )
 
 
 class CoreConfig(AppConfig):
     name = 'core'
+
+    def ready(self):
+        from . import metrics, signals, templating  # noqa: F401
+
+        if settings.CACHES_SHARED:
+            check_caches()
+        metrics.instrument_templates()
+        if settings.TEMPLATES_WARMUP:
+            templating.warm_up()
+        # Register the @task functions and the page fragments of every app.
+        autodiscover_modules('tasks', 'fragments')
@@ -0,0 +1,142 @@
+"""ASGI front for the Django WSGI handler.
+
+Django 2.2 cannot run coroutine views, so the handler keeps the views
+synchronous and runs each of them in a bounded thread pool. Reading the
+request body and writing the response happen on the event loop, so a
+slow client only costs a socket, not one of the worker threads.
+"""
+import asyncio
+import io
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+# Headers WSGI passes without the HTTP_ prefix.
+UNPREFIXED_HEADERS = {'CONTENT_TYPE', 'CONTENT_LENGTH'}
+
+
+def build_environ(scope, body):
+    server = scope.get('server') or ('localhost', 80)
+    client = scope.get('client') or ('', 0)
+    # PEP 3333 strings are bytes decoded as latin-1.
+    path = scope['path'].encode('utf-8').decode('latin-1')
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', ''),
+        'PATH_INFO': path,
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1]),
+        'REMOTE_ADDR': client[0],
+        'SERVER_PROTOCOL': f'HTTP/{scope.get("http_version", "1.1")}',
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+    for name, value in scope.get('headers', []):
+        key = name.decode('latin-1').upper().replace('-', '_')
+        if key not in UNPREFIXED_HEADERS:
+            key = f'HTTP_{key}'
+        value = value.decode('latin-1')
+        if key in environ:
+            separator = '; ' if key == 'HTTP_COOKIE' else ','
+            value = environ[key] + separator + value
+        environ[key] = value
+    return environ
+
+
+def response_start(status, headers):
+    return {
+        'type': 'http.response.start',
+        'status': int(status.split(' ', 1)[0]),
+        'headers': [
+            (name.lower().encode('latin-1'), value.encode('latin-1'))
+            for name, value in headers
+        ],
+    }
+
+
+class ThreadPoolASGIHandler:
+    def __init__(self, wsgi_application, max_workers):
+        self.wsgi_application = wsgi_application
+        self.executor = ThreadPoolExecutor(
+            max_workers, thread_name_prefix='asgi'
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self.lifespan(receive, send)
+        elif scope['type'] == 'http':
+            await self.http(scope, receive, send)
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                self.executor.shutdown(wait=True)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def read_body(self, receive):
+        body = []
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                return None
+            body.append(message.get('body', b''))
+            if not message.get('more_body', False):
+                return b''.join(body)
+
+    async def http(self, scope, receive, send):
+        body = await self.read_body(receive)
+        if body is None:
+            return
+        loop = asyncio.get_running_loop()
+        response = await loop.run_in_executor(
+            self.executor, self.run, build_environ(scope, body), send, loop
+        )
+        if response is not None:
+            start, content = response
+            await send(start)
+            await send({'type': 'http.response.body', 'body': content})
+
+    def run(self, environ, send, loop):
+        """Call the WSGI application in a worker thread.
+
+        Buffered responses are handed back to the event loop to be sent.
+        Streaming ones are sent from here: they read from a database
+        cursor that belongs to this thread, so they keep it to the end.
+        """
+        started = {}
+
+        def start_response(status, headers, exc_info=None):
+            started['message'] = response_start(status, headers)
+
+        result = self.wsgi_application(environ, start_response)
+        try:
+            if not getattr(result, 'streaming', False):
+                return started['message'], b''.join(result)
+
+            def send_sync(message):
+                asyncio.run_coroutine_threadsafe(send(message), loop).result()
+
+            send_sync(started['message'])
+            for chunk in result:
+                if chunk:
+                    send_sync({
+                        'type': 'http.response.body',
+                        'body': chunk,
+                        'more_body': True,
+                    })
+            send_sync({'type': 'http.response.body'})
+            return None
+        finally:
+            # Fires request_finished in the thread that owns the
+            # request's database connections.
+            if hasattr(result, 'close'):
+                result.close()
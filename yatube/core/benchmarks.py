@@ -0,0 +1,58 @@
+import math
+import resource
+import subprocess
+
+
+def percentiles(timings):
+    """p50/p95/p99 of millisecond timings, rounded for reports.
+
+    Nearest rank on the sorted samples: statistics.quantiles needs
+    Python 3.8.
+    """
+    ordered = sorted(timings)
+
+    def rank(percent):
+        index = max(math.ceil(percent / 100 * len(ordered)), 1) - 1
+        return round(ordered[index], 2)
+
+    return {'p50_ms': rank(50), 'p95_ms': rank(95), 'p99_ms': rank(99)}
+
+
+def server_timing_ms(header, metric):
+    """Duration of ``metric`` in a Server-Timing header, if present."""
+    for entry in header.split(','):
+        name, *params = entry.strip().split(';')
+        if name != metric:
+            continue
+        for param in params:
+            key, _, value = param.partition('=')
+            if key == 'dur':
+                return float(value)
+    return None
+
+
+def import_times(stderr):
+    """Self time in ms per top-level package from ``-X importtime`` output."""
+    packages = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or '[us]' in line:
+            continue
+        self_us, _, name = line[len('import time:'):].split('|')
+        package = name.strip().split('.')[0]
+        packages[package] = packages.get(package, 0) + int(self_us) / 1000
+    return packages
+
+
+def max_rss_mb():
+    # ru_maxrss is in kilobytes on Linux.
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+def current_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
@@ -0,0 +1,110 @@
+"""Cache reads that let one worker at a time recompute a value.
+
+Values are stored with the time they go stale (the soft TTL) and how
+long they took to compute, and are kept ``CACHE_STALE_TIMEOUT`` seconds
+longer (the hard TTL). Reading a stale value takes a lock with
+``cache.add``; the worker holding it recomputes the value while the others
+keep serving the stale one. Values are also refreshed early, with a
+probability growing as their expiry nears and with their compute time
+(XFetch), so hot keys rarely go stale at all. On a miss the workers
+without the lock poll for up to ``CACHE_LOCK_WAIT`` seconds, holding
+their request thread, before computing the value themselves.
+
+Values must be dropped with ``invalidate``: a value computed while it
+ran is then not stored, so a write cannot be undone by a computation
+that read the database before it.
+
+The lock and the invalidation only reach the processes sharing the
+cache, so with several workers it must be a shared backend; the prod
+profile refuses to start otherwise (``CACHES_SHARED``).
+"""
+import math
+import random
+import time
+import uuid
+
+from django.conf import settings
+
+from .metrics import count_cache
+from .routers import use_primary
+
+# Seconds between checks for a value another worker is computing.
+POLL_INTERVAL = 0.02
+
+
+def lock_key(key):
+    return f'{key}:lock'
+
+
+def generation_key(key):
+    return f'{key}:generation'
+
+
+def invalidate(cache, keys):
+    """Drop the values and void the computations of them in progress."""
+    cache.delete_many(keys)
+    # Computations hold the lock at most this long, so no older one can
+    # still be running when the generation expires.
+    cache.set_many(
+        {generation_key(key): uuid.uuid4().hex for key in keys},
+        settings.CACHE_LOCK_TIMEOUT,
+    )
+
+
+def expiring(stale_at, cost):
+    # -log(u) for u in (0, 1] is exponentially distributed with mean 1.
+    early = cost * settings.CACHE_EARLY_REFRESH * -math.log(
+        1 - random.random()
+    )
+    return time.time() + early >= stale_at
+
+
+def get_or_compute(cache, key, compute, timeout, name):
+    """The value under ``key``, computed by ``compute`` when needed.
+
+    A ``compute`` result of None is returned without being cached. Values
+    that are cached are computed from the primary database.
+    """
+    found = cache.get_many([key, generation_key(key)])
+    entry, generation = found.get(key), found.get(generation_key(key))
+    if entry is not None:
+        value, stale_at, cost = entry
+        if not expiring(stale_at, cost) or not cache.add(
+            lock_key(key), 1, settings.CACHE_LOCK_TIMEOUT
+        ):
+            count_cache(name, True)
+            return value
+    elif not cache.add(lock_key(key), 1, settings.CACHE_LOCK_TIMEOUT):
+        entry = wait(cache, key)
+        count_cache(name, entry is not None)
+        return entry[0] if entry is not None else compute()
+    count_cache(name, False)
+    try:
+        started = time.perf_counter()
+        with use_primary():
+            value = compute()
+        # An invalidation during the computation may have come after the
+        # reads it made, so the value is returned but not stored.
+        invalidated = cache.get(generation_key(key)) != generation
+        if value is not None and not invalidated:
+            cost = time.perf_counter() - started
+            cache.set(
+                key,
+                (value, time.time() + timeout, cost),
+                timeout + settings.CACHE_STALE_TIMEOUT,
+            )
+    finally:
+        cache.delete(lock_key(key))
+    return value
+
+
+def wait(cache, key):
+    deadline = time.monotonic() + settings.CACHE_LOCK_WAIT
+    while time.monotonic() < deadline:
+        time.sleep(POLL_INTERVAL)
+        entry = cache.get(key)
+        # No lock and no value: the worker gave up or got an uncacheable
+        # result.
+        if entry is not None or cache.get(lock_key(key)) is None:
+            return entry
+    return None
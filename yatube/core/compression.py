@@ -0,0 +1,107 @@
+"""Content negotiation and compression for responses and static files.
+
+Brotli is used when the ``brotli`` package is installed, gzip otherwise.
+"""
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# File suffixes of the precompressed variants, by Content-Encoding.
+SUFFIXES = {'br': '.br', 'gzip': '.gz'}
+
+COMPRESSIBLE_TYPES = (
+    'application/javascript',
+    'application/json',
+    'application/xml',
+    'image/svg+xml',
+    'image/x-icon',
+)
+
+
+def encodings():
+    """Supported encodings, most preferred first."""
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def accepted_encodings(accept_encoding):
+    """Encodings of an Accept-Encoding header that the client allows."""
+    accepted = set()
+    for item in accept_encoding.split(','):
+        coding, _, params = item.strip().partition(';')
+        quality = params.strip()
+        if quality.startswith('q='):
+            try:
+                if float(quality[2:]) == 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(coding.strip().lower())
+    return accepted
+
+
+def choose_encoding(request, available=None):
+    """The preferred encoding among ``available`` the request accepts."""
+    accepted = accepted_encodings(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+    for encoding in available or encodings():
+        if encoding in accepted:
+            return encoding
+    return None
+
+
+def is_compressible(content_type):
+    content_type = content_type.split(';')[0].strip().lower()
+    return (
+        content_type.startswith('text/')
+        or content_type in COMPRESSIBLE_TYPES
+    )
+
+
+def compress(data, encoding, best=False):
+    """``data`` compressed with ``encoding``; ``best`` for static files."""
+    if encoding == 'br':
+        quality = 11 if best else settings.COMPRESSION_BROTLI_QUALITY
+        return brotli.compress(data, quality=quality)
+    level = 9 if best else settings.COMPRESSION_GZIP_LEVEL
+    # mtime=0 keeps the output identical for identical input.
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+# Compressed pages by (page cache key, encoding), least recent first.
+_compressed = OrderedDict()
+_lock = threading.Lock()
+
+
+def compress_cached(key, data, encoding):
+    """``compress`` memoized under a page cache key.
+
+    Only for pages every client with that key gets byte for byte, which
+    the page cache marks with ``shared_content_key``; others would never
+    be hit and push those out. A page refreshed under the same key has a
+    new digest, so it is compressed again.
+    """
+    digest = hashlib.md5(data).digest()
+    with _lock:
+        entry = _compressed.get((key, encoding))
+        if entry is not None and entry[0] == digest:
+            _compressed.move_to_end((key, encoding))
+            return entry[1]
+    compressed = compress(data, encoding)
+    with _lock:
+        _compressed[(key, encoding)] = (digest, compressed)
+        _compressed.move_to_end((key, encoding))
+        while len(_compressed) > settings.COMPRESSION_CACHE_SIZE:
+            _compressed.popitem(last=False)
+    return compressed
+
+
+def clear():
+    with _lock:
+        _compressed.clear()
@@ -0,0 +1,265 @@
+import json
+import statistics
+import time
+from collections import namedtuple
+from datetime import datetime, timezone
+
+from core.benchmarks import (current_commit, max_rss_mb, percentiles,
+                             server_timing_ms)
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import get_resolver, reverse
+from posts.models import Group, Post
+
+User = get_user_model()
+
+BENCH_USERNAME = 'benchmark'
+BENCH_PASSWORD = 'benchmark-password'
+# URL namespaces the workload has to cover completely.
+NAMESPACES = ('posts', 'users')
+
+
+def url_names(namespace):
+    resolver = get_resolver().namespace_dict[namespace][1]
+    return {
+        pattern.name for pattern in resolver.url_patterns if pattern.name
+    }
+
+
+Step = namedtuple(
+    'Step', 'label url_name args data method client',
+    defaults=((), None, 'get', 'anonymous'),
+)
+
+
+class Workload:
+    """Scripted requests to every named URL of ``NAMESPACES``.
+
+    A step's client is ``'anonymous'`` or ``'author'``, shared by the
+    steps, or ``'guest'`` and ``'fresh'``: a new anonymous or freshly
+    logged in client per request, for views that start or end a session.
+    """
+
+    def __init__(self, writes=True):
+        self.writes = writes
+        self.author, created = User.objects.get_or_create(
+            username=BENCH_USERNAME
+        )
+        if created:
+            self.author.set_password(BENCH_PASSWORD)
+            self.author.save()
+        self.post = Post.objects.filter(author=self.author).last()
+        if self.post is None:
+            self.post = Post.objects.create(
+                author=self.author, text='Пост для замеров производительности'
+            )
+        self.group = Group.objects.order_by('pk').last()
+        latest = Post.objects.order_by('-pk').values_list(
+            'author__username', flat=True
+        ).first()
+        self.username = latest or self.author.username
+
+    def steps(self):
+        post = (self.post.pk,)
+        author = (self.username,)
+        yield Step('index', 'posts:index')
+        yield Step('index (auth)', 'posts:index', client='author')
+        yield Step('index page 50', 'posts:index', data={'page': 50})
+        if self.group is not None:
+            yield Step('group', 'posts:group_list', (self.group.slug,))
+            yield Step('api group', 'posts:api_group', (self.group.slug,))
+        yield Step('profile', 'posts:profile', author)
+        yield Step('post', 'posts:post_detail', post)
+        yield Step('search', 'posts:search', data={'q': 'пост'})
+        yield Step('api index', 'posts:api_index')
+        yield Step('api profile', 'posts:api_profile', author)
+        yield Step('follow index', 'posts:follow_index', client='author')
+        yield Step('create form', 'posts:post_create', client='author')
+        yield Step('edit form', 'posts:post_edit', post, client='author')
+        if self.writes:
+            yield Step(
+                'create', 'posts:post_create',
+                data={'text': 'Новый пост из замера'},
+                method='post', client='author',
+            )
+            yield Step(
+                'edit', 'posts:post_edit', post, {'text': self.post.text},
+                method='post', client='author',
+            )
+        yield from self.follow_steps()
+        yield Step('signup form', 'users:signup')
+        yield Step('login form', 'users:login')
+        yield Step(
+            'login', 'users:login',
+            data={'username': BENCH_USERNAME, 'password': BENCH_PASSWORD},
+            method='post', client='guest',
+        )
+        yield Step('logout', 'users:logout', client='fresh')
+        yield Step('password reset form', 'users:password_reset_form')
+        yield Step(
+            'password reset', 'users:password_reset_form',
+            data={'email': 'nobody@example.com'}, method='post',
+        )
+        yield Step('password reset done', 'users:password_reset_done')
+        yield Step(
+            'password change form', 'users:password_change_form',
+            client='author',
+        )
+        yield Step(
+            'password change done', 'users:password_change_done',
+            client='author',
+        )
+
+    def follow_steps(self):
+        yield Step(
+            'follow author', 'posts:profile_follow', (self.username,),
+            method='post', client='author',
+        )
+        yield Step(
+            'unfollow author', 'posts:profile_unfollow', (self.username,),
+            method='post', client='author',
+        )
+        if self.group is not None:
+            yield Step(
+                'follow group', 'posts:group_follow', (self.group.slug,),
+                method='post', client='author',
+            )
+            yield Step(
+                'unfollow group', 'posts:group_unfollow', (self.group.slug,),
+                method='post', client='author',
+            )
+
+    def check_coverage(self, steps):
+        covered = {step.url_name for step in steps}
+        missing = sorted(
+            f'{namespace}:{name}'
+            for namespace in NAMESPACES
+            for name in url_names(namespace)
+            if f'{namespace}:{name}' not in covered
+        )
+        if missing:
+            raise CommandError(
+                f'Нет сценария для адресов: {", ".join(missing)}'
+            )
+
+
+class Command(BaseCommand):
+    help = (
+        'Прогоняет сценарий запросов ко всем адресам posts и users и '
+        'сохраняет перцентили задержки, число запросов к БД и память в '
+        'JSON. Сравнение с прошлым прогоном: --compare old.json.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument('--warmup', type=int, default=2)
+        parser.add_argument(
+            '--skip-writes', action='store_true',
+            help='Не создавать и не изменять посты.',
+        )
+        parser.add_argument('--json', dest='json_path')
+        parser.add_argument('--compare', dest='compare_path')
+
+    def handle(self, *args, **options):
+        workload = Workload(writes=not options['skip_writes'])
+        steps = list(workload.steps())
+        workload.check_coverage(steps)
+        clients = {'anonymous': Client(), 'author': Client()}
+        clients['author'].force_login(workload.author)
+        report = {
+            'commit': current_commit(),
+            'created': datetime.now(timezone.utc).isoformat(),
+            'vendor': connection.vendor,
+            'posts': Post.objects.count(),
+            'repeat': options['repeat'],
+            'endpoints': {},
+        }
+        email = 'django.core.mail.backends.locmem.EmailBackend'
+        with override_settings(
+            EMAIL_BACKEND=email, METRICS_SERVER_TIMING=True
+        ):
+            for step in steps:
+                result = self.measure(clients, workload, step, options)
+                report['endpoints'][step.label] = result
+                self.write_row(step.label, result)
+        report['max_rss_mb'] = max_rss_mb()
+        self.stdout.write(f'max RSS: {report["max_rss_mb"]} MB')
+        if options['compare_path']:
+            self.compare(report, options['compare_path'])
+        if options['json_path']:
+            with open(options['json_path'], 'w') as file:
+                json.dump(report, file, ensure_ascii=False, indent=2)
+
+    def measure(self, clients, workload, step, options):
+        path = reverse(step.url_name, args=step.args)
+        timings = []
+        render_timings = []
+        queries = []
+        statuses = set()
+        for number in range(options['warmup'] + options['repeat']):
+            if step.client in ('guest', 'fresh'):
+                browser = Client()
+                if step.client == 'fresh':
+                    browser.force_login(workload.author)
+            else:
+                browser = clients[step.client]
+            request = getattr(browser, step.method)
+            with CaptureQueriesContext(connection) as context:
+                started = time.perf_counter()
+                response = request(path, step.data)
+                if response.streaming:
+                    b''.join(response.streaming_content)
+                elapsed = (time.perf_counter() - started) * 1000
+            if number >= options['warmup']:
+                timings.append(elapsed)
+                queries.append(len(context))
+                statuses.add(response.status_code)
+                # PerformanceMiddleware reports template time; zero when
+                # the page came from a cache.
+                render = server_timing_ms(
+                    response.get('Server-Timing', ''), 'tpl'
+                )
+                if render is not None:
+                    render_timings.append(render)
+        return {
+            'method': step.method.upper(),
+            'path': path,
+            'status': sorted(statuses),
+            **percentiles(timings),
+            'render_p50_ms': (
+                round(statistics.median(render_timings), 2)
+                if render_timings else None
+            ),
+            'queries': max(queries),
+            'rss_mb': max_rss_mb(),
+        }
+
+    def write_row(self, label, result):
+        self.stdout.write(
+            f'{label:<24} p50 {result["p50_ms"]:>8} ms  '
+            f'p99 {result["p99_ms"]:>8} ms  '
+            f'render {result["render_p50_ms"]} ms  '
+            f'{result["queries"]:>3} queries  {result["status"]}'
+        )
+
+    def compare(self, report, path):
+        with open(path) as file:
+            previous = json.load(file)
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f'Сравнение с {previous.get("commit") or path}'
+        ))
+        for label, result in report['endpoints'].items():
+            old = previous['endpoints'].get(label)
+            if old is None:
+                continue
+            self.stdout.write(
+                f'{label:<24} '
+                f'p50 {old["p50_ms"]} -> {result["p50_ms"]} ms  '
+                f'p99 {old["p99_ms"]} -> {result["p99_ms"]} ms  '
+                f'render {old.get("render_p50_ms")} -> '
+                f'{result["render_p50_ms"]} ms  '
+                f'queries {old["queries"]} -> {result["queries"]}'
+            )
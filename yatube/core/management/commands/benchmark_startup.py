@@ -0,0 +1,101 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from core.benchmarks import current_commit, import_times
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# What a worker does before serving: run checks, import the WSGI app.
+ENTRY_POINTS = {
+    'check': ['manage.py', 'check'],
+    'wsgi': ['-c', 'import yatube.wsgi'],
+}
+
+
+def boot(profile, arguments):
+    """Run one cold start; returns wall ms and import ms per package."""
+    env = {
+        **os.environ,
+        'DJANGO_ENV': profile,
+        'DJANGO_SETTINGS_MODULE': 'yatube.settings',
+    }
+    env.setdefault('DJANGO_SECRET_KEY', 'startup-benchmark')
+    # prod requires shared caches; booting does not connect to them.
+    for alias in ('DEFAULT', 'FEED', 'SESSION'):
+        env.setdefault(
+            f'{alias}_CACHE_BACKEND',
+            'django.core.cache.backends.memcached.MemcachedCache',
+        )
+        env.setdefault(f'{alias}_CACHE_LOCATION', '127.0.0.1:11211')
+    started = time.perf_counter()
+    process = subprocess.run(
+        [sys.executable, '-X', 'importtime', *arguments],
+        cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+    )
+    elapsed = (time.perf_counter() - started) * 1000
+    if process.returncode:
+        raise CommandError(
+            f'{profile}: {" ".join(arguments)} завершился с ошибкой:\n'
+            f'{process.stderr[-2000:]}'
+        )
+    return elapsed, import_times(process.stderr)
+
+
+class Command(BaseCommand):
+    help = (
+        'Замеряет холодный старт воркера в каждом профиле настроек: '
+        '`manage.py check` и импорт WSGI-приложения под -X importtime.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--profiles', nargs='+', default=['dev', 'prod'],
+            choices=['dev', 'test', 'prod'],
+        )
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument(
+            '--top', type=int, default=8,
+            help='Сколько самых долгих в импорте пакетов показать.',
+        )
+        parser.add_argument('--json', dest='json_path')
+
+    def handle(self, *args, **options):
+        report = {'commit': current_commit(), 'profiles': {}}
+        for profile in options['profiles']:
+            self.stdout.write(self.style.MIGRATE_HEADING(profile))
+            report['profiles'][profile] = {
+                name: self.measure(profile, name, arguments, options)
+                for name, arguments in ENTRY_POINTS.items()
+            }
+        if options['json_path']:
+            with open(options['json_path'], 'w') as file:
+                json.dump(report, file, ensure_ascii=False, indent=2)
+
+    def measure(self, profile, name, arguments, options):
+        walls = []
+        imports = []
+        for _ in range(options['repeat']):
+            wall, packages = boot(profile, arguments)
+            walls.append(wall)
+            imports.append(sum(packages.values()))
+        top = sorted(packages.items(), key=lambda item: -item[1])
+        result = {
+            'wall_ms': round(statistics.median(walls), 1),
+            'import_ms': round(statistics.median(imports), 1),
+            'packages': {
+                package: round(ms, 1)
+                for package, ms in top[:options['top']]
+            },
+        }
+        self.stdout.write(
+            f'  {name:<6} wall {result["wall_ms"]:>7} ms  '
+            f'imports {result["import_ms"]:>7} ms'
+        )
+        self.stdout.write('    ' + ', '.join(
+            f'{package} {ms}' for package, ms in result['packages'].items()
+        ))
+        return result
@@ -0,0 +1,181 @@
+import asyncio
+import json
+import time
+from importlib import import_module
+from urllib.parse import urlsplit
+
+from core.benchmarks import percentiles
+from django.conf import settings
+from django.contrib.auth import (BACKEND_SESSION_KEY, HASH_SESSION_KEY,
+                                 SESSION_KEY, get_user_model)
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+from django.utils.crypto import get_random_string
+from posts.models import Group, Post
+
+READ_CHUNK = 1024
+OK_STATUSES = (200, 302)
+
+
+def feed_paths():
+    """Paths of the read-only feed views, filled in from the database."""
+    post = Post.objects.select_related('author', 'group').last()
+    if post is None:
+        raise CommandError('Нет постов, сначала запустите seed_posts.')
+    group = post.group or Group.objects.first()
+    paths = [
+        reverse('posts:index'),
+        reverse('posts:profile', args=(post.author.username,)),
+        reverse('posts:post_detail', args=(post.pk,)),
+    ]
+    if group is not None:
+        paths.append(reverse('posts:group_list', args=(group.slug,)))
+    return paths
+
+
+def writer_cookies(username):
+    """Session and CSRF cookies of a logged-in ``username``."""
+    try:
+        user = get_user_model().objects.get(username=username)
+    except get_user_model().DoesNotExist:
+        raise CommandError(f'Нет пользователя {username}.')
+    session = import_module(settings.SESSION_ENGINE).SessionStore()
+    session[SESSION_KEY] = str(user.pk)
+    session[BACKEND_SESSION_KEY] = settings.AUTHENTICATION_BACKENDS[0]
+    session[HASH_SESSION_KEY] = user.get_session_auth_hash()
+    session.create()
+    token = get_random_string(32)
+    cookies = (
+        f'{settings.SESSION_COOKIE_NAME}={session.session_key}; '
+        f'{settings.CSRF_COOKIE_NAME}={token}'
+    )
+    return cookies, token
+
+
+def build_requests(paths, options):
+    """Raw requests to send: reads of ``paths`` mixed with post creation.
+
+    Every ``1 / write_ratio``-th request creates a post.
+    """
+    every = round(1 / options['write_ratio']) if options['write_ratio'] else 0
+    if every:
+        cookies, token = writer_cookies(options['writer'])
+    requests = []
+    for number in range(options['requests']):
+        if every and number % every == 0:
+            body = f'text=loadtest+{number}&csrfmiddlewaretoken={token}'
+            requests.append((
+                f'POST {reverse("posts:post_create")} HTTP/1.1\r\n'
+                f'Cookie: {cookies}\r\n'
+                f'Content-Type: application/x-www-form-urlencoded\r\n'
+                f'Content-Length: {len(body)}\r\n',
+                body,
+            ))
+        else:
+            requests.append((
+                f'GET {paths[number % len(paths)]} HTTP/1.1\r\n', ''
+            ))
+    return requests
+
+
+def parse_target(value):
+    name, _, url = value.rpartition('=')
+    parts = urlsplit(url)
+    if parts.scheme != 'http' or not parts.hostname:
+        raise CommandError(f'Ожидался адрес вида wsgi=http://host:port: {url}')
+    return name or url, parts.hostname, parts.port or 80
+
+
+async def fetch(host, port, request, read_delay):
+    """One HTTP/1.1 request; ``read_delay`` emulates a slow client."""
+    head, body = request
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        writer.write(
+            f'{head}Host: {host}\r\nConnection: close\r\n\r\n{body}'
+            .encode()
+        )
+        await writer.drain()
+        status = int((await reader.readline()).split()[1])
+        while await reader.read(READ_CHUNK):
+            if read_delay:
+                await asyncio.sleep(read_delay)
+        return status
+    finally:
+        writer.close()
+
+
+async def run_target(host, port, requests, options):
+    timings = []
+    errors = 0
+    queue = asyncio.Queue()
+    for request in requests:
+        queue.put_nowait(request)
+
+    async def client():
+        nonlocal errors
+        while not queue.empty():
+            request = queue.get_nowait()
+            started = time.perf_counter()
+            try:
+                status = await fetch(
+                    host, port, request, options['read_delay']
+                )
+            except (OSError, ValueError, IndexError):
+                status = None
+            if status not in OK_STATUSES:
+                errors += 1
+            timings.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(
+        *(client() for _ in range(options['concurrency']))
+    )
+    elapsed = time.perf_counter() - started
+    return {
+        'requests': len(timings),
+        'errors': errors,
+        'rps': round(len(timings) / elapsed, 1),
+        **percentiles(timings),
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        'Нагружает запущенные серверы запросами к лентам и странице поста, '
+        'при --write-ratio вперемешку с созданием постов, и сравнивает их. '
+        'Пример: loadtest wsgi=http://127.0.0.1:8000 '
+        'asgi=http://127.0.0.1:8001 --read-delay 0.05'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('targets', nargs='+')
+        parser.add_argument('--concurrency', type=int, default=50)
+        parser.add_argument('--requests', type=int, default=1000)
+        parser.add_argument(
+            '--read-delay', type=float, default=0.0,
+            help='Пауза клиента после каждого прочитанного килобайта, с.',
+        )
+        parser.add_argument(
+            '--write-ratio', type=float, default=0.0,
+            help='Доля запросов, создающих пост, например 0.1.',
+        )
+        parser.add_argument(
+            '--writer', default='benchmark',
+            help='Автор постов, создаваемых при --write-ratio.',
+        )
+        parser.add_argument('--json', dest='json_path')
+
+    def handle(self, *args, **options):
+        targets = [parse_target(value) for value in options['targets']]
+        requests = build_requests(feed_paths(), options)
+        report = {}
+        for name, host, port in targets:
+            result = asyncio.run(run_target(host, port, requests, options))
+            report[name] = result
+            self.stdout.write(self.style.MIGRATE_HEADING(name))
+            for key, value in result.items():
+                self.stdout.write(f'  {key}: {value}')
+        if options['json_path']:
+            with open(options['json_path'], 'w') as file:
+                json.dump(report, file, ensure_ascii=False, indent=2)
@@ -0,0 +1,69 @@
+import multiprocessing
+import signal
+import time
+
+from core.tasks import purge_finished, requeue_stale, run_pending
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+PURGE_INTERVAL = 60 * 10
+
+
+class Command(BaseCommand):
+    help = (
+        'Выполняет фоновые задачи из очереди. Несколько процессов можно '
+        'запустить опцией --processes или отдельными командами.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=1)
+        parser.add_argument('--batch-size', type=int, default=100)
+        parser.add_argument(
+            '--sleep', type=float, default=1.0,
+            help='Пауза, когда очередь пуста, с.',
+        )
+        parser.add_argument(
+            '--purge-days', type=int, default=7,
+            help='Через сколько дней удалять выполненные задачи.',
+        )
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Выполнить готовые задачи и выйти.',
+        )
+
+    def handle(self, *args, **options):
+        if options['once']:
+            requeue_stale()
+            while run_pending(options['batch_size']):
+                pass
+            return
+        if options['processes'] == 1:
+            self.work(options)
+            return
+        # Children must not share the parent's database connections.
+        connections.close_all()
+        workers = [
+            multiprocessing.Process(target=self.work, args=(options,))
+            for _ in range(options['processes'])
+        ]
+        for worker in workers:
+            worker.start()
+        # Workers finish the task at hand when they get SIGTERM.
+        signal.signal(
+            signal.SIGTERM,
+            lambda *args: [worker.terminate() for worker in workers],
+        )
+        for worker in workers:
+            worker.join()
+
+    def work(self, options):
+        stopping = []
+        signal.signal(signal.SIGTERM, lambda *args: stopping.append(True))
+        next_purge = 0.0
+        while not stopping:
+            if time.monotonic() >= next_purge:
+                requeue_stale()
+                purge_finished(options['purge_days'])
+                next_purge = time.monotonic() + PURGE_INTERVAL
+            if not run_pending(options['batch_size']):
+                time.sleep(options['sleep'])
@@ -0,0 +1,48 @@
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+class Command(BaseCommand):
+    help = (
+        'Копирует основную базу SQLite в файлы реплик из READ_REPLICAS. '
+        'Для локальной проверки маршрутизации чтения по репликам.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval', type=float, default=0,
+            help='Повторять копирование каждые N секунд.',
+        )
+
+    def handle(self, *args, **options):
+        if not settings.READ_REPLICAS:
+            raise CommandError(
+                'READ_REPLICAS пуст: задайте REPLICA_DATABASES.'
+            )
+        for alias in [DEFAULT_DB_ALIAS, *settings.READ_REPLICAS]:
+            if connections[alias].vendor != 'sqlite':
+                raise CommandError(f'База {alias} не SQLite.')
+        while True:
+            self.sync()
+            if not options['interval']:
+                return
+            time.sleep(options['interval'])
+
+    def sync(self):
+        primary = connections[DEFAULT_DB_ALIAS]
+        primary.ensure_connection()
+        for alias in settings.READ_REPLICAS:
+            started = time.monotonic()
+            replica = sqlite3.connect(connections[alias].settings_dict['NAME'])
+            try:
+                # The online backup API copies a consistent snapshot even
+                # while the primary is being written to.
+                primary.connection.backup(replica)
+            finally:
+                replica.close()
+            elapsed = (time.monotonic() - started) * 1000
+            self.stdout.write(f'{alias}: {elapsed:.0f} мс')
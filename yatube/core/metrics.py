@@ -0,0 +1,176 @@
+"""Per-request performance metrics aggregated per view.
+
+The middleware opens a ``RequestMetrics`` for each sampled request; the
+database wrapper, the template hook and the cache helpers add to it.
+Totals are kept per view in this process and rendered in the Prometheus
+text format.
+"""
+import threading
+import time
+from collections import Counter, defaultdict
+from functools import wraps
+
+from django.template.base import Template
+
+# Upper bounds of the request duration histogram, in seconds.
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+_local = threading.local()
+_lock = threading.Lock()
+_views = defaultdict(lambda: {
+    'requests': 0,
+    'seconds': Counter(),
+    'queries': 0,
+    'duplicate_queries': 0,
+    'cache': Counter(),
+    'buckets': [0] * len(BUCKETS),
+})
+
+
+class RequestMetrics:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.db = 0.0
+        self.template = 0.0
+        self.statements = Counter()
+        self.cache = Counter()
+        self._rendering = 0
+
+    @property
+    def queries(self):
+        return sum(self.statements.values())
+
+    @property
+    def duplicates(self):
+        """Repeated executions of the same statement with the same params."""
+        return sum(count - 1 for count in self.statements.values())
+
+    def execute_wrapper(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db += time.perf_counter() - started
+            self.statements[(sql, repr(params))] += 1
+
+    def breakdown(self):
+        total = time.perf_counter() - self.started
+        return {
+            'total': total,
+            'db': self.db,
+            'template': self.template,
+            'python': max(total - self.db - self.template, 0.0),
+        }
+
+
+def current():
+    return getattr(_local, 'metrics', None)
+
+
+def start():
+    _local.metrics = RequestMetrics()
+    return _local.metrics
+
+
+def finish():
+    _local.metrics = None
+
+
+def count_cache(name, hit):
+    """Count a cache lookup of the current request, if it is sampled."""
+    metrics = current()
+    if metrics is not None:
+        metrics.cache[f'{name}_{"hit" if hit else "miss"}'] += 1
+
+
+def instrument_templates():
+    """Time the outermost template render of every sampled request."""
+    if getattr(Template.render, 'instrumented', False):
+        return
+    render = Template.render
+
+    @wraps(render)
+    def timed_render(self, context):
+        metrics = current()
+        if metrics is None or metrics._rendering:
+            return render(self, context)
+        metrics._rendering += 1
+        started = time.perf_counter()
+        try:
+            return render(self, context)
+        finally:
+            metrics.template += time.perf_counter() - started
+            metrics._rendering -= 1
+
+    timed_render.instrumented = True
+    Template.render = timed_render
+
+
+def record(view, metrics, breakdown):
+    with _lock:
+        stats = _views[view]
+        stats['requests'] += 1
+        stats['seconds'].update(breakdown)
+        stats['queries'] += metrics.queries
+        stats['duplicate_queries'] += metrics.duplicates
+        stats['cache'].update(metrics.cache)
+        for number, bound in enumerate(BUCKETS):
+            if breakdown['total'] <= bound:
+                stats['buckets'][number] += 1
+
+
+def reset():
+    with _lock:
+        _views.clear()
+
+
+def _prometheus_lines():
+    yield '# TYPE yatube_requests_total counter'
+    yield '# TYPE yatube_request_seconds histogram'
+    yield '# TYPE yatube_request_component_seconds_total counter'
+    yield '# TYPE yatube_queries_total counter'
+    yield '# TYPE yatube_duplicate_queries_total counter'
+    yield '# TYPE yatube_cache_lookups_total counter'
+    with _lock:
+        views = {
+            view: {**stats, 'buckets': list(stats['buckets'])}
+            for view, stats in _views.items()
+        }
+    for view, stats in sorted(views.items()):
+        label = f'view="{view}"'
+        yield f'yatube_requests_total{{{label}}} {stats["requests"]}'
+        for bound, count in zip(BUCKETS, stats['buckets']):
+            yield (
+                f'yatube_request_seconds_bucket{{{label},le="{bound}"}} '
+                f'{count}'
+            )
+        yield (
+            f'yatube_request_seconds_bucket{{{label},le="+Inf"}} '
+            f'{stats["requests"]}'
+        )
+        yield (
+            f'yatube_request_seconds_sum{{{label}}} '
+            f'{stats["seconds"]["total"]:.6f}'
+        )
+        yield f'yatube_request_seconds_count{{{label}}} {stats["requests"]}'
+        for component in ('db', 'template', 'python'):
+            yield (
+                f'yatube_request_component_seconds_total'
+                f'{{{label},component="{component}"}} '
+                f'{stats["seconds"][component]:.6f}'
+            )
+        yield f'yatube_queries_total{{{label}}} {stats["queries"]}'
+        yield (
+            f'yatube_duplicate_queries_total{{{label}}} '
+            f'{stats["duplicate_queries"]}'
+        )
+        for lookup, count in sorted(stats['cache'].items()):
+            cache, _, result = lookup.rpartition('_')
+            yield (
+                f'yatube_cache_lookups_total'
+                f'{{{label},cache="{cache}",result="{result}"}} {count}'
+            )
+
+
+def prometheus_text():
+    return '\n'.join(_prometheus_lines()) + '\n'
@@ -0,0 +1,152 @@
+import json
+import logging
+import random
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from django.utils.cache import patch_vary_headers
+
+from . import compression, metrics, routers
+
+logger = logging.getLogger('yatube.performance')
+
+PIN_COOKIE = 'primary_pin'
+
+
+def server_timing(breakdown, queries):
+    return ', '.join((
+        f'db;dur={breakdown["db"] * 1000:.1f};desc="{queries} queries"',
+        f'tpl;dur={breakdown["template"] * 1000:.1f}',
+        f'app;dur={breakdown["python"] * 1000:.1f}',
+        f'total;dur={breakdown["total"] * 1000:.1f}',
+    ))
+
+
+class PerformanceMiddleware:
+    """Measure sampled requests: DB, template and Python time, queries.
+
+    Unsampled requests cost one random() call. Streaming responses are
+    measured up to the moment the view returns them.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if random.random() >= settings.METRICS_SAMPLE_RATE:
+            return self.get_response(request)
+        request_metrics = metrics.start()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(
+                        request_metrics.execute_wrapper
+                    ))
+                response = self.get_response(request)
+        finally:
+            metrics.finish()
+        self.report(request, response, request_metrics)
+        return response
+
+    def report(self, request, response, request_metrics):
+        match = request.resolver_match
+        view = match.view_name if match else 'unresolved'
+        breakdown = request_metrics.breakdown()
+        metrics.record(view, request_metrics, breakdown)
+        # Timings tell how much work a URL costs, so only staff get them
+        # outside of development.
+        user = getattr(request, 'user', None)
+        if settings.METRICS_SERVER_TIMING or user and user.is_staff:
+            response['Server-Timing'] = server_timing(
+                breakdown, request_metrics.queries
+            )
+        slow = breakdown['total'] * 1000 >= settings.METRICS_SLOW_REQUEST_MS
+        level = (
+            logging.WARNING if slow or request_metrics.duplicates
+            else logging.INFO
+        )
+        if not logger.isEnabledFor(level):
+            return
+        logger.log(level, json.dumps({
+            'view': view,
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            **{
+                f'{name}_ms': round(seconds * 1000, 2)
+                for name, seconds in breakdown.items()
+            },
+            'queries': request_metrics.queries,
+            'duplicate_queries': request_metrics.duplicates,
+            'cache': dict(request_metrics.cache),
+        }, ensure_ascii=False))
+
+
+class PrimaryPinMiddleware:
+    """Keep a client on the primary for a while after it writes.
+
+    Replicas may lag, and an author expects to see their post at once.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        routers.start_request(pinned=PIN_COOKIE in request.COOKIES)
+        try:
+            response = self.get_response(request)
+        finally:
+            wrote = routers.finish_request()
+        if wrote:
+            response.set_cookie(
+                PIN_COOKIE, '1',
+                max_age=settings.REPLICA_PIN_SECONDS,
+                httponly=True,
+                samesite='Lax',
+            )
+        return response
+
+
+class CompressionMiddleware:
+    """Compress text responses of at least ``COMPRESSION_MIN_LENGTH`` bytes.
+
+    Brotli is preferred when installed and accepted, gzip otherwise.
+    Streaming responses, such as static files, are left alone. Django
+    masks the CSRF token per request, which defeats BREACH on the forms.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        content_type = response.get('Content-Type', '')
+        if (
+            response.streaming
+            or len(response.content) < settings.COMPRESSION_MIN_LENGTH
+            or response.has_header('Content-Encoding')
+            or not compression.is_compressible(content_type)
+        ):
+            return response
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = compression.choose_encoding(request)
+        if encoding is None:
+            return response
+        key = getattr(response, 'shared_content_key', None)
+        if key is None:
+            content = compression.compress(response.content, encoding)
+        else:
+            content = compression.compress_cached(
+                key, response.content, encoding
+            )
+        if len(content) >= len(response.content):
+            return response
+        response.content = content
+        response['Content-Length'] = str(len(content))
+        response['Content-Encoding'] = encoding
+        # A compressed representation only matches the page weakly.
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        return response
@@ -0,0 +1,69 @@
+from django.db import models
+from django.utils import timezone
+
+
+class Task(models.Model):
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUSES = (
+        (PENDING, 'Ожидает'),
+        (RUNNING, 'Выполняется'),
+        (DONE, 'Выполнена'),
+        (FAILED, 'Ошибка'),
+    )
+
+    name = models.CharField(max_length=200, verbose_name='Задача')
+    payload = models.TextField(default='[]', verbose_name='Аргументы')
+    key = models.CharField(
+        max_length=200,
+        unique=True,
+        blank=True,
+        null=True,
+        verbose_name='Ключ идемпотентности',
+    )
+    status = models.CharField(
+        max_length=10,
+        choices=STATUSES,
+        default=PENDING,
+        verbose_name='Статус',
+    )
+    attempts = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Попыток',
+    )
+    max_attempts = models.PositiveIntegerField(
+        default=3,
+        verbose_name='Максимум попыток',
+    )
+    run_at = models.DateTimeField(
+        default=timezone.now,
+        verbose_name='Запустить не раньше',
+    )
+    locked_at = models.DateTimeField(
+        blank=True,
+        null=True,
+        verbose_name='Взята в работу',
+    )
+    created = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Создана',
+    )
+    finished = models.DateTimeField(
+        blank=True,
+        null=True,
+        verbose_name='Завершена',
+    )
+    last_error = models.TextField(blank=True, verbose_name='Последняя ошибка')
+
+    class Meta:
+        verbose_name = 'Фоновая задача'
+        verbose_name_plural = 'Фоновые задачи'
+        ordering = ['run_at']
+        indexes = [
+            models.Index(fields=['status', 'run_at'], name='task_queue_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.name} ({self.status})'
@@ -0,0 +1,113 @@
+"""Read replica routing.
+
+Views wrapped in ``read_from_replica`` read from one of
+``READ_REPLICAS``, chosen round-robin among those that answered their
+last health check. Other reads, reads inside a transaction or a
+``use_primary`` block, writes and all queries of a client that wrote in
+the last ``REPLICA_PIN_SECONDS`` (see ``PrimaryPinMiddleware``) go to
+the primary.
+"""
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+_state = threading.local()
+_health = {}
+_turns = itertools.count()
+
+
+def is_healthy(alias):
+    """Whether the replica answers, re-checked every few seconds."""
+    healthy, checked_at = _health.get(alias, (False, None))
+    now = time.monotonic()
+    if checked_at is not None and (
+        now - checked_at < settings.REPLICA_HEALTH_INTERVAL
+    ):
+        return healthy
+    connection = connections[alias]
+    try:
+        connection.ensure_connection()
+        # A DB-API cursor, so the probe stays out of request metrics.
+        cursor = connection.connection.cursor()
+        cursor.execute('SELECT 1')
+        cursor.close()
+        healthy = True
+    except DatabaseError:
+        healthy = False
+    _health[alias] = (healthy, now)
+    return healthy
+
+
+def choose_replica():
+    replicas = settings.READ_REPLICAS
+    for _ in range(len(replicas)):
+        alias = replicas[next(_turns) % len(replicas)]
+        if is_healthy(alias):
+            return alias
+    return DEFAULT_DB_ALIAS
+
+
+def read_from_replica(view):
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        _state.replica = True
+        try:
+            return view(request, *args, **kwargs)
+        finally:
+            _state.replica = False
+    return wrapper
+
+
+@contextmanager
+def use_primary():
+    """Read from the primary in the block, as when filling a cache.
+
+    A lagging replica would cache what the primary had before the write
+    that invalidated the entry, until the next write.
+    """
+    replica = getattr(_state, 'replica', False)
+    _state.replica = False
+    try:
+        yield
+    finally:
+        _state.replica = replica
+
+
+def start_request(pinned):
+    _state.pinned = pinned
+    _state.wrote = False
+
+
+def finish_request():
+    """Forget the request's state; returns whether it wrote anything."""
+    wrote = getattr(_state, 'wrote', False)
+    _state.pinned = _state.wrote = False
+    return wrote
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if (
+            not getattr(_state, 'replica', False)
+            or getattr(_state, 'pinned', False)
+            or not settings.READ_REPLICAS
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return DEFAULT_DB_ALIAS
+        return choose_replica()
+
+    def db_for_write(self, model, **hints):
+        _state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary.
+        return True
+
+    def allow_migrate(self, db, app_label, **hints):
+        return db == DEFAULT_DB_ALIAS
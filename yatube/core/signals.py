@@ -0,0 +1,30 @@
+from django.conf import settings
+from django.core.signals import request_started
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+
+@receiver(connection_created)
+def tune_sqlite(sender, connection, **kwargs):
+    """Apply SQLITE_PRAGMAS to every new SQLite connection.
+
+    WAL lets readers run alongside the single writer instead of waiting
+    for its rollback journal, and synchronous=NORMAL is safe in WAL mode.
+    """
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for name, value in settings.SQLITE_PRAGMAS.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+
+
+@receiver(request_started)
+def check_connections(**kwargs):
+    """Drop persistent connections the server has closed meanwhile.
+
+    Without the check the first query of the request would fail.
+    """
+    for connection in connections.all():
+        if connection.connection is not None and not connection.is_usable():
+            connection.close()
@@ -0,0 +1,39 @@
+import mimetypes
+import os
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+
+from . import compression
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Hashed static files with precompressed variants next to them.
+
+    collectstatic writes ``name.gz``, and ``name.br`` when brotli is
+    installed, for every compressible file that shrinks, so
+    ``core.views.static`` never compresses a file on a request.
+    """
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        names = set(self.hashed_files) | set(self.hashed_files.values())
+        for name in sorted(names):
+            self.compress(name)
+
+    def compress(self, name):
+        content_type = mimetypes.guess_type(name)[0] or ''
+        if not compression.is_compressible(content_type):
+            return
+        path = self.path(name)
+        with open(path, 'rb') as source:
+            data = source.read()
+        for encoding in compression.encodings():
+            compressed = compression.compress(data, encoding, best=True)
+            variant = path + compression.SUFFIXES[encoding]
+            if len(compressed) < len(data):
+                with open(variant, 'wb') as target:
+                    target.write(compressed)
+            elif os.path.exists(variant):
+                os.remove(variant)
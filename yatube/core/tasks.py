@@ -0,0 +1,129 @@
+"""A small database-backed queue for side effects of writes.
+
+Functions decorated with ``@task()`` get a ``delay(*args, key=None)``
+method. It stores the call once the current transaction commits, and a
+``run_tasks`` worker executes it later with retries. A ``key`` makes the
+call idempotent: a second call with the same key is dropped. With
+``TASKS_EAGER`` the call runs at once, in the caller's transaction.
+"""
+import json
+import logging
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Task
+
+logger = logging.getLogger('yatube.tasks')
+
+registry = {}
+
+
+def task(max_attempts=None):
+    def decorator(func):
+        func.task_name = f'{func.__module__}.{func.__name__}'
+        func.max_attempts = max_attempts or settings.TASKS_MAX_ATTEMPTS
+        func.delay = lambda *args, key=None: enqueue(func, args, key)
+        registry[func.task_name] = func
+        return func
+    return decorator
+
+
+def enqueue(func, args, key=None):
+    if settings.TASKS_EAGER:
+        func(*args)
+        return
+    row = Task(
+        name=func.task_name,
+        payload=json.dumps(args),
+        key=key,
+        max_attempts=func.max_attempts,
+    )
+    transaction.on_commit(
+        lambda: Task.objects.bulk_create([row], ignore_conflicts=True)
+    )
+
+
+def claim(batch_size):
+    """Mark up to ``batch_size`` due tasks as running by this worker.
+
+    Each claim is a conditional UPDATE, so concurrent workers never get
+    the same task, on any database.
+    """
+    now = timezone.now()
+    due = Task.objects.filter(status=Task.PENDING, run_at__lte=now)
+    claimed = [
+        pk for pk in due.values_list('pk', flat=True)[:batch_size]
+        if Task.objects.filter(pk=pk, status=Task.PENDING).update(
+            status=Task.RUNNING, locked_at=now, attempts=F('attempts') + 1
+        )
+    ]
+    return list(Task.objects.filter(pk__in=claimed).order_by('run_at'))
+
+
+def execute(row):
+    func = registry.get(row.name)
+    try:
+        if func is None:
+            raise LookupError(f'Unknown task {row.name}')
+        with transaction.atomic():
+            func(*json.loads(row.payload))
+    except Exception:
+        logger.exception('Task %s #%s failed', row.name, row.pk)
+        row.last_error = traceback.format_exc()
+        if row.attempts < row.max_attempts:
+            row.status = Task.PENDING
+            row.run_at = timezone.now() + timedelta(
+                seconds=settings.TASKS_RETRY_DELAY * 2 ** (row.attempts - 1)
+            )
+        else:
+            row.status = Task.FAILED
+            row.finished = timezone.now()
+    else:
+        row.status = Task.DONE
+        row.finished = timezone.now()
+    row.locked_at = None
+    row.save(update_fields=[
+        'status', 'run_at', 'locked_at', 'finished', 'last_error'
+    ])
+    return row.status == Task.DONE
+
+
+def requeue_stale():
+    """Give tasks of workers that died mid-run back to the queue.
+
+    A task that has used up its attempts fails instead, so one that kills
+    its worker is not run forever. Returns how many were requeued.
+    """
+    now = timezone.now()
+    deadline = now - timedelta(seconds=settings.TASKS_LOCK_TIMEOUT)
+    stale = Task.objects.filter(status=Task.RUNNING, locked_at__lt=deadline)
+    failed = stale.filter(attempts__gte=F('max_attempts')).update(
+        status=Task.FAILED,
+        locked_at=None,
+        finished=now,
+        last_error='The worker stopped while running the task.',
+    )
+    if failed:
+        logger.error('%s abandoned tasks failed after their last attempt',
+                     failed)
+    return stale.update(status=Task.PENDING, locked_at=None)
+
+
+def purge_finished(days):
+    deadline = timezone.now() - timedelta(days=days)
+    return Task.objects.filter(
+        status=Task.DONE, finished__lt=deadline
+    ).delete()[0]
+
+
+def run_pending(batch_size=100):
+    """Run one batch of due tasks; returns how many were run."""
+    rows = claim(batch_size)
+    for row in rows:
+        execute(row)
+    return len(rows)
@@ -0,0 +1,13 @@
+from core.holes import marker, render_fragment
+from django import template
+
+register = template.Library()
+
+
+@register.simple_tag(takes_context=True)
+def hole(context, name, **kwargs):
+    """Render a per-user fragment, or mark its place in a shared page."""
+    request = context.request
+    if getattr(request, 'punch_holes', False):
+        return marker(name, kwargs)
+    return render_fragment(request, name, kwargs)
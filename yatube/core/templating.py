@@ -0,0 +1,26 @@
+import os
+
+from django.template import engines
+from django.template.loaders.cached import Loader as CachedLoader
+
+
+def warm_up():
+    """Parse every template of the engine's DIRS into the cached loader.
+
+    Returns how many templates were loaded. Without a cached loader the
+    result would be thrown away, so nothing is loaded.
+    """
+    engine = engines['django'].engine
+    if not any(
+        isinstance(loader, CachedLoader) for loader in engine.template_loaders
+    ):
+        return 0
+    loaded = 0
+    for directory in engine.dirs:
+        for root, _, files in os.walk(directory):
+            for name in files:
+                if name.endswith(('.html', '.txt')):
+                    path = os.path.relpath(os.path.join(root, name), directory)
+                    engine.get_template(path)
+                    loaded += 1
+    return loaded
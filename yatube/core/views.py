@@ -0,0 +1,94 @@
+import mimetypes
+import os
+import posixpath
+import re
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import (FileResponse, Http404, HttpResponse,
+                         HttpResponseNotModified)
+from django.utils._os import safe_join
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.crypto import constant_time_compare
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+from . import compression
+from . import metrics as request_metrics
+
+# Names given by ManifestStaticFilesStorage: name.<md5[:12]>.ext
+HASHED_NAME = re.compile(r'\.[0-9a-f]{12}\.[^./]+$')
+
+
+def metrics_allowed(request):
+    if settings.METRICS_TOKEN is None:
+        return request.META.get('REMOTE_ADDR') in settings.METRICS_ALLOWED_IPS
+    return constant_time_compare(
+        request.META.get('HTTP_AUTHORIZATION', ''),
+        f'Bearer {settings.METRICS_TOKEN}',
+    )
+
+
+def metrics(request):
+    """Per-view request metrics of this process for Prometheus."""
+    if not metrics_allowed(request):
+        raise Http404
+    return HttpResponse(
+        request_metrics.prometheus_text(),
+        content_type='text/plain; version=0.0.4; charset=utf-8',
+    )
+
+
+def static(request, path):
+    """Files of STATIC_ROOT, sending a precompressed variant if accepted.
+
+    Content-hashed names never change, so browsers keep them for
+    ``STATIC_MAX_AGE`` without revalidating.
+    """
+    path = posixpath.normpath(path).lstrip('/')
+    try:
+        fullpath = safe_join(settings.STATIC_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404
+    if not os.path.isfile(fullpath):
+        raise Http404
+    available = [
+        encoding for encoding, suffix in compression.SUFFIXES.items()
+        if os.path.isfile(fullpath + suffix)
+    ]
+    encoding = (
+        compression.choose_encoding(request, available) if available else None
+    )
+    served = fullpath + compression.SUFFIXES.get(encoding, '')
+    stat = os.stat(served)
+    if not was_modified_since(
+        request.META.get('HTTP_IF_MODIFIED_SINCE'), stat.st_mtime, stat.st_size
+    ):
+        return cache_static(HttpResponseNotModified(), path, available)
+    content_type = mimetypes.guess_type(fullpath)[0]
+    # Named after the original, not the .gz or .br variant sent.
+    response = FileResponse(
+        open(served, 'rb'),
+        content_type=content_type or 'application/octet-stream',
+        filename=os.path.basename(fullpath),
+    )
+    response['Last-Modified'] = http_date(stat.st_mtime)
+    if encoding:
+        response['Content-Encoding'] = encoding
+    return cache_static(response, path, available)
+
+
+def cache_static(response, path, available):
+    """Caching headers of a static file, for 200 and 304 responses alike."""
+    if available:
+        patch_vary_headers(response, ('Accept-Encoding',))
+    if HASHED_NAME.search(path):
+        patch_cache_control(
+            response, public=True, max_age=settings.STATIC_MAX_AGE,
+            immutable=True,
+        )
+    else:
+        patch_cache_control(
+            response, public=True, max_age=settings.STATIC_PLAIN_MAX_AGE
+        )
+    return response
@@ -1,6 +1,7 @@
 from django.contrib import admin
+from django.db import router, transaction
 
-from .models import Group, Post
+from .models import AuthorCounter, Group, Post, Subscription
 
 
 @admin.register(Post)
@@ -11,9 +12,32 @@ class PostAdmin(admin.ModelAdmin):
     list_filter = ('pub_date',)
     empty_value_display = '-пусто-'
 
+    def changelist_view(self, request, extra_context=None):
+        # list_editable saves move posts between groups, keep counters
+        # in step with them.
+        with transaction.atomic(using=router.db_for_write(self.model)):
+            return super().changelist_view(request, extra_context)
+
 
 @admin.register(Group)
 class GroupAdmin(admin.ModelAdmin):
-    list_display = ('title', 'slug', 'description',)
+    list_display = (
+        'title', 'slug', 'description', 'posts_count', 'subscribers_count',
+    )
+    readonly_fields = ('posts_count', 'subscribers_count')
     search_fields = ('title',)
     empty_value_display = '-пусто-'
+
+
+@admin.register(AuthorCounter)
+class AuthorCounterAdmin(admin.ModelAdmin):
+    list_display = ('author', 'posts_count', 'subscribers_count')
+    search_fields = ('author__username',)
+    readonly_fields = ('author', 'posts_count', 'subscribers_count')
+
+
+@admin.register(Subscription)
+class SubscriptionAdmin(admin.ModelAdmin):
+    list_display = ('user', 'author', 'group', 'created')
+    search_fields = ('user__username', 'author__username', 'group__slug')
+    raw_id_fields = ('user', 'author', 'group')
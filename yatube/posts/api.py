@@ -0,0 +1,78 @@
+import json
+
+from core.routers import read_from_replica
+from django.conf import settings
+from django.http import JsonResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+
+from .models import Group, Post, User
+from .paginators import (FEED_ORDERING, NEXT, InvalidCursor, decode_cursor,
+                         keyset_filter, pack_cursor)
+
+API_FIELDS = ('id', 'text', 'pub_date', 'author', 'group')
+
+
+def parse_limit(value):
+    """Number of posts to send; ``None`` streams the feed to its end."""
+    if value == 'all':
+        return None
+    try:
+        limit = int(value)
+    except (TypeError, ValueError):
+        return settings.POSTS_API_LIMIT
+    return max(1, min(limit, settings.POSTS_API_MAX_LIMIT))
+
+
+def stream_feed(rows, limit):
+    yield '{"results": ['
+    last = None
+    for number, row in enumerate(rows):
+        if limit is not None and number == limit:
+            yield f'], "next": {json.dumps(pack_cursor(NEXT, *last))}}}'
+            return
+        record = dict(zip(API_FIELDS, row))
+        record['pub_date'] = record['pub_date'].isoformat()
+        yield (',' if number else '') + json.dumps(record, ensure_ascii=False)
+        last = (record['pub_date'], record['id'])
+    yield '], "next": null}'
+
+
+def feed_response(request, posts):
+    """Stream a feed page as JSON straight from a database cursor."""
+    limit = parse_limit(request.GET.get('limit'))
+    cursor = request.GET.get('cursor')
+    if cursor:
+        try:
+            if decode_cursor(cursor)[0] != NEXT:
+                raise InvalidCursor(cursor)
+        except InvalidCursor:
+            return JsonResponse({'error': 'invalid cursor'}, status=400)
+        posts = keyset_filter(posts, cursor)
+    rows = posts.order_by(*FEED_ORDERING).values_list(
+        'id', 'text', 'pub_date', 'author__username', 'group__slug'
+    )
+    if limit is not None:
+        rows = rows[:limit + 1]
+    # The body is read after the view returns; route the query now.
+    rows = rows.using(rows.db)
+    return StreamingHttpResponse(
+        stream_feed(rows.iterator(chunk_size=500), limit),
+        content_type='application/json',
+    )
+
+
+@read_from_replica
+def index_feed(request):
+    return feed_response(request, Post.objects.all())
+
+
+@read_from_replica
+def group_feed(request, slug):
+    group = get_object_or_404(Group, slug=slug)
+    return feed_response(request, group.posts.all())
+
+
+@read_from_replica
+def author_feed(request, username):
+    author = get_object_or_404(User, username=username)
+    return feed_response(request, author.posts.all())
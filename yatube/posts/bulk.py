@@ -0,0 +1,60 @@
+from contextlib import contextmanager
+
+from django.db import transaction
+
+from .cache import clear_caches
+from .counters import rebuild_counters
+from .models import Post
+from .rendering import TEXT_HTML_VERSION
+from .search import rebuild_index
+from .timeline import rebuild_timelines
+
+POST_FIELDS = ('text', 'pub_date', 'author', 'group')
+GROUP_FIELDS = ('title', 'slug', 'description')
+
+
+@contextmanager
+def explicit_dates():
+    """Let bulk_create keep pub_date and updated_at instead of now()."""
+    pub_date = Post._meta.get_field('pub_date')
+    updated_at = Post._meta.get_field('updated_at')
+    pub_date.auto_now_add = updated_at.auto_now = False
+    try:
+        yield
+    finally:
+        pub_date.auto_now_add = updated_at.auto_now = True
+
+
+def render_stale_posts(batch_size=2000):
+    """Render posts whose HTML is missing or from an older version.
+
+    Each batch commits on its own, so a large table is not rewritten in
+    one long transaction and an interrupted run resumes where it stopped.
+    """
+    stale = Post.objects.exclude(
+        text_html_version=TEXT_HTML_VERSION
+    ).order_by().only('text')
+    rendered = 0
+    while True:
+        with transaction.atomic():
+            batch = list(stale[:batch_size])
+            if not batch:
+                return rendered
+            for post in batch:
+                post.render()
+            Post.objects.bulk_update(
+                batch, ['text_html', 'text_html_version']
+            )
+        rendered += len(batch)
+
+
+def finish_bulk_load(reindex=True):
+    """Redo what save() and post signals do for bulk-created posts."""
+    render_stale_posts()
+    with transaction.atomic():
+        rebuild_counters()
+        # After the counters, which tell the popular sources apart.
+        rebuild_timelines()
+        if reindex:
+            rebuild_index()
+    clear_caches()
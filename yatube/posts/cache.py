@@ -0,0 +1,209 @@
+import hashlib
+import uuid
+from functools import partial, wraps
+
+from core import compression, holes
+from core.caching import get_or_compute
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.http import Http404, HttpResponse
+from django.utils.cache import patch_cache_control, patch_vary_headers
+
+from . import identity
+from .paginators import InvalidCursor, decode_cursor, pack_cursor
+
+INDEX_FEED = 'index'
+GROUP_FEED = 'group'
+AUTHOR_FEED = 'author'
+# Versioned per user, changes when the user follows or unfollows.
+FOLLOW_FEED = 'follow'
+ALL_FEEDS = 'all'
+
+
+def feed_cache():
+    return caches[settings.POSTS_FEED_CACHE_ALIAS]
+
+
+def clear_caches():
+    cache.clear()
+    feed_cache().clear()
+    identity.clear()
+    compression.clear()
+
+
+def count_key(feed, ident=None):
+    if ident is None:
+        return f'posts:count:{feed}'
+    return f'posts:count:{feed}:{ident}'
+
+
+def post_count_keys(post):
+    """Count keys of every feed the post belongs or belonged to."""
+    keys = {count_key(INDEX_FEED), count_key(AUTHOR_FEED, post.author_id)}
+    for group_id in (post.group_id, getattr(post, '_loaded_group_id', None)):
+        if group_id is not None:
+            keys.add(count_key(GROUP_FEED, group_id))
+    return keys
+
+
+def digest(value):
+    """Fixed-length ASCII form of a key part, valid for memcached."""
+    return hashlib.md5(str(value).encode()).hexdigest()
+
+
+def version_key(feed, ident=None):
+    return f'posts:version:{feed}:{digest(ident)}'
+
+
+def feed_versions(feed, ident=None):
+    """Current versions of the feed and of all feeds, created on demand.
+
+    Versions are random tokens rather than counters, so a cache flush can
+    never bring back a version that was handed out before.
+    """
+    keys = [version_key(ALL_FEEDS), version_key(feed, ident)]
+    versions = feed_cache().get_many(keys)
+    missing = {key: uuid.uuid4().hex for key in keys if key not in versions}
+    if missing:
+        feed_cache().set_many(missing, None)
+        versions.update(missing)
+    return [versions[key] for key in keys]
+
+
+def bump_feeds(*feeds):
+    """Give each ``(feed, ident)`` pair a new version."""
+    feed_cache().set_many(
+        {version_key(*feed): uuid.uuid4().hex for feed in feeds}, None
+    )
+
+
+def page_params(request):
+    """Cursor or page number as the paginators read them, or None.
+
+    Cursors are decoded and invalid ones, which show the first page, share
+    a key. Pages past ``POSTS_FEED_CACHE_PAGES`` are not cached, so
+    clients cannot create cache entries at will.
+    """
+    cursor = request.GET.get('cursor')
+    if cursor:
+        try:
+            direction, pub_date, pk = decode_cursor(cursor)
+        except InvalidCursor:
+            return 'cursor', ''
+        return 'cursor', pack_cursor(direction, pub_date.isoformat(), pk)
+    page = request.GET.get('page', '')
+    page = max(int(page), 1) if page.isdigit() else 1
+    if page > settings.POSTS_FEED_CACHE_PAGES:
+        return None
+    return 'page', page
+
+
+def feed_page_key(feed, ident, request):
+    params = page_params(request)
+    if params is None:
+        return None
+    versions = '.'.join(feed_versions(feed, ident))
+    variant = digest(f'{ident}:{versions}:{params[0]}:{params[1]}')
+    return f'posts:page:{feed}:{variant}'
+
+
+def render_page(view, request, punch, responses, *args, **kwargs):
+    """Content and headers of a page to cache, or None if not a 200.
+
+    The response is appended to ``responses`` to be sent as it is.
+    """
+    request.punch_holes = punch
+    try:
+        response = view(request, *args, **kwargs)
+    finally:
+        request.punch_holes = False
+    responses.append(response)
+    if response.status_code == 200:
+        return response.content.decode(), dict(response.items())
+    return None
+
+
+def vary_on_user(response, request):
+    """Mark a page whose content depends on who is logged in."""
+    patch_vary_headers(response, ('Cookie',))
+    if request.user.is_authenticated:
+        patch_cache_control(response, private=True)
+    return response
+
+
+def cache_view(name, page_key):
+    """Serve GETs of a view from the feed cache under ``page_key``.
+
+    With ``POSTS_HOLE_PUNCHING`` the page is cached with the per-user
+    fragments left as holes and filled for each viewer, so logged-in users
+    share it too; otherwise only anonymous users are served from the cache.
+    ``page_key`` may return None to skip the cache. Only one worker renders
+    a missing or stale page, see ``core.caching``.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            punch = settings.POSTS_HOLE_PUNCHING
+            key = None
+            if request.method == 'GET' and (
+                punch or not request.user.is_authenticated
+            ):
+                key = page_key(request, *args, **kwargs)
+            if key is None:
+                return vary_on_user(view(request, *args, **kwargs), request)
+            responses = []
+            entry = get_or_compute(
+                feed_cache(),
+                key,
+                partial(render_page, view, request, punch, responses, *args,
+                        **kwargs),
+                settings.POSTS_FEED_CACHE_TIMEOUT,
+                name,
+            )
+            if entry is None:
+                return vary_on_user(responses[0], request)
+            if responses and not punch:
+                response = responses[0]
+            else:
+                content, headers = entry
+                if punch:
+                    content = holes.fill(content, request)
+                response = HttpResponse(content)
+                for header, value in headers.items():
+                    response[header] = value
+            if not request.user.is_authenticated:
+                # Every anonymous visitor gets these bytes for the key, so
+                # the compressed page is kept too (CompressionMiddleware).
+                response.shared_content_key = key
+            return vary_on_user(response, request)
+        return wrapper
+    return decorator
+
+
+def feed_missing(lookup, ident):
+    """Whether the group or author of a feed does not exist.
+
+    ``lookup`` is its ``identity`` lookup, or None for feeds of neither.
+    Missing feeds get no version, so made-up slugs leave no cache entries.
+    """
+    if lookup is None:
+        return False
+    try:
+        lookup(ident)
+    except Http404:
+        return True
+    return False
+
+
+def cache_feed(feed, ident_kwarg=None, lookup=None):
+    """Cache pages of a feed view by the feed version.
+
+    Bumping the version in the post and group signals is all the
+    invalidation the pages need.
+    """
+    def page_key(request, *args, **kwargs):
+        ident = kwargs.get(ident_kwarg)
+        if feed_missing(lookup, ident):
+            return None
+        return feed_page_key(feed, ident, request)
+    return cache_view('feed', page_key)
@@ -0,0 +1,69 @@
+from core.routers import use_primary
+
+from .cache import (AUTHOR_FEED, FOLLOW_FEED, GROUP_FEED, feed_missing,
+                    feed_versions)
+from .models import Post
+
+
+def viewer(request):
+    """The user and the version of their subscriptions the page shows."""
+    if not request.user.is_authenticated:
+        return 0
+    version = feed_versions(FOLLOW_FEED, request.user.pk)[1]
+    return f'{request.user.pk}.{version}'
+
+
+def feed_etag(feed, ident_kwarg=None, lookup=None):
+    """ETag of a feed page built from the feed version.
+
+    The version changes whenever a post of the feed is written, so it
+    catches deletions that max(pub_date) or max(id) would miss. There is no
+    ETag when the group or author is missing, see ``feed_missing``.
+    """
+    def etag(request, *args, **kwargs):
+        ident = kwargs.get(ident_kwarg)
+        if feed_missing(lookup, ident):
+            return None
+        versions = '.'.join(feed_versions(feed, ident))
+        page = request.GET.get('page', '')
+        cursor = request.GET.get('cursor', '')
+        return f'"{versions}-{page}-{cursor}-{viewer(request)}"'
+    return etag
+
+
+def post_version(request, post_id):
+    """Version of a post page: its edit time plus its author and group feeds.
+
+    The feed versions cover what the page shows besides the post itself,
+    such as the author's post count and the group title. The version is
+    looked up once per request for both the ETag and the page cache, on
+    the primary so that a lagging replica cannot bring back an old key.
+    """
+    if not hasattr(request, 'post_version'):
+        with use_primary():
+            row = Post.objects.filter(pk=post_id).values_list(
+                'updated_at', 'author__username', 'group__slug'
+            ).first()
+        request.post_version = row and _post_version(*row)
+    return request.post_version
+
+
+def _post_version(updated_at, username, slug):
+    versions = feed_versions(AUTHOR_FEED, username)
+    if slug is not None:
+        versions += feed_versions(GROUP_FEED, slug)[1:]
+    return f'{updated_at.timestamp()}-{".".join(versions)}'
+
+
+def post_etag(request, post_id):
+    version = post_version(request, post_id)
+    if version is None:
+        return None
+    return f'"{version}-{viewer(request)}"'
+
+
+def post_page_key(request, post_id):
+    version = post_version(request, post_id)
+    if version is None:
+        return None
+    return f'posts:page:post:{post_id}:{version}'
@@ -0,0 +1,126 @@
+import threading
+
+from core.caching import get_or_compute
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest
+
+from .cache import AUTHOR_FEED, count_key
+from .models import AuthorCounter, Group, Post, Subscription, User
+
+# Authors whose deletion is cascading in this thread: their counter row
+# goes with them, so the cascaded post and subscription deletes skip it.
+_state = threading.local()
+
+
+def deleting_authors():
+    if not hasattr(_state, 'authors'):
+        _state.authors = set()
+    return _state.authors
+
+
+def author_created(author):
+    AuthorCounter.objects.create(author=author)
+
+
+def change_author_count(author_id, delta):
+    # The row exists from the moment the user does (author_created).
+    if author_id not in deleting_authors():
+        AuthorCounter.objects.filter(author_id=author_id).update(
+            posts_count=Greatest(F('posts_count') + delta, 0)
+        )
+
+
+def change_group_count(group_id, delta):
+    if group_id is not None:
+        Group.objects.filter(pk=group_id).update(
+            posts_count=Greatest(F('posts_count') + delta, 0)
+        )
+
+
+def change_subscribers_count(subscription, delta):
+    if subscription.group_id is not None:
+        Group.objects.filter(pk=subscription.group_id).update(
+            subscribers_count=Greatest(F('subscribers_count') + delta, 0)
+        )
+    elif subscription.author_id not in deleting_authors():
+        AuthorCounter.objects.filter(author_id=subscription.author_id).update(
+            subscribers_count=Greatest(F('subscribers_count') + delta, 0)
+        )
+
+
+def post_created(post):
+    change_author_count(post.author_id, 1)
+    change_group_count(post.group_id, 1)
+
+
+def post_moved(post, previous_group_id):
+    if previous_group_id != post.group_id:
+        change_group_count(previous_group_id, -1)
+        change_group_count(post.group_id, 1)
+
+
+def post_removed(post):
+    change_author_count(post.author_id, -1)
+    change_group_count(post.group_id, -1)
+
+
+def get_posts_count(author):
+    try:
+        return author.post_counter.posts_count
+    except AuthorCounter.DoesNotExist:
+        return 0
+
+
+def author_posts_count(author_id):
+    """The author's post count, under the key their feed's paginator uses.
+
+    The post signals drop the key, and the first page of the profile has
+    already filled it in.
+    """
+    def count():
+        return AuthorCounter.objects.filter(
+            author_id=author_id
+        ).values_list('posts_count', flat=True).first() or 0
+    return get_or_compute(
+        cache,
+        count_key(AUTHOR_FEED, author_id),
+        count,
+        settings.POSTS_COUNT_CACHE_TIMEOUT,
+        'count',
+    )
+
+
+def rebuild_counters():
+    """Recount posts and subscribers per group and per author."""
+    Group.objects.update(
+        posts_count=Coalesce(Subquery(count_per('group', Post)), 0),
+        subscribers_count=Coalesce(
+            Subquery(count_per('group', Subscription)), 0
+        ),
+    )
+    totals = {pk: {} for pk in User.objects.values_list('pk', flat=True)}
+    for field, model in (('posts_count', Post),
+                         ('subscribers_count', Subscription)):
+        rows = model.objects.filter(author__isnull=False).order_by().values(
+            'author'
+        ).annotate(total=Count('pk'))
+        for row in rows:
+            totals[row['author']][field] = row['total']
+    AuthorCounter.objects.all().delete()
+    AuthorCounter.objects.bulk_create(
+        AuthorCounter(author_id=author_id, **counts)
+        for author_id, counts in totals.items()
+    )
+
+
+def count_per(field, model):
+    """Subquery counting ``model`` rows pointing at the outer row."""
+    return (
+        model.objects.filter(**{field: OuterRef('pk')})
+        .order_by()
+        .values(field)
+        .annotate(total=Count('pk'))
+        .values('total')
+    )
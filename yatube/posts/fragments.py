@@ -0,0 +1,38 @@
+"""Per-user parts of the post pages, see ``core.holes``."""
+from core.holes import fragment
+from django.urls import reverse
+
+from .models import Subscription
+
+
+def is_following(user, **source):
+    return user.is_authenticated and Subscription.objects.filter(
+        user=user, **source
+    ).exists()
+
+
+@fragment('follow_author', 'includes/follow_form.html')
+def follow_author(request, author_id, username):
+    user = request.user
+    show = user.is_authenticated and user.pk != author_id
+    return {
+        'show': show,
+        'following': show and is_following(user, author_id=author_id),
+        'follow_url': reverse('posts:profile_follow', args=[username]),
+        'unfollow_url': reverse('posts:profile_unfollow', args=[username]),
+    }
+
+
+@fragment('follow_group', 'includes/follow_form.html')
+def follow_group(request, group_id, slug):
+    return {
+        'show': request.user.is_authenticated,
+        'following': is_following(request.user, group_id=group_id),
+        'follow_url': reverse('posts:group_follow', args=[slug]),
+        'unfollow_url': reverse('posts:group_unfollow', args=[slug]),
+    }
+
+
+@fragment('post_actions', 'includes/post_actions.html')
+def post_actions(request, post_id, author_id):
+    return {'can_edit': request.user.pk == author_id}
@@ -0,0 +1,124 @@
+"""Read-through cache of groups by slug and authors by username.
+
+Lookups go through a bounded in-process LRU, then the cache named by
+``POSTS_IDENTITY_CACHE_ALIAS`` if any, then the database. Saves and
+deletes forget the object in this process and in the shared cache;
+other processes may serve it for up to ``POSTS_IDENTITY_LOCAL_TIMEOUT``
+more seconds. Misses are remembered in the process for
+``POSTS_IDENTITY_MISS_TIMEOUT`` seconds. Counter columns go stale in the
+cache, so counts are read from the count cache instead.
+"""
+import copy
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from core.metrics import count_cache
+from core.routers import use_primary
+from django.conf import settings
+from django.core.cache import caches
+from django.http import Http404
+
+from .models import Group, User
+
+# Columns pages show of an author; password hashes stay out of caches.
+AUTHOR_FIELDS = ('username', 'first_name', 'last_name')
+
+
+class LRUCache:
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, timeout):
+        with self.lock:
+            self.entries[key] = (time.monotonic() + timeout, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def delete(self, key):
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+local = LRUCache(settings.POSTS_IDENTITY_CACHE_SIZE)
+# Remembered misses, kept briefly and only in this process.
+MISSING = object()
+
+
+def shared_cache():
+    alias = settings.POSTS_IDENTITY_CACHE_ALIAS
+    return caches[alias] if alias else None
+
+
+def identity_key(model, value):
+    # Hashed, so any slug or username is a valid memcached key.
+    digest = hashlib.md5(value.encode()).hexdigest()
+    return f'posts:identity:{model._meta.label_lower}:{digest}'
+
+
+def lookup(queryset, field, value):
+    """The object with ``field == value``, or ``Http404``."""
+    key = identity_key(queryset.model, value)
+    instance = local.get(key)
+    count_cache('identity', instance is not None)
+    if instance is None:
+        shared = shared_cache()
+        instance = shared.get(key) if shared is not None else None
+        if instance is None:
+            with use_primary():
+                instance = queryset.filter(**{field: value}).first()
+            if instance is None:
+                # The ETag, the page cache key and the view each look the
+                # value up, so a 404 would otherwise query three times.
+                local.set(key, MISSING, settings.POSTS_IDENTITY_MISS_TIMEOUT)
+                raise Http404
+            if shared is not None:
+                shared.set(
+                    key, instance, settings.POSTS_IDENTITY_SHARED_TIMEOUT
+                )
+        local.set(key, instance, settings.POSTS_IDENTITY_LOCAL_TIMEOUT)
+    if instance is MISSING:
+        raise Http404
+    # Callers may change their copy; the cached one is shared by threads.
+    return copy.copy(instance)
+
+
+def get_group(slug):
+    return lookup(Group.objects.all(), 'slug', slug)
+
+
+def get_author(username):
+    return lookup(User.objects.only(*AUTHOR_FIELDS), 'username', username)
+
+
+def forget(model, *values):
+    keys = [identity_key(model, value) for value in values]
+    for key in keys:
+        local.delete(key)
+    shared = shared_cache()
+    if shared is not None:
+        shared.delete_many(keys)
+
+
+def clear():
+    local.clear()
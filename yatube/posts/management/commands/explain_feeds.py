@@ -0,0 +1,92 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+from posts.models import Post
+from posts.paginators import FEED_ORDERING, CursorPaginator, encode_cursor
+from posts.utils import AMOUNT_POSTS
+
+
+class Command(BaseCommand):
+    help = (
+        'Показывает планы (EXPLAIN) и время запросов лент index, '
+        'group_posts и profile. Запустите до и после миграции '
+        'posts 0004_feed_indexes, чтобы сравнить планы.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--page', type=int, default=1000)
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--json', dest='json_path')
+
+    def handle(self, *args, **options):
+        busiest = (
+            Post.objects.order_by().values('author', 'group')
+            .annotate(total=Count('pk')).order_by('-total').first()
+        )
+        if busiest is None:
+            raise CommandError('Нет постов, сначала запустите seed_posts.')
+        feeds = {
+            'index': Post.objects.feed(),
+            'profile': Post.objects.feed().filter(
+                author_id=busiest['author']
+            ),
+        }
+        if busiest['group'] is not None:
+            feeds['group_posts'] = Post.objects.feed().filter(
+                group_id=busiest['group']
+            )
+        report = {'vendor': connection.vendor, 'queries': []}
+        for view, posts in feeds.items():
+            for label, queryset in self.page_queries(posts, options['page']):
+                report['queries'].append(
+                    self.measure(view, label, queryset, options['repeat'])
+                )
+        if options['json_path']:
+            with open(options['json_path'], 'w') as file:
+                json.dump(report, file, ensure_ascii=False, indent=2)
+
+    def page_queries(self, posts, page):
+        ordered = posts.order_by(*FEED_ORDERING)
+        offset = (page - 1) * AMOUNT_POSTS
+        yield 'count', posts.order_by()
+        yield 'first page', ordered[:AMOUNT_POSTS]
+        yield f'page {page} (offset)', ordered[offset:offset + AMOUNT_POSTS]
+        anchor = ordered[offset:offset + 1].first()
+        if anchor is not None:
+            paginator = CursorPaginator(posts, AMOUNT_POSTS)
+            cursor = encode_cursor('n', anchor)
+            yield (
+                f'page {page} (cursor)',
+                paginator.keyset_queryset(cursor)[:AMOUNT_POSTS + 1],
+            )
+
+    def measure(self, view, label, queryset, repeat):
+        if label == 'count':
+            plan = self.explain_count(queryset)
+            run = queryset.count
+        else:
+            plan = queryset.explain()
+            run = lambda: list(queryset._chain())  # noqa: E731
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            run()
+            timings.append((time.perf_counter() - started) * 1000)
+        best = min(timings)
+        self.stdout.write(self.style.MIGRATE_HEADING(f'{view}: {label}'))
+        self.stdout.write(plan)
+        self.stdout.write(f'best of {repeat}: {best:.2f} ms\n')
+        return {'view': view, 'query': label, 'plan': plan, 'best_ms': best}
+
+    def explain_count(self, queryset):
+        sql, params = queryset.values('pk').query.sql_with_params()
+        prefix = connection.ops.explain_query_prefix()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'{prefix} SELECT COUNT(*) FROM ({sql}) feed', params
+            )
+            rows = cursor.fetchall()
+        return '\n'.join(' '.join(map(str, row)) for row in rows)
@@ -0,0 +1,52 @@
+import csv
+import json
+
+from django.core.management.base import BaseCommand
+from posts.bulk import GROUP_FIELDS, POST_FIELDS
+from posts.models import Group, Post
+
+
+class Command(BaseCommand):
+    help = (
+        'Выгружает посты (или группы с --groups) в JSON Lines или CSV '
+        'потоком, не загружая всю таблицу в память.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('output', nargs='?', default='-')
+        parser.add_argument(
+            '--format', choices=('jsonl', 'csv'), default='jsonl'
+        )
+        parser.add_argument('--groups', action='store_true')
+        parser.add_argument('--batch-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        if options['groups']:
+            fields = GROUP_FIELDS
+            rows = Group.objects.order_by('pk').values_list(*fields)
+        else:
+            fields = POST_FIELDS
+            rows = Post.objects.order_by('pk').values_list(
+                'text', 'pub_date', 'author__username', 'group__slug'
+            )
+        rows = rows.iterator(chunk_size=options['batch_size'])
+        if options['output'] == '-':
+            self.write(self.stdout, fields, rows, options['format'])
+            return
+        with open(options['output'], 'w', newline='') as output:
+            self.write(output, fields, rows, options['format'])
+
+    def write(self, output, fields, rows, format):
+        if format == 'csv':
+            writer = csv.writer(output)
+            writer.writerow(fields)
+            writer.writerows(
+                [self.serialize(value) for value in row] for row in rows
+            )
+            return
+        for row in rows:
+            record = dict(zip(fields, map(self.serialize, row)))
+            output.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+    def serialize(self, value):
+        return value.isoformat() if hasattr(value, 'isoformat') else value
@@ -0,0 +1,163 @@
+import csv
+import json
+import sys
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from posts.bulk import explicit_dates, finish_bulk_load
+from posts.models import Group, Post
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        'Загружает посты (или группы с --groups) из JSON Lines или CSV '
+        'пачками через bulk_create.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('input', nargs='?', default='-')
+        parser.add_argument(
+            '--format', choices=('jsonl', 'csv'), default='jsonl'
+        )
+        parser.add_argument('--groups', action='store_true')
+        parser.add_argument('--batch-size', type=int, default=2000)
+        parser.add_argument(
+            '--create-authors',
+            action='store_true',
+            help='Создавать отсутствующих авторов вместо пропуска постов.',
+        )
+        parser.add_argument(
+            '--skip-reindex',
+            action='store_true',
+            help='Не перестраивать поисковый индекс после загрузки.',
+        )
+
+    def handle(self, *args, **options):
+        if options['input'] == '-':
+            self.load(sys.stdin, options)
+            return
+        with open(options['input'], newline='') as source:
+            self.load(source, options)
+
+    def load(self, source, options):
+        records = self.read(source, options['format'])
+        if options['groups']:
+            imported, skipped = self.import_groups(records, options)
+        else:
+            imported, skipped = self.import_posts(records, options)
+            finish_bulk_load(reindex=not options['skip_reindex'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Загружено: {imported}, пропущено: {skipped}.'
+        ))
+
+    def read(self, source, format):
+        if format == 'csv':
+            yield from csv.DictReader(source)
+            return
+        for number, line in enumerate(source, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as error:
+                raise CommandError(f'Строка {number}: {error}')
+            if not isinstance(record, dict):
+                raise CommandError(f'Строка {number}: ожидался объект')
+            yield record
+
+    def is_valid(self, number, instance, exclude=()):
+        """Check the record's fields, reporting it when they are bad."""
+        try:
+            instance.clean_fields(exclude=exclude)
+        except ValidationError as error:
+            problems = '; '.join(
+                f'{field}: {" ".join(messages)}'
+                for field, messages in error.message_dict.items()
+            )
+            self.stderr.write(f'Запись {number} пропущена: {problems}')
+            return False
+        return True
+
+    def import_groups(self, records, options):
+        known = set(Group.objects.values_list('slug', flat=True))
+        batch, imported, skipped = [], 0, 0
+        for number, record in enumerate(records, 1):
+            group = Group(
+                title=record.get('title'),
+                slug=record.get('slug'),
+                description=record.get('description') or '',
+            )
+            valid = self.is_valid(number, group, exclude=('description',))
+            if not valid or group.slug in known:
+                skipped += 1
+                continue
+            known.add(group.slug)
+            batch.append(group)
+            if len(batch) == options['batch_size']:
+                imported += self.save(Group, batch)
+                batch = []
+        imported += self.save(Group, batch)
+        return imported, skipped
+
+    def import_posts(self, records, options):
+        self.authors = dict(User.objects.values_list('username', 'pk'))
+        self.groups = dict(Group.objects.values_list('slug', 'pk'))
+        self.password = make_password(None)
+        batch, imported, skipped = [], 0, 0
+        with explicit_dates():
+            for number, record in enumerate(records, 1):
+                post = self.build_post(number, record, options)
+                if post is None:
+                    skipped += 1
+                    continue
+                batch.append(post)
+                if len(batch) == options['batch_size']:
+                    imported += self.save(Post, batch)
+                    batch = []
+            imported += self.save(Post, batch)
+        return imported, skipped
+
+    def build_post(self, number, record, options):
+        """Post of the record, or None if it is bad or its author unknown."""
+        try:
+            pub_date = (
+                parse_datetime(record.get('pub_date') or '')
+                or timezone.now()
+            )
+        except ValueError:
+            self.stderr.write(
+                f'Запись {number} пропущена: pub_date: неверная дата.'
+            )
+            return None
+        slug = record.get('group') or None
+        post = Post(
+            text=record.get('text'),
+            group_id=self.groups.get(slug),
+            pub_date=pub_date,
+            updated_at=pub_date,
+        )
+        if not self.is_valid(number, post, exclude=('author', 'group')):
+            return None
+        username = record.get('author')
+        post.author_id = self.authors.get(username)
+        if post.author_id is None and options['create_authors']:
+            author = User(username=username, password=self.password)
+            if not self.is_valid(number, author):
+                return None
+            author.save()
+            post.author_id = self.authors[username] = author.pk
+        if post.author_id is None or (slug and slug not in self.groups):
+            return None
+        return post
+
+    def save(self, model, batch):
+        with transaction.atomic():
+            model.objects.bulk_create(batch)
+        return len(batch)
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from posts.bulk import render_stale_posts
+
+
+class Command(BaseCommand):
+    help = (
+        'Сохраняет HTML текста постов, у которых он пуст или отрисован '
+        'прошлой версией. Запускать после смены TEXT_HTML_VERSION.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        rendered = render_stale_posts(options['batch_size'])
+        self.stdout.write(
+            self.style.SUCCESS(f'Отрисовано постов: {rendered}.')
+        )
@@ -0,0 +1,99 @@
+import random
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from faker import Faker
+from posts.bulk import explicit_dates, finish_bulk_load
+from posts.models import Group, Post
+
+User = get_user_model()
+
+SEED_PREFIX = 'seed'
+WORDS = (
+    'пост', 'новость', 'город', 'погода', 'кот', 'собака', 'книга', 'кино',
+    'музыка', 'сегодня', 'вчера', 'завтра', 'утро', 'вечер', 'работа',
+    'отпуск', 'море', 'горы', 'друзья', 'семья', 'проект', 'код', 'тест',
+)
+
+
+class Command(BaseCommand):
+    help = 'Наполняет базу тестовыми пользователями, группами и постами.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100)
+        parser.add_argument('--groups', type=int, default=20)
+        parser.add_argument('--posts', type=int, default=10000)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--days', type=int, default=365 * 3)
+        parser.add_argument('--seed', type=int, default=None)
+        parser.add_argument(
+            '--faker', action='store_true',
+            help='Генерировать правдоподобные тексты с помощью Faker.',
+        )
+
+    def text_factory(self, rnd, options):
+        """Callable returning the text of the next post or description."""
+        if not options['faker']:
+            return lambda: ' '.join(rnd.choices(WORDS, k=rnd.randint(5, 60)))
+        fake = Faker('ru_RU')
+        fake.seed_instance(options['seed'])
+        return lambda: fake.text(max_nb_chars=rnd.randint(50, 500))
+
+    def handle(self, *args, **options):
+        rnd = random.Random(options['seed'])
+        make_text = self.text_factory(rnd, options)
+        password = make_password(None)
+        start = User.objects.filter(
+            username__startswith=SEED_PREFIX
+        ).count()
+        User.objects.bulk_create(
+            (
+                User(username=f'{SEED_PREFIX}_user_{i}', password=password)
+                for i in range(start, start + options['users'])
+            ),
+            options['batch_size'],
+        )
+        start = Group.objects.filter(slug__startswith=SEED_PREFIX).count()
+        Group.objects.bulk_create(
+            (
+                Group(
+                    title=f'Группа {i}',
+                    slug=f'{SEED_PREFIX}-group-{i}',
+                    description=make_text(),
+                )
+                for i in range(start, start + options['groups'])
+            ),
+            options['batch_size'],
+        )
+        author_ids = list(User.objects.values_list('pk', flat=True))
+        group_ids = list(Group.objects.values_list('pk', flat=True))
+        group_ids.append(None)
+        now = timezone.now()
+        span = timedelta(days=options['days']).total_seconds()
+        step = span / max(options['posts'], 1)
+        created = 0
+        with explicit_dates():
+            while created < options['posts']:
+                size = min(options['batch_size'], options['posts'] - created)
+                batch = []
+                for i in range(size):
+                    pub_date = now - timedelta(
+                        seconds=span - (created + i) * step
+                    )
+                    batch.append(Post(
+                        text=make_text(),
+                        author_id=rnd.choice(author_ids),
+                        group_id=rnd.choice(group_ids),
+                        pub_date=pub_date,
+                        updated_at=pub_date,
+                    ))
+                with transaction.atomic():
+                    Post.objects.bulk_create(batch)
+                created += size
+                self.stdout.write(f'{created}/{options["posts"]}')
+        finish_bulk_load()
+        self.stdout.write(self.style.SUCCESS('Готово.'))
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from posts.models import TimelineEntry
+from posts.timeline import trim_timelines
+
+
+class Command(BaseCommand):
+    help = (
+        'Оставляет в ленте подписок каждого пользователя только '
+        'POSTS_TIMELINE_LENGTH последних записей.'
+    )
+
+    def handle(self, *args, **options):
+        before = TimelineEntry.objects.count()
+        user_ids = TimelineEntry.objects.order_by().values_list(
+            'user_id', flat=True
+        ).distinct()
+        trim_timelines(user_ids.iterator())
+        removed = before - TimelineEntry.objects.count()
+        self.stdout.write(self.style.SUCCESS(f'Удалено записей: {removed}.'))
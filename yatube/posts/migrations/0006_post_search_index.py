@@ -0,0 +1,49 @@
+# Generated by Django 2.2.16 on 2026-10-18 05:32
+
+from django.db import migrations
+
+from posts.stemmer import stem_words
+
+FTS_TABLE = 'posts_post_fts'
+POSTGRES_INDEX = 'posts_post_text_fts'
+
+
+def create_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == 'postgresql':
+        schema_editor.execute(
+            f'CREATE INDEX {POSTGRES_INDEX} ON posts_post USING GIN '
+            f"(to_tsvector('russian'::regconfig, COALESCE(text, '')))"
+        )
+    if connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(
+        f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(body, "
+        f"tokenize = 'unicode61 remove_diacritics 2')"
+    )
+    Post = apps.get_model('posts', 'Post')
+    with connection.cursor() as cursor:
+        for pk, text in Post.objects.values_list('pk', 'text').iterator():
+            cursor.execute(
+                f'INSERT INTO {FTS_TABLE} (rowid, body) VALUES (%s, %s)',
+                [pk, ' '.join(stem_words(text))],
+            )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute(f'DROP INDEX IF EXISTS {POSTGRES_INDEX}')
+    elif vendor == 'sqlite':
+        schema_editor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0005_post_updated_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
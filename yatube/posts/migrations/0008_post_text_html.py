@@ -0,0 +1,46 @@
+# Generated by Django 2.2.16 on 2026-10-18 05:55
+
+from django.db import migrations, models
+
+from posts.rendering import TEXT_HTML_VERSION, render_text
+
+BATCH_SIZE = 2000
+
+
+def render_posts(apps, schema_editor):
+    Post = apps.get_model('posts', 'Post')
+    sql = (
+        'UPDATE posts_post SET text_html = %s, text_html_version = %s '
+        'WHERE id = %s'
+    )
+    batch = []
+    with schema_editor.connection.cursor() as cursor:
+        rows = Post.objects.order_by().values_list('pk', 'text')
+        for pk, text in rows.iterator(chunk_size=BATCH_SIZE):
+            batch.append((render_text(text), TEXT_HTML_VERSION, pk))
+            if len(batch) == BATCH_SIZE:
+                cursor.executemany(sql, batch)
+                batch = []
+        if batch:
+            cursor.executemany(sql, batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0007_timelines'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='text_html',
+            field=models.TextField(default='', editable=False, verbose_name='Текст в HTML'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='text_html_version',
+            field=models.PositiveSmallIntegerField(default=0, editable=False, verbose_name='Версия HTML'),
+        ),
+        migrations.RunPython(render_posts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 2.2.16 on 2026-10-18 09:12
+
+from django.conf import settings
+from django.db import migrations
+
+BATCH_SIZE = 2000
+
+
+def create_missing_counters(apps, schema_editor):
+    # Counters are now created with their user and only ever updated, so
+    # every user needs one; those without posts had none.
+    User = apps.get_model(*settings.AUTH_USER_MODEL.split('.'))
+    Subscription = apps.get_model('posts', 'Subscription')
+    AuthorCounter = apps.get_model('posts', 'AuthorCounter')
+    missing = User.objects.filter(post_counter__isnull=True).values_list(
+        'pk', flat=True
+    )
+    AuthorCounter.objects.bulk_create(
+        (
+            AuthorCounter(
+                author_id=pk,
+                subscribers_count=Subscription.objects.filter(
+                    author_id=pk
+                ).count(),
+            )
+            for pk in missing.iterator()
+        ),
+        batch_size=BATCH_SIZE,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('posts', '0008_post_text_html'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            create_missing_counters, migrations.RunPython.noop
+        ),
+    ]
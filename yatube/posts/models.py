@@ -1,18 +1,59 @@
 from django.contrib.auth import get_user_model
 from django.db import models
+from django.utils.safestring import mark_safe
+
+from .rendering import TEXT_HTML_VERSION, render_text
 
 User = get_user_model()
 
+# Feeds show text_html, so the raw text is left out; it is loaded only
+# for posts whose HTML is stale until render_posts catches up.
+FEED_FIELDS = (
+    'id',
+    'text_html',
+    'text_html_version',
+    'pub_date',
+    'author',
+    'author__username',
+    'author__first_name',
+    'author__last_name',
+    'group',
+    'group__slug',
+    'group__title',
+)
+
+
+class PostQuerySet(models.QuerySet):
+    def feed(self):
+        """Posts with author and group joined, limited to rendered columns."""
+        return self.select_related('author', 'group').only(*FEED_FIELDS)
+
 
 class Post(models.Model):
     text = models.TextField(
         verbose_name='Текст',
         help_text='Здесь нужно ввести основной текст поста.',
     )
+    # The text rendered once on save, so feeds don't escape and break
+    # lines of every post on every view.
+    text_html = models.TextField(
+        default='',
+        editable=False,
+        verbose_name='Текст в HTML',
+    )
+    text_html_version = models.PositiveSmallIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Версия HTML',
+    )
     pub_date = models.DateTimeField(
         auto_now_add=True,
         verbose_name='Дата публикации',
     )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Дата изменения',
+    )
     author = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
@@ -30,14 +71,55 @@ class Post(models.Model):
         help_text='Здесь можно ввести имя группы.',
     )
 
+    objects = PostQuerySet.as_manager()
+
     class Meta:
         verbose_name = 'Пост'
         verbose_name_plural = 'Посты'
         ordering = ['-pub_date']
+        indexes = [
+            models.Index(
+                fields=['-pub_date', '-id'], name='post_feed_idx'
+            ),
+            models.Index(
+                fields=['author', '-pub_date', '-id'],
+                name='post_author_feed_idx',
+            ),
+            models.Index(
+                fields=['group', '-pub_date', '-id'],
+                name='post_group_feed_idx',
+            ),
+        ]
 
     def __str__(self):
         return self.text[:15]
 
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'text' in update_fields:
+            self.render()
+            if update_fields is not None:
+                kwargs['update_fields'] = {
+                    *update_fields, 'text_html', 'text_html_version'
+                }
+        super().save(*args, **kwargs)
+
+    def render(self):
+        self.text_html = render_text(self.text)
+        self.text_html_version = TEXT_HTML_VERSION
+
+    @property
+    def body_html(self):
+        if self.text_html_version != TEXT_HTML_VERSION:
+            return render_text(self.text)
+        return mark_safe(self.text_html)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_group_id = instance.__dict__.get('group_id')
+        return instance
+
 
 class Group(models.Model):
     title = models.CharField(
@@ -55,6 +137,16 @@ class Group(models.Model):
         verbose_name='Описание группы',
         help_text='Здесь должно быть описание группы.'
     )
+    posts_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество постов',
+    )
+    subscribers_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество подписчиков',
+    )
 
     class Meta:
         verbose_name = 'Группа'
@@ -63,3 +155,120 @@ class Group(models.Model):
 
     def __str__(self):
         return self.title
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_slug = instance.__dict__.get('slug')
+        return instance
+
+
+class AuthorCounter(models.Model):
+    author = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        related_name='post_counter',
+        verbose_name='Автор',
+    )
+    posts_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Количество постов',
+    )
+    subscribers_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Количество подписчиков',
+    )
+
+    class Meta:
+        verbose_name = 'Счётчик постов автора'
+        verbose_name_plural = 'Счётчики постов авторов'
+
+    def __str__(self):
+        return f'{self.author}: {self.posts_count}'
+
+
+class Subscription(models.Model):
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='subscriptions',
+        verbose_name='Подписчик',
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='subscribers',
+        blank=True,
+        null=True,
+        verbose_name='Автор',
+    )
+    group = models.ForeignKey(
+        Group,
+        on_delete=models.CASCADE,
+        related_name='subscribers',
+        blank=True,
+        null=True,
+        verbose_name='Группа',
+    )
+    created = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Дата подписки',
+    )
+
+    class Meta:
+        verbose_name = 'Подписка'
+        verbose_name_plural = 'Подписки'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'author'], name='unique_author_subscription'
+            ),
+            models.UniqueConstraint(
+                fields=['user', 'group'], name='unique_group_subscription'
+            ),
+            models.CheckConstraint(
+                check=(
+                    models.Q(author__isnull=False, group__isnull=True)
+                    | models.Q(author__isnull=True, group__isnull=False)
+                ),
+                name='subscription_author_or_group',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.user} -> {self.author or self.group}'
+
+
+class TimelineEntry(models.Model):
+    """A post delivered to a subscriber's home timeline on write."""
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='timeline',
+        verbose_name='Читатель',
+    )
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='timeline_entries',
+        verbose_name='Пост',
+    )
+    # Copied from the post so a page is a range scan of one index.
+    pub_date = models.DateTimeField(verbose_name='Дата публикации')
+
+    class Meta:
+        verbose_name = 'Запись ленты подписок'
+        verbose_name_plural = 'Записи ленты подписок'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'post'], name='unique_timeline_post'
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=['user', '-pub_date', '-post'],
+                name='timeline_user_feed_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.user}: {self.post_id}'
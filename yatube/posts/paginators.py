@@ -0,0 +1,221 @@
+import base64
+import binascii
+
+from core.caching import get_or_compute
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import Page, Paginator
+from django.db import DatabaseError, connections
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from django.utils.functional import cached_property
+
+FEED_ORDERING = ('-pub_date', '-id')
+
+NEXT = 'n'
+PREVIOUS = 'p'
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+def pack_cursor(*parts):
+    raw = '|'.join(str(part) for part in parts)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def unpack_cursor(cursor, size):
+    padded = cursor + '=' * (-len(cursor) % 4)
+    try:
+        parts = base64.urlsafe_b64decode(padded.encode()).decode().split('|')
+    except (binascii.Error, UnicodeError):
+        raise InvalidCursor(cursor)
+    if len(parts) != size:
+        raise InvalidCursor(cursor)
+    return parts
+
+
+def encode_cursor(direction, post):
+    return pack_cursor(direction, post.pub_date.isoformat(), post.pk)
+
+
+def decode_cursor(cursor):
+    direction, pub_date, pk = unpack_cursor(cursor, 3)
+    try:
+        pub_date = parse_datetime(pub_date)
+        pk = int(pk)
+    except ValueError:
+        raise InvalidCursor(cursor)
+    if direction not in (NEXT, PREVIOUS) or pub_date is None:
+        raise InvalidCursor(cursor)
+    return direction, pub_date, pk
+
+
+def estimate_count(queryset):
+    """Row count of the queryset's table taken from planner statistics.
+
+    Falls back to an exact ``COUNT(*)`` when the database keeps no
+    statistics yet (no ``ANALYZE`` has been run).
+    """
+    connection = connections[queryset.db]
+    table = queryset.model._meta.db_table
+    if connection.vendor == 'postgresql':
+        sql = 'SELECT reltuples::bigint FROM pg_class WHERE relname = %s'
+    elif connection.vendor == 'sqlite':
+        sql = 'SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1'
+    else:
+        return queryset.count()
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [table])
+            row = cursor.fetchone()
+    except DatabaseError:
+        row = None
+    if row is None:
+        return queryset.count()
+    estimate = int(str(row[0]).split()[0])
+    return estimate if estimate > 0 else queryset.count()
+
+
+def keyset_filter(posts, cursor):
+    """Unsliced queryset of posts right after or before the cursor.
+
+    The redundant bound on ``pub_date`` lets the database seek into the
+    feed index instead of scanning it from the top.
+    """
+    direction, pub_date, pk = decode_cursor(cursor)
+    if direction == NEXT:
+        return posts.filter(pub_date__lte=pub_date).filter(
+            Q(pub_date__lt=pub_date) | Q(pk__lt=pk)
+        )
+    return posts.filter(pub_date__gte=pub_date).filter(
+        Q(pub_date__gt=pub_date) | Q(pk__gt=pk)
+    ).order_by('pub_date', 'id')
+
+
+class FeedPage(Page):
+    @property
+    def elided_page_range(self):
+        return self.paginator.get_elided_page_range(self.number)
+
+
+class FeedPaginator(Paginator):
+    """Paginator whose total count is cached under ``count_key``.
+
+    The key is dropped by the post signals whenever a post of the feed is
+    created, edited or deleted. With ``estimate=True`` the count comes from
+    database statistics instead of ``COUNT(*)``.
+    """
+    ELLIPSIS = '…'
+
+    def __init__(self, object_list, per_page, count_key=None, estimate=False):
+        super().__init__(object_list, per_page)
+        self.count_key = count_key
+        self.estimate = estimate
+
+    @cached_property
+    def count(self):
+        if self.count_key is None:
+            return self._count()
+        return get_or_compute(
+            cache,
+            self.count_key,
+            self._count,
+            settings.POSTS_COUNT_CACHE_TIMEOUT,
+            'count',
+        )
+
+    def _count(self):
+        if self.estimate:
+            return estimate_count(self.object_list)
+        return self.object_list.count()
+
+    def _get_page(self, *args, **kwargs):
+        return FeedPage(*args, **kwargs)
+
+    def get_elided_page_range(self, number=1, on_each_side=2, on_ends=1):
+        number = self.validate_number(number)
+        if self.num_pages <= (on_each_side + on_ends) * 2:
+            yield from self.page_range
+            return
+        if number > (1 + on_each_side + on_ends) + 1:
+            yield from range(1, on_ends + 1)
+            yield self.ELLIPSIS
+            yield from range(number - on_each_side, number + 1)
+        else:
+            yield from range(1, number + 1)
+        if number < (self.num_pages - on_each_side - on_ends) - 1:
+            yield from range(number + 1, number + on_each_side + 1)
+            yield self.ELLIPSIS
+            yield from range(self.num_pages - on_ends + 1, self.num_pages + 1)
+        else:
+            yield from range(number + 1, self.num_pages + 1)
+
+
+class CursorPage(Page):
+    """Page of a keyset-paginated feed.
+
+    Knows only its neighbours, so it has no number and never counts rows.
+    """
+
+    def __init__(self, object_list, paginator, next_cursor, previous_cursor):
+        super().__init__(object_list, None, paginator)
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __repr__(self):
+        return '<CursorPage>'
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+
+class CursorPaginator(Paginator):
+    """Keyset pagination over ``(pub_date, id)``.
+
+    Every page is fetched with a single ``WHERE ... LIMIT per_page + 1``
+    query, so deep pages cost the same as the first one.
+    """
+
+    def __init__(self, object_list, per_page):
+        super().__init__(object_list.order_by(*FEED_ORDERING), per_page)
+
+    def get_page(self, cursor):
+        try:
+            return self.page(cursor)
+        except InvalidCursor:
+            return self.page(None)
+
+    def keyset_queryset(self, cursor):
+        return keyset_filter(self.object_list, cursor)
+
+    def page(self, cursor):
+        if not cursor:
+            return self._first_page()
+        rows = list(self.keyset_queryset(cursor)[:self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if decode_cursor(cursor)[0] == NEXT:
+            return self._build_page(rows, has_next=has_more, has_previous=True)
+        return self._build_page(
+            rows[::-1], has_next=True, has_previous=has_more
+        )
+
+    def _first_page(self):
+        rows = list(self.object_list[:self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        return self._build_page(
+            rows[:self.per_page], has_next=has_more, has_previous=False
+        )
+
+    def _build_page(self, rows, has_next, has_previous):
+        next_cursor = previous_cursor = None
+        if rows and has_next:
+            next_cursor = encode_cursor(NEXT, rows[-1])
+        if rows and has_previous:
+            previous_cursor = encode_cursor(PREVIOUS, rows[0])
+        return CursorPage(rows, self, next_cursor, previous_cursor)
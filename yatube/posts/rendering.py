@@ -0,0 +1,10 @@
+from django.template.defaultfilters import linebreaksbr
+
+# Bump when render_text changes; posts rendered by an older version are
+# rendered again on read until `manage.py render_posts` catches up.
+TEXT_HTML_VERSION = 1
+
+
+def render_text(text):
+    """Post text as the HTML fragment the templates output."""
+    return linebreaksbr(text, autoescape=True)
@@ -0,0 +1,129 @@
+from django.db import connection, connections, router
+
+from .models import Post
+from .paginators import InvalidCursor, pack_cursor, unpack_cursor
+from .stemmer import stem_words
+
+FTS_TABLE = 'posts_post_fts'
+INSERT_SQL = f'INSERT INTO {FTS_TABLE} (rowid, body) VALUES (%s, %s)'
+DELETE_SQL = f'DELETE FROM {FTS_TABLE} WHERE rowid = %s'
+POSTGRES_CONFIG = 'russian'
+
+
+def decode_cursor(cursor):
+    score, pk = unpack_cursor(cursor, 2)
+    try:
+        return float(score), int(pk)
+    except ValueError:
+        raise InvalidCursor(cursor)
+
+
+def search_body(text):
+    return ' '.join(stem_words(text))
+
+
+def match_expression(query):
+    """FTS5 query matching every stemmed word of the user's query."""
+    words = stem_words(query)
+    return ' '.join(f'"{word}"' for word in words)
+
+
+def index_post(post):
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(DELETE_SQL, [post.pk])
+        cursor.execute(INSERT_SQL, [post.pk, search_body(post.text)])
+
+
+def unindex_post(post_id):
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(DELETE_SQL, [post_id])
+
+
+def rebuild_index(batch_size=2000):
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE}')
+        rows = Post.objects.order_by().values_list('pk', 'text')
+        batch = []
+        for pk, text in rows.iterator(chunk_size=batch_size):
+            batch.append((pk, search_body(text)))
+            if len(batch) == batch_size:
+                cursor.executemany(INSERT_SQL, batch)
+                batch = []
+        if batch:
+            cursor.executemany(INSERT_SQL, batch)
+
+
+def _sqlite_hits(query, after, limit):
+    params = [match_expression(query)]
+    where = ''
+    if after is not None:
+        where = 'WHERE score > %s OR (score = %s AND id > %s)'
+        params += [after[0], after[0], after[1]]
+    sql = (
+        f'SELECT id, score FROM ('
+        f'SELECT rowid AS id, bm25({FTS_TABLE}) AS score FROM {FTS_TABLE} '
+        f'WHERE {FTS_TABLE} MATCH %s'
+        f') {where} ORDER BY score, id LIMIT %s'
+    )
+    # Raw SQL bypasses the router; ask it where Post reads go.
+    with connections[router.db_for_read(Post)].cursor() as cursor:
+        cursor.execute(sql, params + [limit])
+        return cursor.fetchall()
+
+
+def _postgres_hits(query, after, limit):
+    from django.contrib.postgres.search import (SearchQuery, SearchRank,
+                                                SearchVector)
+    from django.db.models import F, Q
+
+    vector = SearchVector('text', config=POSTGRES_CONFIG)
+    search_query = SearchQuery(query, config=POSTGRES_CONFIG)
+    # Smaller scores rank first on every backend.
+    posts = Post.objects.annotate(
+        document=vector, score=-SearchRank(F('document'), search_query)
+    ).filter(document=search_query)
+    if after is not None:
+        posts = posts.filter(
+            Q(score__gt=after[0]) | Q(score=after[0], pk__gt=after[1])
+        )
+    hits = posts.order_by('score', 'pk').values_list('pk', 'score')
+    return list(hits[:limit])
+
+
+def _fallback_hits(query, after, limit):
+    posts = Post.objects.order_by('pk')
+    for word in query.split():
+        posts = posts.filter(text__icontains=word)
+    if after is not None:
+        posts = posts.filter(pk__gt=after[1])
+    return [(pk, 0.0) for pk in posts.values_list('pk', flat=True)[:limit]]
+
+
+def search_posts(query, cursor=None, limit=10):
+    """Ranked page of posts matching ``query`` and the cursor of the next.
+
+    The cursor carries the score and id of the last hit, so every page is
+    a single ranked range query.
+    """
+    if not stem_words(query):
+        return [], None
+    after = decode_cursor(cursor) if cursor else None
+    if connection.vendor == 'sqlite':
+        hits = _sqlite_hits(query, after, limit + 1)
+    elif connection.vendor == 'postgresql':
+        hits = _postgres_hits(query, after, limit + 1)
+    else:
+        hits = _fallback_hits(query, after, limit + 1)
+    next_cursor = None
+    if len(hits) > limit:
+        hits = hits[:limit]
+        pk, score = hits[-1]
+        next_cursor = pack_cursor(repr(score), pk)
+    posts = Post.objects.feed().in_bulk([pk for pk, _ in hits])
+    return [posts[pk] for pk, _ in hits if pk in posts], next_cursor
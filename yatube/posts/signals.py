@@ -0,0 +1,148 @@
+from functools import partial
+
+from core.caching import invalidate
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import (post_delete, post_save, pre_delete,
+                                      pre_save)
+from django.dispatch import receiver
+
+from . import counters, identity, tasks
+from .cache import (ALL_FEEDS, AUTHOR_FEED, FOLLOW_FEED, GROUP_FEED,
+                    INDEX_FEED, bump_feeds, post_count_keys)
+from .models import Group, Post, Subscription, User
+
+
+def post_feeds(post):
+    feeds = [(INDEX_FEED,), (AUTHOR_FEED, post.author.username)]
+    if post.group_id is not None:
+        feeds.append((GROUP_FEED, post.group.slug))
+    previous_group_id = getattr(post, '_loaded_group_id', None)
+    if previous_group_id not in (None, post.group_id):
+        slug = Group.objects.filter(pk=previous_group_id).values_list(
+            'slug', flat=True
+        ).first()
+        if slug is not None:
+            feeds.append((GROUP_FEED, slug))
+    return feeds
+
+
+def after_commit(func, *args):
+    """Invalidate once the write is visible to other connections.
+
+    Done earlier, a concurrent request could cache what the database had
+    before the write until the entry expires.
+    """
+    transaction.on_commit(partial(func, *args))
+
+
+def invalidate_post(post):
+    after_commit(invalidate, cache, post_count_keys(post))
+    after_commit(bump_feeds, *post_feeds(post))
+
+
+@receiver(post_save, sender=Post)
+def post_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    previous_group_id = getattr(
+        instance, '_loaded_group_id', instance.group_id
+    )
+    if created:
+        counters.post_created(instance)
+    else:
+        counters.post_moved(instance, previous_group_id)
+    invalidate_post(instance)
+    post_id = instance.pk
+    version = f'{post_id}:{instance.updated_at.timestamp()}'
+    tasks.index_post.delay(post_id, key=f'search:{version}')
+    if created or previous_group_id != instance.group_id:
+        # Keyed by version, so a post moved back to a group it left is
+        # fanned out there again.
+        tasks.fan_out.delay(
+            post_id, key=f'fanout:{version}:{instance.group_id}'
+        )
+    if created:
+        tasks.notify_subscribers.delay(post_id, key=f'notify:{post_id}')
+    instance._loaded_group_id = instance.group_id
+
+
+@receiver(post_delete, sender=Post)
+def post_deleted(sender, instance, **kwargs):
+    counters.post_removed(instance)
+    invalidate_post(instance)
+    tasks.unindex_post.delay(instance.pk)
+
+
+@receiver(post_save, sender=Group)
+def group_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    feeds = [(GROUP_FEED, instance.slug)]
+    previous_slug = getattr(instance, '_loaded_slug', instance.slug)
+    if previous_slug != instance.slug:
+        # Every feed links to the group by its slug.
+        feeds += [(GROUP_FEED, previous_slug), (ALL_FEEDS,)]
+    after_commit(bump_feeds, *feeds)
+    after_commit(identity.forget, Group, instance.slug, previous_slug)
+    instance._loaded_slug = instance.slug
+
+
+@receiver(post_delete, sender=Group)
+def group_deleted(sender, instance, **kwargs):
+    after_commit(bump_feeds, (GROUP_FEED, instance.slug), (ALL_FEEDS,))
+    after_commit(identity.forget, Group, instance.slug)
+
+
+@receiver(pre_save, sender=User)
+def user_saving(sender, instance, update_fields=None, raw=False, **kwargs):
+    # Remember the old username, so a rename forgets the old entry too.
+    if raw or instance.pk is None:
+        return
+    if update_fields is None or 'username' in update_fields:
+        instance._previous_username = User.objects.filter(
+            pk=instance.pk
+        ).values_list('username', flat=True).first()
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        counters.author_created(instance)
+    previous = getattr(instance, '_previous_username', None)
+    after_commit(
+        identity.forget, User, *{instance.username, previous} - {None}
+    )
+
+
+@receiver(pre_delete, sender=User)
+def user_deleting(sender, instance, **kwargs):
+    counters.deleting_authors().add(instance.pk)
+
+
+@receiver(post_delete, sender=User)
+def user_deleted(sender, instance, **kwargs):
+    counters.deleting_authors().discard(instance.pk)
+    after_commit(identity.forget, User, instance.username)
+
+
+@receiver(post_save, sender=Subscription)
+def subscription_saved(sender, instance, created, raw=False, **kwargs):
+    if raw or not created:
+        return
+    counters.change_subscribers_count(instance, 1)
+    tasks.backfill_timeline.delay(
+        instance.user_id, instance.author_id, instance.group_id
+    )
+    after_commit(bump_feeds, (FOLLOW_FEED, instance.user_id))
+
+
+@receiver(post_delete, sender=Subscription)
+def subscription_deleted(sender, instance, **kwargs):
+    counters.change_subscribers_count(instance, -1)
+    tasks.prune_timeline.delay(
+        instance.user_id, instance.author_id, instance.group_id
+    )
+    after_commit(bump_feeds, (FOLLOW_FEED, instance.user_id))
@@ -0,0 +1,67 @@
+"""Snowball (Porter) stemmer for Russian.
+
+Used on both sides of the full-text index: post bodies are stored stemmed
+and search queries are stemmed the same way, so «котами» finds «кот».
+"""
+import re
+
+PERFECTIVE_GERUND = re.compile(
+    r'((ив|ивши|ившись|ыв|ывши|ывшись)|((?<=[ая])(в|вши|вшись)))$'
+)
+REFLEXIVE = re.compile(r'(с[яь])$')
+ADJECTIVE = re.compile(
+    r'(ее|ие|ые|ое|ими|ыми|ей|ий|ый|ой|ем|им|ым|ом|его|ого|ему|ому|их|ых|'
+    r'ую|юю|ая|яя|ою|ею)$'
+)
+PARTICIPLE = re.compile(r'((ивш|ывш|ующ)|((?<=[ая])(ем|нн|вш|ющ|щ)))$')
+VERB = re.compile(
+    r'((ила|ыла|ена|ейте|уйте|ите|или|ыли|ей|уй|ил|ыл|им|ым|ен|ило|ыло|ено|'
+    r'ят|ует|уют|ит|ыт|ены|ить|ыть|ишь|ую|ю)|'
+    r'((?<=[ая])(ла|на|ете|йте|ли|й|л|ем|н|ло|но|ет|ют|ны|ть|ешь|нно)))$'
+)
+NOUN = re.compile(
+    r'(а|ев|ов|ие|ье|е|иями|ями|ами|еи|ии|и|ией|ей|ой|ий|й|иям|ям|ием|ем|'
+    r'ам|ом|о|у|ах|иях|ях|ы|ь|ию|ью|ю|ия|ья|я)$'
+)
+RV = re.compile(r'^(.*?[аеиоуыэюя])(.*)$')
+DERIVATIONAL = re.compile(r'.*[^аеиоуыэюя]+[аеиоуыэюя].*ость?$')
+DERIVATIONAL_ENDING = re.compile(r'ость?$')
+SUPERLATIVE = re.compile(r'(ейше|ейш)$')
+I_ENDING = re.compile(r'и$')
+SOFT_SIGN = re.compile(r'ь$')
+DOUBLE_N = re.compile(r'нн$')
+WORD = re.compile(r'\w+')
+CYRILLIC = re.compile(r'[а-я]')
+
+
+def stem(word):
+    word = word.lower().replace('ё', 'е')
+    match = RV.match(word)
+    if not CYRILLIC.search(word) or match is None:
+        return word
+    start, rv = match.groups()
+    stripped = PERFECTIVE_GERUND.sub('', rv, 1)
+    if stripped == rv:
+        rv = REFLEXIVE.sub('', rv, 1)
+        stripped = ADJECTIVE.sub('', rv, 1)
+        if stripped != rv:
+            rv = PARTICIPLE.sub('', stripped, 1)
+        else:
+            stripped = VERB.sub('', rv, 1)
+            rv = NOUN.sub('', rv, 1) if stripped == rv else stripped
+    else:
+        rv = stripped
+    rv = I_ENDING.sub('', rv, 1)
+    if DERIVATIONAL.match(rv):
+        rv = DERIVATIONAL_ENDING.sub('', rv, 1)
+    stripped = SOFT_SIGN.sub('', rv, 1)
+    if stripped == rv:
+        rv = SUPERLATIVE.sub('', rv, 1)
+        rv = DOUBLE_N.sub('н', rv, 1)
+    else:
+        rv = stripped
+    return start + rv
+
+
+def stem_words(text):
+    return [stem(word) for word in WORD.findall(text)]
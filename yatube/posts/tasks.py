@@ -0,0 +1,71 @@
+from core.tasks import task
+from django.conf import settings
+from django.core.mail import send_mass_mail
+from django.db.models import Q
+from django.urls import reverse
+
+from . import search, timeline
+from .models import Post, User
+
+NOTIFY_BATCH = 100
+
+
+@task()
+def index_post(post_id):
+    post = Post.objects.filter(pk=post_id).only('text').first()
+    if post is None:
+        search.unindex_post(post_id)
+    else:
+        search.index_post(post)
+
+
+@task()
+def unindex_post(post_id):
+    search.unindex_post(post_id)
+
+
+@task()
+def fan_out(post_id):
+    post = Post.objects.filter(pk=post_id).only(
+        'pub_date', 'author', 'group'
+    ).first()
+    if post is not None:
+        timeline.fan_out(post)
+
+
+@task()
+def backfill_timeline(user_id, author_id, group_id):
+    timeline.backfill(user_id, author_id, group_id)
+
+
+@task()
+def prune_timeline(user_id, author_id, group_id):
+    timeline.remove_source(user_id, author_id, group_id)
+
+
+@task()
+def notify_subscribers(post_id):
+    """E-mail subscribers of the post's author and group about it."""
+    post = Post.objects.select_related('author', 'group').filter(
+        pk=post_id
+    ).first()
+    if post is None:
+        return
+    sources = Q(subscriptions__author_id=post.author_id)
+    if post.group_id is not None:
+        sources |= Q(subscriptions__group_id=post.group_id)
+    emails = User.objects.filter(sources).exclude(email='').exclude(
+        pk=post.author_id
+    ).values_list('email', flat=True).distinct()
+    author = post.author.get_full_name() or post.author.username
+    subject = f'Новая запись: {author}'
+    url = settings.SITE_URL + reverse('posts:post_detail', args=(post.pk,))
+    body = f'{post.text[:500]}\n\nЧитать полностью: {url}'
+    batch = []
+    for email in emails.iterator():
+        batch.append((subject, body, None, [email]))
+        if len(batch) == NOTIFY_BATCH:
+            send_mass_mail(batch)
+            batch = []
+    if batch:
+        send_mass_mail(batch)
@@ -0,0 +1,67 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from posts.models import Group, Post
+
+User = get_user_model()
+
+
+class FeedApiTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='author')
+        cls.other = User.objects.create_user(username='other')
+        cls.group = Group.objects.create(
+            title='Группа', slug='group', description='Описание'
+        )
+        for i in range(7):
+            Post.objects.create(
+                author=cls.author if i % 2 else cls.other,
+                text=f'Пост {i}',
+                group=cls.group if i < 3 else None,
+            )
+
+    def fetch(self, url, **params):
+        response = self.client.get(url, params)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertTrue(response.streaming)
+        return json.loads(b''.join(response.streaming_content))
+
+    def test_cursor_walks_whole_feed(self):
+        url = reverse('posts:api_index')
+        data = self.fetch(url, limit=3)
+        texts = [post['text'] for post in data['results']]
+        while data['next']:
+            data = self.fetch(url, limit=3, cursor=data['next'])
+            texts += [post['text'] for post in data['results']]
+        self.assertEqual(texts, [f'Пост {i}' for i in reversed(range(7))])
+
+    def test_sparse_fields_and_filters(self):
+        data = self.fetch(
+            reverse('posts:api_group', args=(self.group.slug,)), limit='all'
+        )
+        self.assertEqual(len(data['results']), 3)
+        self.assertIsNone(data['next'])
+        self.assertEqual(
+            set(data['results'][0]),
+            {'id', 'text', 'pub_date', 'author', 'group'},
+        )
+        self.assertEqual(data['results'][0]['group'], 'group')
+        data = self.fetch(
+            reverse('posts:api_profile', args=(self.author.username,))
+        )
+        self.assertEqual(
+            {post['author'] for post in data['results']}, {'author'}
+        )
+        self.assertEqual(len(data['results']), 3)
+
+    def test_bad_cursor_and_unknown_feed(self):
+        response = self.client.get(
+            reverse('posts:api_index'), {'cursor': 'garbage'}
+        )
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get(reverse('posts:api_group', args=('no',)))
+        self.assertEqual(response.status_code, 404)
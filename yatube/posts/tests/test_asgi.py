@@ -0,0 +1,72 @@
+import asyncio
+import json
+
+from django.contrib.auth import get_user_model
+from django.test import TransactionTestCase
+from django.urls import reverse
+from posts.models import Group, Post
+from yatube.asgi import application
+
+User = get_user_model()
+
+
+def call(path, query_string=b'', headers=()):
+    """Drive the ASGI application the way a server would."""
+    sent = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b''}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {
+        'type': 'http',
+        'method': 'GET',
+        'path': path,
+        'query_string': query_string,
+        'headers': list(headers),
+        'server': ('testserver', 80),
+        'client': ('127.0.0.1', 50000),
+    }
+    asyncio.run(application(scope, receive, send))
+    start, *body = sent
+    return start, b''.join(message.get('body', b'') for message in body)
+
+
+class AsgiFeedTests(TransactionTestCase):
+    def setUp(self):
+        self.author = User.objects.create_user(username='author')
+        self.group = Group.objects.create(
+            title='Группа', slug='group', description='Описание'
+        )
+        self.post = Post.objects.create(
+            author=self.author, text='Пост через ASGI', group=self.group
+        )
+
+    def test_feed_views_are_served(self):
+        urls = (
+            reverse('posts:index'),
+            reverse('posts:group_list', args=(self.group.slug,)),
+            reverse('posts:profile', args=(self.author.username,)),
+            reverse('posts:post_detail', args=(self.post.pk,)),
+        )
+        for url in urls:
+            with self.subTest(url=url):
+                start, body = call(url)
+                self.assertEqual(start['status'], 200)
+                self.assertIn(self.post.text, body.decode())
+
+    def test_streaming_response_is_sent_in_chunks(self):
+        start, body = call(reverse('posts:api_index'), b'limit=all')
+        self.assertEqual(start['status'], 200)
+        self.assertIn(
+            (b'content-type', b'application/json'), start['headers']
+        )
+        self.assertEqual(
+            json.loads(body)['results'][0]['text'], self.post.text
+        )
+
+    def test_missing_page(self):
+        start, _ = call(reverse('posts:group_list', args=('missing',)))
+        self.assertEqual(start['status'], 404)
@@ -0,0 +1,286 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from core.apps import check_caches
+from core.caching import get_or_compute, invalidate, lock_key
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.http import HttpResponse
+from django.test import (Client, RequestFactory, SimpleTestCase, TestCase,
+                         override_settings)
+from django.urls import reverse
+from posts.cache import (AUTHOR_FEED, GROUP_FEED, cache_view, clear_caches,
+                         feed_cache, feed_page_key, version_key)
+from posts.models import Group, Post
+
+from .utils import commit_hooks
+
+User = get_user_model()
+
+
+class FeedCacheTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='author')
+        cls.group = Group.objects.create(
+            title='Первая группа', slug='first', description='Описание'
+        )
+        cls.other_group = Group.objects.create(
+            title='Вторая группа', slug='second', description='Описание'
+        )
+        cls.urls = {
+            'index': reverse('posts:index'),
+            'group': reverse('posts:group_list', args=('first',)),
+            'other_group': reverse('posts:group_list', args=('second',)),
+            'profile': reverse('posts:profile', args=('author',)),
+        }
+
+    def setUp(self):
+        clear_caches()
+        self.post = Post.objects.create(
+            author=self.author, text='Старый текст', group=self.group
+        )
+        self.author_client = Client()
+        self.author_client.force_login(self.author)
+
+    def test_anonymous_feed_pages_are_served_from_cache(self):
+        for name, url in self.urls.items():
+            with self.subTest(feed=name):
+                first = self.client.get(url)
+                with self.assertNumQueries(0):
+                    second = self.client.get(url)
+                self.assertEqual(first.content, second.content)
+
+    def test_authenticated_users_bypass_cache(self):
+        self.client.get(self.urls['index'])
+        response = self.author_client.get(self.urls['index'])
+        self.assertIsNotNone(response.context)
+
+    def test_post_write_invalidates_its_feeds_only(self):
+        for url in self.urls.values():
+            self.client.get(url)
+        with commit_hooks():
+            self.author_client.post(
+                reverse('posts:post_edit', args=(self.post.id,)),
+                {'text': 'Новый текст', 'group': self.other_group.id},
+            )
+        for name in ('index', 'group', 'other_group', 'profile'):
+            with self.subTest(feed=name):
+                response = self.client.get(self.urls[name])
+                self.assertIsNotNone(response.context)
+                self.assertEqual(
+                    'Новый текст' in response.content.decode(),
+                    name != 'group',
+                )
+
+    def test_invalidation_waits_for_commit(self):
+        self.client.get(self.urls['index'])
+        with commit_hooks():
+            Post.objects.create(author=self.author, text='Свежий пост')
+            response = self.client.get(self.urls['index'])
+            self.assertNotContains(response, 'Свежий пост')
+        response = self.client.get(self.urls['index'])
+        self.assertContains(response, 'Свежий пост')
+
+    def test_group_edit_invalidates_group_feed(self):
+        self.client.get(self.urls['group'])
+        self.client.get(self.urls['index'])
+        self.group.title = 'Переименованная группа'
+        with commit_hooks():
+            self.group.save()
+        response = self.client.get(self.urls['group'])
+        self.assertContains(response, 'Переименованная группа')
+        with self.assertNumQueries(0):
+            self.client.get(self.urls['index'])
+
+
+class ConditionalGetTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='author')
+        cls.group = Group.objects.create(
+            title='Группа', slug='group', description='Описание'
+        )
+
+    def setUp(self):
+        clear_caches()
+        self.post = Post.objects.create(
+            author=self.author, text='Текст', group=self.group
+        )
+        self.author_client = Client()
+        self.author_client.force_login(self.author)
+        self.urls = (
+            reverse('posts:index'),
+            reverse('posts:group_list', args=(self.group.slug,)),
+            reverse('posts:profile', args=(self.author.username,)),
+            reverse('posts:post_detail', args=(self.post.id,)),
+        )
+
+    def test_unchanged_pages_answer_not_modified(self):
+        for url in self.urls:
+            with self.subTest(url=url):
+                etag = self.client.get(url)['ETag']
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 304)
+                response = self.author_client.get(
+                    url, HTTP_IF_NONE_MATCH=etag
+                )
+                self.assertEqual(response.status_code, 200)
+
+    def test_missing_pages_have_no_etag(self):
+        for feed, url in (
+            (GROUP_FEED, reverse('posts:group_list', args=('missing',))),
+            (AUTHOR_FEED, reverse('posts:profile', args=('missing',))),
+            (None, reverse('posts:post_detail', args=(self.post.id + 1,))),
+        ):
+            with self.subTest(url=url):
+                response = self.client.get(url, HTTP_IF_NONE_MATCH='*')
+                self.assertEqual(response.status_code, 404)
+                self.assertFalse(response.has_header('ETag'))
+                if feed is not None:
+                    self.assertIsNone(
+                        feed_cache().get(version_key(feed, 'missing'))
+                    )
+
+    def test_edit_changes_validators(self):
+        etags = [self.client.get(url)['ETag'] for url in self.urls]
+        updated_at = self.post.updated_at
+        with commit_hooks():
+            self.author_client.post(
+                reverse('posts:post_edit', args=(self.post.id,)),
+                {'text': 'Новый текст', 'group': self.group.id},
+            )
+        self.post.refresh_from_db()
+        self.assertGreater(self.post.updated_at, updated_at)
+        for url, etag in zip(self.urls, etags):
+            with self.subTest(url=url):
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 200)
+
+
+@override_settings(CACHE_LOCK_WAIT=0.5, CACHE_EARLY_REFRESH=0)
+class StampedeTests(SimpleTestCase):
+    def setUp(self):
+        self.cache = caches['default']
+        self.cache.clear()
+        self.calls = 0
+
+    def compute(self, value='новое'):
+        self.calls += 1
+        return value
+
+    def test_one_worker_computes_a_missing_value(self):
+        def slow():
+            time.sleep(0.1)
+            return self.compute()
+
+        with ThreadPoolExecutor(8) as pool:
+            values = list(pool.map(
+                lambda _: get_or_compute(self.cache, 'key', slow, 60, 'test'),
+                range(8),
+            ))
+        self.assertEqual(values, ['новое'] * 8)
+        self.assertEqual(self.calls, 1)
+
+    def test_stale_value_is_served_while_another_worker_refreshes(self):
+        get_or_compute(self.cache, 'key', lambda: 'старое', 0, 'test')
+        self.cache.add(lock_key('key'), 1)
+        value = get_or_compute(self.cache, 'key', self.compute, 60, 'test')
+        self.assertEqual(value, 'старое')
+        self.assertEqual(self.calls, 0)
+        self.cache.delete(lock_key('key'))
+        value = get_or_compute(self.cache, 'key', self.compute, 60, 'test')
+        self.assertEqual(value, 'новое')
+
+    @override_settings(CACHE_EARLY_REFRESH=1)
+    def test_value_is_refreshed_early_by_chance(self):
+        self.cache.set('key', ('старое', time.time() + 1, 10), 60)
+        with mock.patch('random.random', return_value=0.9):
+            value = get_or_compute(self.cache, 'key', self.compute, 60, 'test')
+        self.assertEqual(value, 'новое')
+        with mock.patch('random.random', return_value=0.0):
+            value = get_or_compute(self.cache, 'key', self.compute, 60, 'test')
+        self.assertEqual(self.calls, 1)
+
+    def test_uncacheable_result_is_not_stored(self):
+        self.assertIsNone(
+            get_or_compute(self.cache, 'key', lambda: None, 60, 'test')
+        )
+        self.assertIsNone(self.cache.get('key'))
+        self.assertIsNone(self.cache.get(lock_key('key')))
+
+    def test_value_invalidated_while_computed_is_not_stored(self):
+        def racing():
+            invalidate(self.cache, ['key'])
+            return self.compute('старое')
+
+        value = get_or_compute(self.cache, 'key', racing, 60, 'test')
+        self.assertEqual(value, 'старое')
+        value = get_or_compute(self.cache, 'key', self.compute, 60, 'test')
+        self.assertEqual(value, 'новое')
+        value = get_or_compute(self.cache, 'key', self.compute, 60, 'test')
+        self.assertEqual(self.calls, 2)
+
+
+class SharedCachesTests(SimpleTestCase):
+    def test_per_process_caches_are_refused(self):
+        memcached = {
+            'BACKEND': 'django.core.cache.backends.memcached.MemcachedCache',
+            'LOCATION': '127.0.0.1:11211',
+        }
+        locmem = {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+        with self.settings(CACHES={'default': memcached, 'feeds': locmem}):
+            with self.assertRaisesMessage(ImproperlyConfigured, 'feeds'):
+                check_caches()
+        with self.settings(CACHES={'default': memcached}):
+            check_caches()
+
+
+class FeedPageKeyTests(SimpleTestCase):
+    def key(self, **params):
+        request = RequestFactory().get('/', params)
+        return feed_page_key(GROUP_FEED, 'слаг' * 100, request)
+
+    def test_keys_are_short_and_ascii(self):
+        for key in (self.key(), version_key(GROUP_FEED, 'слаг' * 100)):
+            with self.subTest(key=key):
+                self.assertLess(len(key), 250)
+                self.assertTrue(key.isascii())
+
+    def test_equivalent_requests_share_a_key(self):
+        self.assertEqual(self.key(), self.key(page='1'))
+        self.assertEqual(self.key(page='x'), self.key(page='0'))
+        self.assertEqual(self.key(cursor='x'), self.key(cursor='y' * 500))
+        self.assertNotEqual(self.key(), self.key(cursor='x'))
+        self.assertNotEqual(self.key(), self.key(page='2'))
+
+    @override_settings(POSTS_FEED_CACHE_PAGES=5)
+    def test_deep_pages_are_not_cached(self):
+        self.assertIsNotNone(self.key(page='5'))
+        self.assertIsNone(self.key(page='6'))
+
+
+class CacheViewTests(SimpleTestCase):
+    def setUp(self):
+        clear_caches()
+
+    def test_cached_responses_keep_view_headers(self):
+        @cache_view('test', lambda request: 'posts:page:test')
+        def view(request):
+            response = HttpResponse('{}', content_type='application/json')
+            response['Content-Language'] = 'ru'
+            return response
+
+        for attempt in ('miss', 'hit'):
+            request = RequestFactory().get('/')
+            request.user = AnonymousUser()
+            response = view(request)
+            with self.subTest(attempt=attempt):
+                self.assertEqual(response['Content-Type'], 'application/json')
+                self.assertEqual(response['Content-Language'], 'ru')
+                self.assertEqual(response['Vary'], 'Cookie')
@@ -0,0 +1,217 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from io import StringIO
+
+from core.benchmarks import percentiles
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from posts.models import (AuthorCounter, Group, Post, Subscription,
+                          TimelineEntry)
+from posts.search import search_posts
+
+User = get_user_model()
+
+
+class SeedAndExplainCommandsTests(TestCase):
+    def test_seed_posts_fills_database_and_counters(self):
+        call_command(
+            'seed_posts', users=3, groups=2, posts=50, seed=1,
+            stdout=StringIO(),
+        )
+        self.assertEqual(Post.objects.count(), 50)
+        self.assertEqual(Group.objects.count(), 2)
+        self.assertEqual(
+            sum(AuthorCounter.objects.values_list('posts_count', flat=True)),
+            50,
+        )
+        dates = list(Post.objects.values_list('pub_date', flat=True))
+        self.assertGreater(len(set(dates)), 1)
+
+    def test_seed_posts_with_faker_texts(self):
+        call_command(
+            'seed_posts', users=1, groups=1, posts=5, seed=1, faker=True,
+            stdout=StringIO(),
+        )
+        texts = set(Post.objects.values_list('text', flat=True))
+        self.assertEqual(len(texts), 5)
+
+    def test_benchmark_covers_every_url(self):
+        call_command(
+            'seed_posts', users=2, groups=1, posts=20, seed=1,
+            stdout=StringIO(),
+        )
+        with tempfile.NamedTemporaryFile('r', suffix='.json') as file:
+            call_command(
+                'benchmark', repeat=1, warmup=0, json_path=file.name,
+                stdout=StringIO(),
+            )
+            report = json.load(file)
+        urls = {result['path'] for result in report['endpoints'].values()}
+        self.assertIn(reverse('users:password_change_done'), urls)
+        for label, result in report['endpoints'].items():
+            with self.subTest(label=label):
+                self.assertLess(max(result['status']), 400)
+                self.assertIn('p99_ms', result)
+        self.assertGreater(
+            report['endpoints']['index (auth)']['render_p50_ms'], 0
+        )
+
+    def test_benchmark_startup_reports_every_profile(self):
+        with tempfile.NamedTemporaryFile('r', suffix='.json') as file:
+            call_command(
+                'benchmark_startup', profiles=['dev', 'prod'], repeat=1,
+                json_path=file.name, stdout=StringIO(),
+            )
+            report = json.load(file)
+        for profile in ('dev', 'prod'):
+            for entry_point in ('check', 'wsgi'):
+                with self.subTest(profile=profile, entry_point=entry_point):
+                    result = report['profiles'][profile][entry_point]
+                    self.assertGreater(result['import_ms'], 0)
+                    self.assertIn('django', result['packages'])
+
+    def test_explain_feeds_reports_every_feed(self):
+        call_command(
+            'seed_posts', users=1, groups=1, posts=30, seed=1,
+            stdout=StringIO(),
+        )
+        out = StringIO()
+        call_command('explain_feeds', page=2, repeat=1, stdout=out)
+        for view in ('index', 'profile'):
+            with self.subTest(view=view):
+                self.assertIn(f'{view}: page 2 (cursor)', out.getvalue())
+
+
+class PercentilesTests(SimpleTestCase):
+    def test_nearest_rank(self):
+        self.assertEqual(
+            percentiles([float(ms) for ms in range(100, 0, -1)]),
+            {'p50_ms': 50.0, 'p95_ms': 95.0, 'p99_ms': 99.0},
+        )
+        self.assertEqual(
+            percentiles([7.5]),
+            {'p50_ms': 7.5, 'p95_ms': 7.5, 'p99_ms': 7.5},
+        )
+
+
+class EntryPointTests(SimpleTestCase):
+    def test_servers_default_to_prod(self):
+        env = {
+            name: value for name, value in os.environ.items()
+            if name not in ('DJANGO_ENV', 'DJANGO_SETTINGS_MODULE')
+        }
+        env['DJANGO_SECRET_KEY'] = 'entry-point-test'
+        for alias in ('DEFAULT', 'FEED', 'SESSION'):
+            env[f'{alias}_CACHE_BACKEND'] = (
+                'django.core.cache.backends.memcached.MemcachedCache'
+            )
+        for module in ('yatube.wsgi', 'yatube.asgi'):
+            with self.subTest(module=module):
+                process = subprocess.run(
+                    [
+                        sys.executable, '-c',
+                        f'import {module}; from django.conf import settings;'
+                        ' print(settings.ENVIRONMENT, settings.DEBUG)',
+                    ],
+                    cwd=settings.BASE_DIR, env=env, capture_output=True,
+                    text=True,
+                )
+                self.assertEqual(process.stdout.strip(), 'prod False')
+
+
+class ImportExportCommandsTests(TestCase):
+    def setUp(self):
+        self.author = User.objects.create_user(username='author')
+        self.group = Group.objects.create(
+            title='Группа', slug='group', description='Описание'
+        )
+        Post.objects.create(
+            author=self.author, text='Первый пост про котов', group=self.group
+        )
+        Post.objects.create(author=self.author, text='Второй пост,\nв CSV')
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def round_trip(self, format):
+        posts_path = os.path.join(self.directory.name, f'posts.{format}')
+        groups_path = os.path.join(self.directory.name, f'groups.{format}')
+        call_command('export_posts', posts_path, format=format)
+        call_command('export_posts', groups_path, format=format, groups=True)
+        expected = list(
+            Post.objects.order_by('pk').values_list('text', 'pub_date')
+        )
+        Post.objects.all().delete()
+        Group.objects.all().delete()
+        User.objects.all().delete()
+        out = StringIO()
+        call_command(
+            'import_posts', groups_path, format=format, groups=True,
+            stdout=out,
+        )
+        call_command(
+            'import_posts', posts_path, format=format, batch_size=1,
+            create_authors=True, stdout=out,
+        )
+        self.assertEqual(
+            list(Post.objects.order_by('pk').values_list('text', 'pub_date')),
+            expected,
+        )
+        group = Group.objects.get(slug='group')
+        self.assertEqual(group.posts_count, 1)
+        self.assertEqual(
+            AuthorCounter.objects.get(author__username='author').posts_count,
+            2,
+        )
+        self.assertEqual(len(search_posts('кот')[0]), 1)
+
+    def test_jsonl_round_trip(self):
+        self.round_trip('jsonl')
+
+    def test_csv_round_trip(self):
+        self.round_trip('csv')
+
+    def test_posts_of_unknown_authors_are_skipped(self):
+        path = os.path.join(self.directory.name, 'posts.jsonl')
+        with open(path, 'w') as file:
+            file.write('{"text": "Текст", "author": "nobody"}\n')
+            file.write('{"text": "Текст", "author": "author", "group": "x"}\n')
+        out = StringIO()
+        call_command('import_posts', path, stdout=out)
+        self.assertIn('Загружено: 0, пропущено: 2.', out.getvalue())
+
+    def test_bad_records_are_reported_and_skipped(self):
+        path = os.path.join(self.directory.name, 'posts.jsonl')
+        with open(path, 'w') as file:
+            file.write('{"author": "author"}\n')
+            file.write('{"text": "Текст"}\n')
+            file.write('{"text": "Текст", "author": "author", '
+                       '"pub_date": "2020-13-40T00:00:00"}\n')
+            file.write('{"text": "Хороший пост", "author": "author"}\n')
+        out, err = StringIO(), StringIO()
+        call_command(
+            'import_posts', path, create_authors=True, stdout=out, stderr=err
+        )
+        self.assertIn('Загружено: 1, пропущено: 3.', out.getvalue())
+        for number, field in ((1, 'text'), (2, 'username'), (3, 'pub_date')):
+            with self.subTest(record=number):
+                self.assertIn(
+                    f'Запись {number} пропущена: {field}', err.getvalue()
+                )
+        self.assertFalse(User.objects.exclude(username='author').exists())
+
+    def test_imported_posts_reach_subscribers_timelines(self):
+        reader = User.objects.create_user(username='reader')
+        Subscription.objects.create(user=reader, author=self.author)
+        path = os.path.join(self.directory.name, 'posts.jsonl')
+        call_command('export_posts', path)
+        Post.objects.all().delete()
+        call_command('import_posts', path, stdout=StringIO())
+        self.assertEqual(TimelineEntry.objects.filter(user=reader).count(), 2)
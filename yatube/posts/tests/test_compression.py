@@ -0,0 +1,121 @@
+import gzip
+import tempfile
+from unittest import mock, skipUnless
+
+from core import compression
+from django.contrib.auth import get_user_model
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from posts.cache import clear_caches
+
+User = get_user_model()
+
+
+class CompressionMiddlewareTests(TestCase):
+    def setUp(self):
+        clear_caches()
+
+    def test_html_is_gzipped_for_clients_accepting_it(self):
+        url = reverse('posts:index')
+        plain = self.client.get(url)
+        response = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertEqual(gzip.decompress(response.content), plain.content)
+        self.assertTrue(response['ETag'].startswith('W/'))
+
+    def test_refused_and_short_responses_are_sent_as_they_are(self):
+        url = reverse('posts:index')
+        response = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip;q=0')
+        self.assertFalse(response.has_header('Content-Encoding'))
+        with self.settings(COMPRESSION_MIN_LENGTH=10 ** 6):
+            response = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_only_shared_pages_are_compressed_once(self):
+        url = reverse('posts:index')
+        author = User.objects.create_user(username='author')
+        self.client.get(url)
+        with mock.patch(
+            'core.compression.compress', wraps=compression.compress
+        ) as compress:
+            for _ in range(2):
+                self.client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+            self.assertEqual(compress.call_count, 1)
+            self.client.force_login(author)
+            for _ in range(2):
+                self.client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+            self.assertEqual(compress.call_count, 3)
+
+    @skipUnless(compression.brotli, 'brotli is not installed')
+    def test_brotli_is_preferred(self):
+        response = self.client.get(
+            reverse('posts:index'), HTTP_ACCEPT_ENCODING='gzip, br'
+        )
+        self.assertEqual(response['Content-Encoding'], 'br')
+
+
+class StaticFilesTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.storage_settings = override_settings(
+            STATIC_ROOT=cls.directory.name,
+            STATICFILES_STORAGE=(
+                'core.storage.CompressedManifestStaticFilesStorage'
+            ),
+        )
+        cls.storage_settings.enable()
+        call_command('collectstatic', interactive=False, verbosity=0)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.storage_settings.disable()
+        cls.directory.cleanup()
+        super().tearDownClass()
+
+    def get(self, name, **headers):
+        response = self.client.get(
+            reverse('static', args=(name,)), **headers
+        )
+        content = b''.join(response.streaming_content)
+        response.close()
+        return response, content
+
+    def test_hashed_file_is_served_precompressed_for_a_year(self):
+        name = staticfiles_storage.stored_name('css/bootstrap.min.css')
+        with open(staticfiles_storage.path(name), 'rb') as source:
+            original = source.read()
+        response, content = self.get(name, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Content-Type'], 'text/css')
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertEqual(gzip.decompress(content), original)
+        response, content = self.get(name)
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(content, original)
+
+    def test_not_modified_keeps_caching_headers(self):
+        name = staticfiles_storage.stored_name('css/bootstrap.min.css')
+        response, _ = self.get(name, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertNotIn('.gz', response.get('Content-Disposition', ''))
+        response = self.client.get(
+            reverse('static', args=(name,)),
+            HTTP_ACCEPT_ENCODING='gzip',
+            HTTP_IF_MODIFIED_SINCE=response['Last-Modified'],
+        )
+        self.assertEqual(response.status_code, 304)
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertIn('Accept-Encoding', response['Vary'])
+
+    def test_images_and_unhashed_names(self):
+        response, _ = self.get(
+            'img/logo.png', HTTP_ACCEPT_ENCODING='gzip, br'
+        )
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertNotIn('immutable', response['Cache-Control'])
+        response = self.client.get(reverse('static', args=('../settings',)))
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,28 @@
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+
+
+class DatabaseProfileTests(TestCase):
+    def pragma(self, name):
+        with connection.cursor() as cursor:
+            cursor.execute(f'PRAGMA {name}')
+            return cursor.fetchone()[0]
+
+    def test_sqlite_pragmas(self):
+        self.assertEqual(self.pragma('synchronous'), 1)
+        self.assertEqual(self.pragma('cache_size'), -64 * 2 ** 10)
+        self.assertEqual(self.pragma('busy_timeout'), 5000)
+
+    def test_unusable_connection_is_closed(self):
+        connection.ensure_connection()
+        with mock.patch.object(connection, 'close') as close:
+            self.client.get(reverse('about:author'))
+            close.assert_not_called()
+            with mock.patch.object(
+                connection, 'is_usable', return_value=False
+            ):
+                self.client.get(reverse('about:author'))
+        close.assert_called_once_with()
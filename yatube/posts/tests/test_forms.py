@@ -3,6 +3,7 @@ from http import HTTPStatus
 from django.contrib.auth import get_user_model
 from django.test import Client, TestCase
 from django.urls import reverse
+from posts.cache import clear_caches
 from posts.forms import PostForm
 from posts.models import Group, Post
 
@@ -27,6 +28,7 @@ class PostFormTests(TestCase):
         cls.form = PostForm()
 
     def setUp(self):
+        clear_caches()
         self.authorized_author_client = Client()
         self.authorized_author_client.force_login(self.author)
 
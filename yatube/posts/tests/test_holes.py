@@ -0,0 +1,71 @@
+from core import holes
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase
+from django.urls import reverse
+from posts.cache import clear_caches
+from posts.models import Post, Subscription
+
+User = get_user_model()
+
+
+class HolePunchingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user(username='author')
+        cls.reader = User.objects.create_user(username='reader')
+        cls.post = Post.objects.create(author=cls.author, text='Пост')
+
+    def setUp(self):
+        clear_caches()
+        self.author_client = Client()
+        self.author_client.force_login(self.author)
+        self.client.force_login(self.reader)
+
+    def test_cached_page_has_header_of_each_user(self):
+        url = reverse('posts:index')
+        self.author_client.get(url)
+        self.client.get(reverse('about:author'))
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+        self.assertContains(response, 'Пользователь: reader')
+        self.assertNotContains(response, 'Пользователь: author')
+        self.assertNotContains(response, '<!--hole:')
+        response = Client().get(url)
+        self.assertContains(response, 'Войти')
+
+    def test_cached_page_keeps_headers_and_varies_on_user(self):
+        url = reverse('posts:index')
+        first = Client().get(url)
+        for client, private in ((Client(), False), (self.client, True)):
+            response = client.get(url)
+            with self.subTest(private=private):
+                self.assertEqual(
+                    response['Content-Type'], first['Content-Type']
+                )
+                self.assertIn('Cookie', response['Vary'])
+                self.assertEqual(
+                    'private' in response.get('Cache-Control', ''), private
+                )
+
+    def test_edit_button_only_for_author(self):
+        url = reverse('posts:post_detail', args=(self.post.pk,))
+        self.assertContains(self.author_client.get(url), 'Редактировать')
+        self.assertNotContains(self.client.get(url), 'Редактировать')
+
+    def test_follow_form_has_csrf_token_of_viewer(self):
+        url = reverse('posts:profile', args=('author',))
+        Client().get(url)
+        response = self.client.get(url)
+        self.assertContains(response, 'csrfmiddlewaretoken')
+        self.assertIn('csrftoken', response.cookies)
+        Subscription.objects.create(user=self.reader, author=self.author)
+        self.assertContains(self.client.get(url), 'Отписаться')
+        self.assertNotContains(self.author_client.get(url), 'Подписаться')
+
+    def test_post_text_cannot_forge_holes(self):
+        text = f'Пост {holes.marker("header", {})}'
+        post = Post.objects.create(author=self.author, text=text)
+        url = reverse('posts:post_detail', args=(post.pk,))
+        self.client.get(url)
+        response = self.client.get(url)
+        self.assertEqual(response.content.decode().count('Пользователь:'), 1)
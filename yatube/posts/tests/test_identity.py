@@ -0,0 +1,98 @@
+from django.contrib.auth import get_user_model
+from django.http import Http404
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from posts import identity
+from posts.cache import clear_caches
+from posts.models import Group, Post
+
+from .utils import commit_hooks
+
+User = get_user_model()
+
+
+class IdentityMapTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.group = Group.objects.create(
+            title='Группа', slug='group', description='Описание'
+        )
+        cls.author = User.objects.create_user(
+            username='author', first_name='Имя'
+        )
+
+    def setUp(self):
+        clear_caches()
+
+    def test_hot_lookups_skip_the_database(self):
+        identity.get_group('group')
+        identity.get_author('author')
+        with self.assertNumQueries(0):
+            self.assertEqual(identity.get_group('group'), self.group)
+            author = identity.get_author('author')
+        self.assertEqual(author.get_full_name(), 'Имя')
+
+    def test_missing_objects_raise_404(self):
+        with self.assertRaises(Http404):
+            identity.get_group('missing')
+
+    def test_missing_page_looks_up_once(self):
+        for url in (
+            reverse('posts:group_list', args=('missing',)),
+            reverse('posts:profile', args=('missing',)),
+        ):
+            with self.subTest(url=url):
+                with self.assertNumQueries(1):
+                    response = self.client.get(url)
+                self.assertEqual(response.status_code, 404)
+
+    def test_created_object_is_found_after_a_miss(self):
+        with self.assertRaises(Http404):
+            identity.get_group('new')
+        with commit_hooks():
+            Group.objects.create(
+                title='Новая', slug='new', description='Описание'
+            )
+        self.assertEqual(identity.get_group('new').title, 'Новая')
+
+    def test_rename_forgets_old_entries(self):
+        identity.get_group('group')
+        identity.get_author('author')
+        with commit_hooks():
+            group = Group.objects.get()
+            group.slug = 'renamed'
+            group.save()
+            author = User.objects.get()
+            author.username = 'renamed'
+            author.save()
+        for lookup, old in ((identity.get_group, 'group'),
+                            (identity.get_author, 'author')):
+            with self.subTest(old=old):
+                with self.assertRaises(Http404):
+                    lookup(old)
+                self.assertEqual(lookup('renamed').pk, 1)
+
+    def test_local_cache_is_bounded(self):
+        cache = identity.LRUCache(maxsize=2)
+        for key in 'abc':
+            cache.set(key, key, 60)
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.get('c'), 'c')
+
+    @override_settings(POSTS_IDENTITY_CACHE_ALIAS='default')
+    def test_shared_tier_serves_other_processes(self):
+        identity.get_group('group')
+        identity.local.clear()
+        with self.assertNumQueries(0):
+            self.assertEqual(identity.get_group('group'), self.group)
+
+    @override_settings(POSTS_HOLE_PUNCHING=False)
+    def test_profile_skips_author_and_counter_queries(self):
+        Post.objects.create(author=self.author, text='Пост')
+        self.client.force_login(self.author)
+        url = reverse('posts:profile', args=('author',))
+        self.client.get(url)
+        # The page itself.
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+        self.assertEqual(response.context['posts_count'], 1)
@@ -0,0 +1,101 @@
+import json
+
+from core import metrics
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from posts.cache import clear_caches
+from posts.models import Post
+
+User = get_user_model()
+
+
+class PerformanceMiddlewareTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='author')
+        cls.post = Post.objects.create(author=cls.author, text='Пост')
+
+    def setUp(self):
+        clear_caches()
+        metrics.reset()
+
+    @override_settings(METRICS_SERVER_TIMING=True)
+    def test_server_timing_header(self):
+        response = self.client.get(reverse('posts:index'))
+        timing = response['Server-Timing']
+        for metric in ('db;dur=', 'tpl;dur=', 'app;dur=', 'total;dur='):
+            with self.subTest(metric=metric):
+                self.assertIn(metric, timing)
+        self.assertRegex(timing, r'desc="[1-9]\d* queries"')
+
+    @override_settings(METRICS_SERVER_TIMING=False)
+    def test_server_timing_only_for_staff(self):
+        url = reverse('posts:index')
+        self.assertFalse(self.client.get(url).has_header('Server-Timing'))
+        staff = User.objects.create_user(username='staff', is_staff=True)
+        self.client.force_login(staff)
+        self.assertTrue(self.client.get(url).has_header('Server-Timing'))
+
+    @override_settings(METRICS_SERVER_TIMING=True)
+    def test_server_timing_for_everyone_when_enabled(self):
+        response = self.client.get(reverse('posts:index'))
+        self.assertTrue(response.has_header('Server-Timing'))
+
+    @override_settings(METRICS_SAMPLE_RATE=0)
+    def test_unsampled_requests_are_not_measured(self):
+        response = self.client.get(reverse('posts:index'))
+        self.assertFalse(response.has_header('Server-Timing'))
+        self.assertNotIn('posts:index', metrics.prometheus_text())
+
+    def test_structured_log(self):
+        url = reverse('posts:post_detail', args=(self.post.pk,))
+        with self.assertLogs('yatube.performance', 'INFO') as logs:
+            self.client.get(url)
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record['view'], 'posts:post_detail')
+        self.assertEqual(record['status'], 200)
+        self.assertGreater(record['queries'], 0)
+
+    def test_duplicate_queries_are_detected(self):
+        request_metrics = metrics.RequestMetrics()
+
+        def execute(sql, params, many, context):
+            return None
+
+        for params in ((1,), (1,), (2,)):
+            request_metrics.execute_wrapper(
+                execute, 'SELECT %s', params, False, {}
+            )
+        self.assertEqual(request_metrics.queries, 3)
+        self.assertEqual(request_metrics.duplicates, 1)
+
+    def test_prometheus_endpoint(self):
+        self.client.get(reverse('posts:index'))
+        self.client.get(reverse('posts:index'))
+        response = self.client.get(reverse('metrics'))
+        text = response.content.decode()
+        self.assertIn('yatube_requests_total{view="posts:index"} 2', text)
+        self.assertIn(
+            'yatube_cache_lookups_total{view="posts:index",cache="feed",'
+            'result="hit"} 1',
+            text,
+        )
+        response = self.client.get(reverse('metrics'), REMOTE_ADDR='10.0.0.1')
+        self.assertEqual(response.status_code, 404)
+
+    @override_settings(METRICS_TOKEN='secret')
+    def test_prometheus_endpoint_with_token(self):
+        url = reverse('metrics')
+        for authorization, status in (
+            (None, 404),
+            ('Bearer other', 404),
+            ('Bearer secret', 200),
+        ):
+            with self.subTest(authorization=authorization):
+                headers = {}
+                if authorization is not None:
+                    headers['HTTP_AUTHORIZATION'] = authorization
+                response = self.client.get(url, **headers)
+                self.assertEqual(response.status_code, status)
@@ -1,7 +1,14 @@
+from io import StringIO
+
 from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 
-from ..models import Group, Post
+from ..bulk import render_stale_posts
+from ..models import AuthorCounter, Group, Post, Subscription
+from ..rendering import TEXT_HTML_VERSION
 
 User = get_user_model()
 
@@ -80,3 +87,112 @@ class PostModelTest(TestCase):
     def test_post_verbose_name_and_help_text(self):
         group = PostModelTest.group
         self.fields(group, self.group_spec)
+
+
+class PostCounterTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='first',
+            description='Тестовое описание',
+        )
+        cls.other_group = Group.objects.create(
+            title='Другая группа',
+            slug='second',
+            description='Тестовое описание',
+        )
+
+    def counts(self):
+        self.group.refresh_from_db()
+        self.other_group.refresh_from_db()
+        counter = AuthorCounter.objects.filter(author=self.user).first()
+        return (
+            counter.posts_count if counter else 0,
+            self.group.posts_count,
+            self.other_group.posts_count,
+        )
+
+    def test_counters_follow_post_writes(self):
+        post = Post.objects.create(
+            author=self.user, text='Текст', group=self.group
+        )
+        Post.objects.create(author=self.user, text='Без группы')
+        self.assertEqual(self.counts(), (2, 1, 0))
+        post = Post.objects.get(pk=post.pk)
+        post.group = self.other_group
+        post.save()
+        self.assertEqual(self.counts(), (2, 0, 1))
+        post.delete()
+        self.assertEqual(self.counts(), (1, 0, 0))
+
+    def test_users_get_a_counter_row(self):
+        self.assertTrue(
+            AuthorCounter.objects.filter(author=self.user).exists()
+        )
+
+    def test_deleting_author_keeps_other_counters(self):
+        author = User.objects.create_user(username='author')
+        Post.objects.create(author=author, text='Текст', group=self.group)
+        Subscription.objects.create(user=self.user, author=author)
+        Subscription.objects.create(user=author, author=self.user)
+        author.delete()
+        self.assertFalse(AuthorCounter.objects.filter(author=author).exists())
+        self.assertEqual(self.counts(), (0, 0, 0))
+        self.assertEqual(
+            AuthorCounter.objects.get(author=self.user).subscribers_count, 0
+        )
+
+    def test_rebuild_post_counters_command(self):
+        Post.objects.bulk_create(
+            Post(author=self.user, text='Текст', group=self.group)
+            for _ in range(3)
+        )
+        self.assertEqual(self.counts(), (0, 0, 0))
+        call_command('rebuild_post_counters', stdout=StringIO())
+        self.assertEqual(self.counts(), (3, 3, 0))
+
+
+class PostTextHtmlTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='auth')
+
+    def test_text_is_rendered_on_save(self):
+        post = Post.objects.create(author=self.user, text='<b>Раз</b>\nдва')
+        self.assertEqual(post.text_html, '&lt;b&gt;Раз&lt;/b&gt;<br>два')
+        post.text = 'три\nчетыре'
+        post.save(update_fields=['text'])
+        post.refresh_from_db()
+        self.assertEqual(post.body_html, 'три<br>четыре')
+
+    def test_stale_html_is_rendered_again(self):
+        Post.objects.bulk_create([Post(author=self.user, text='раз\nдва')])
+        post = Post.objects.get()
+        self.assertEqual(post.text_html, '')
+        self.assertEqual(post.body_html, 'раз<br>два')
+        out = StringIO()
+        call_command('render_posts', stdout=out)
+        self.assertIn('1', out.getvalue())
+        post.refresh_from_db()
+        self.assertEqual(post.text_html, 'раз<br>два')
+
+    def test_stale_html_is_rendered_in_batches(self):
+        Post.objects.bulk_create(
+            Post(author=self.user, text=f'пост {number}')
+            for number in range(5)
+        )
+        with CaptureQueriesContext(connection) as context:
+            self.assertEqual(render_stale_posts(batch_size=2), 5)
+        # A transaction (a savepoint inside the test's) for each batch of
+        # two and for the empty read that ends the run.
+        savepoints = [
+            query for query in context.captured_queries
+            if query['sql'].startswith('SAVEPOINT')
+        ]
+        self.assertEqual(len(savepoints), 4)
+        self.assertFalse(
+            Post.objects.exclude(text_html_version=TEXT_HTML_VERSION).exists()
+        )
@@ -0,0 +1,29 @@
+from django.test import SimpleTestCase
+from posts.models import Post
+from posts.paginators import FeedPaginator
+
+ELLIPSIS = FeedPaginator.ELLIPSIS
+
+
+class FeedPaginatorTests(SimpleTestCase):
+    def test_elided_page_range(self):
+        paginator = FeedPaginator(Post.objects.none(), 10)
+        paginator.count = 1000
+        cases = (
+            (1, [1, 2, 3, ELLIPSIS, 100]),
+            (5, [1, 2, 3, 4, 5, 6, 7, ELLIPSIS, 100]),
+            (50, [1, ELLIPSIS, 48, 49, 50, 51, 52, ELLIPSIS, 100]),
+            (100, [1, ELLIPSIS, 98, 99, 100]),
+        )
+        for number, expected in cases:
+            with self.subTest(number=number):
+                self.assertEqual(
+                    list(paginator.get_elided_page_range(number)), expected
+                )
+
+    def test_short_range_is_not_elided(self):
+        paginator = FeedPaginator(Post.objects.none(), 10)
+        paginator.count = 30
+        self.assertEqual(
+            list(paginator.get_elided_page_range(2)), [1, 2, 3]
+        )
@@ -0,0 +1,68 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from posts.cache import clear_caches
+from posts.models import Group, Post
+
+from .utils import QueryBudgetMixin
+
+User = get_user_model()
+
+FEED_QUERY_BUDGET = 3
+DETAIL_QUERY_BUDGET = 2
+
+
+class FeedQueryBudgetTests(QueryBudgetMixin, TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test_slug',
+            description='Тестовое описание'
+        )
+        cls.authors = [
+            User.objects.create_user(
+                username=f'author_{i}', first_name='Имя', last_name='Фамилия'
+            ) for i in range(5)
+        ]
+        for i in range(15):
+            Post.objects.create(
+                author=cls.authors[i % 5],
+                text=f'Текст {i}',
+                group=cls.group if i % 2 else None,
+            )
+
+    def setUp(self):
+        clear_caches()
+
+    def test_feeds_do_not_query_per_post(self):
+        urls = (
+            reverse('posts:index'),
+            reverse('posts:group_list', kwargs={'slug': self.group.slug}),
+            reverse(
+                'posts:profile', kwargs={'username': self.authors[0].username}
+            ),
+        )
+        for url in urls:
+            for params in ({}, {'page': 2}):
+                with self.subTest(url=url, params=params):
+                    with self.assertMaxQueries(FEED_QUERY_BUDGET):
+                        self.client.get(url, params)
+
+    def test_feeds_leave_raw_text_out(self):
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(reverse('posts:index'))
+        column = f'"{Post._meta.db_table}"."text",'
+        for query in context.captured_queries:
+            with self.subTest(sql=query['sql']):
+                self.assertNotIn(column, query['sql'])
+
+    def test_post_detail_query_budget(self):
+        post = Post.objects.filter(group__isnull=False).first()
+        with self.assertMaxQueries(DETAIL_QUERY_BUDGET):
+            self.client.get(
+                reverse('posts:post_detail', kwargs={'post_id': post.id})
+            )
@@ -0,0 +1,96 @@
+from unittest import mock
+
+from core import routers
+from core.middleware import PIN_COOKIE
+from django.contrib.auth import get_user_model
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.test import (SimpleTestCase, TransactionTestCase,
+                         override_settings)
+from django.urls import reverse
+from posts.cache import clear_caches
+from posts.models import Post
+
+User = get_user_model()
+
+REPLICAS = ['replica1', 'replica2']
+
+
+@override_settings(READ_REPLICAS=REPLICAS)
+class ReplicaRouterTests(SimpleTestCase):
+    def setUp(self):
+        self.router = routers.ReplicaRouter()
+        routers.start_request(pinned=False)
+        routers._state.replica = True
+        self.addCleanup(routers.finish_request)
+        self.addCleanup(setattr, routers._state, 'replica', False)
+
+    def reads(self, count):
+        return [self.router.db_for_read(Post) for _ in range(count)]
+
+    @mock.patch('core.routers.is_healthy', return_value=True)
+    def test_round_robin(self, _):
+        self.assertCountEqual(self.reads(4), REPLICAS * 2)
+
+    @mock.patch(
+        'core.routers.is_healthy',
+        side_effect=lambda alias: alias != 'replica1',
+    )
+    def test_unhealthy_replica_is_skipped(self, _):
+        self.assertEqual(self.reads(3), ['replica2'] * 3)
+
+    @mock.patch('core.routers.is_healthy', return_value=False)
+    def test_primary_when_no_replica_answers(self, _):
+        self.assertEqual(self.reads(2), [DEFAULT_DB_ALIAS] * 2)
+
+    @mock.patch('core.routers.is_healthy', return_value=True)
+    def test_primary_outside_decorated_views(self, _):
+        routers._state.replica = False
+        self.assertEqual(self.reads(2), [DEFAULT_DB_ALIAS] * 2)
+
+    @mock.patch('core.routers.is_healthy', return_value=True)
+    def test_primary_for_pinned_clients_and_writes(self, _):
+        self.assertEqual(self.router.db_for_write(Post), DEFAULT_DB_ALIAS)
+        self.assertTrue(routers.finish_request())
+        routers.start_request(pinned=True)
+        self.assertEqual(self.reads(2), [DEFAULT_DB_ALIAS] * 2)
+
+
+@override_settings(READ_REPLICAS=REPLICAS)
+@mock.patch('core.routers.choose_replica', return_value=DEFAULT_DB_ALIAS)
+class PrimaryPinTests(TransactionTestCase):
+    def setUp(self):
+        clear_caches()
+        self.author = User.objects.create_user(username='author')
+        self.client.force_login(self.author)
+
+    def test_uncached_reads_go_to_replica(self, choose_replica):
+        response = self.client.get(reverse('posts:search'), {'q': 'пост'})
+        self.assertTrue(choose_replica.called)
+        self.assertNotIn(PIN_COOKIE, response.cookies)
+
+    def test_caches_are_filled_from_primary(self, choose_replica):
+        Post.objects.create(author=self.author, text='Пост')
+        for url in (
+            reverse('posts:index'),
+            reverse('posts:profile', args=('author',)),
+            reverse('posts:post_detail', args=(Post.objects.get().pk,)),
+        ):
+            with self.subTest(url=url):
+                self.client.get(url)
+                self.assertFalse(choose_replica.called)
+
+    def test_writer_is_pinned_to_primary(self, choose_replica):
+        response = self.client.post(
+            reverse('posts:post_create'), {'text': 'Новый пост'}
+        )
+        self.assertEqual(response.cookies[PIN_COOKIE]['max-age'], 15)
+        choose_replica.reset_mock()
+        self.client.get(reverse('posts:index'))
+        self.assertFalse(choose_replica.called)
+
+    def test_transactions_read_from_primary(self, choose_replica):
+        routers._state.replica = True
+        self.addCleanup(setattr, routers._state, 'replica', False)
+        with transaction.atomic():
+            Post.objects.count()
+        self.assertFalse(choose_replica.called)
@@ -0,0 +1,83 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from posts.cache import clear_caches
+from posts.models import Post
+from posts.stemmer import stem
+
+User = get_user_model()
+
+
+class StemmerTests(TestCase):
+    def test_word_forms_share_stem(self):
+        forms = (
+            ('кот', 'коты', 'котами'),
+            ('книга', 'книги', 'книгой'),
+            ('город', 'городов', 'городами'),
+        )
+        for words in forms:
+            with self.subTest(words=words):
+                self.assertEqual(len({stem(word) for word in words}), 1)
+
+
+class SearchViewTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='author')
+        cls.url = reverse('posts:search')
+
+    def setUp(self):
+        clear_caches()
+
+    def found(self, query, **params):
+        response = self.client.get(self.url, {'q': query, **params})
+        return response, [post.text for post in response.context['posts']]
+
+    def test_search_matches_other_word_forms(self):
+        Post.objects.create(author=self.author, text='Мы гуляли с котами')
+        Post.objects.create(author=self.author, text='Про собак')
+        response, texts = self.found('кот')
+        self.assertEqual(texts, ['Мы гуляли с котами'])
+        self.assertTemplateUsed(response, 'posts/search.html')
+
+    def test_search_matches_whole_stems_only(self):
+        for text in ('Мой кот', 'Два кота и коты', 'Который час',
+                     'Вкусная котлета'):
+            Post.objects.create(author=self.author, text=text)
+        _, texts = self.found('кот')
+        self.assertCountEqual(texts, ['Мой кот', 'Два кота и коты'])
+
+    def test_search_ranks_and_pages_results(self):
+        Post.objects.create(
+            author=self.author, text='Кот, ещё кот и снова кот'
+        )
+        for i in range(12):
+            Post.objects.create(
+                author=self.author,
+                text=f'Запись {i} про погоду, город и одного кота',
+            )
+        response, texts = self.found('кот')
+        self.assertEqual(len(texts), 10)
+        self.assertEqual(texts[0], 'Кот, ещё кот и снова кот')
+        cursor = response.context['next_cursor']
+        response, rest = self.found('кот', cursor=cursor)
+        self.assertEqual(len(rest), 3)
+        self.assertIsNone(response.context['next_cursor'])
+        self.assertFalse(set(texts) & set(rest))
+
+    def test_index_follows_edits_and_deletes(self):
+        post = Post.objects.create(author=self.author, text='Про собак')
+        post.text = 'Про птиц'
+        post.save()
+        self.assertEqual(self.found('собака')[1], [])
+        self.assertEqual(self.found('птицы')[1], ['Про птиц'])
+        post.delete()
+        self.assertEqual(self.found('птицы')[1], [])
+
+    def test_empty_query_and_bad_cursor(self):
+        Post.objects.create(author=self.author, text='Про птиц')
+        self.assertEqual(self.found('  ')[1], [])
+        self.assertEqual(
+            self.found('птицы', cursor='garbage')[1], ['Про птиц']
+        )
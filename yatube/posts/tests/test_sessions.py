@@ -0,0 +1,59 @@
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase
+from django.urls import reverse
+from posts.cache import clear_caches
+from users.backends import user_key, users_cache
+
+User = get_user_model()
+
+PASSWORD = 'old-Pa55word'
+
+
+class CachedSessionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username='reader', password=PASSWORD
+        )
+
+    def setUp(self):
+        clear_caches()
+        users_cache().clear()
+        self.client.login(username='reader', password=PASSWORD)
+
+    def test_logged_in_requests_skip_session_and_user_queries(self):
+        url = reverse('about:author')
+        self.client.get(url)
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+        self.assertEqual(response.context['user'], self.user)
+
+    def test_password_change_logs_other_sessions_out(self):
+        other = Client()
+        other.login(username='reader', password=PASSWORD)
+        other.get(reverse('about:author'))
+        response = self.client.post(
+            reverse('users:password_change_form'),
+            {
+                'old_password': PASSWORD,
+                'new_password1': 'new-Pa55word-2',
+                'new_password2': 'new-Pa55word-2',
+            },
+        )
+        self.assertRedirects(response, reverse('users:password_change_done'))
+        response = other.get(reverse('about:author'))
+        self.assertFalse(response.context['user'].is_authenticated)
+        response = self.client.get(reverse('about:author'))
+        self.assertTrue(response.context['user'].is_authenticated)
+
+    def test_password_hash_stays_out_of_the_cache(self):
+        self.client.get(reverse('about:author'))
+        entry = users_cache().get(user_key(self.user.pk))
+        self.assertNotIn(self.user.password, repr(entry))
+
+    def test_sessions_of_the_plain_backend_stay_logged_in(self):
+        self.client.force_login(
+            self.user, backend='django.contrib.auth.backends.ModelBackend'
+        )
+        response = self.client.get(reverse('about:author'))
+        self.assertEqual(response.context['user'], self.user)
@@ -0,0 +1,124 @@
+from datetime import timedelta
+
+from core.models import Task
+from core.tasks import requeue_stale, run_pending, task
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.db import transaction
+from django.db.models import F
+from django.test import TransactionTestCase, override_settings
+from django.utils import timezone
+from posts import tasks
+from posts.cache import clear_caches
+from posts.models import Group, Post, Subscription, TimelineEntry
+from posts.search import search_posts
+
+User = get_user_model()
+
+calls = []
+
+
+@task(max_attempts=2)
+def flaky(value):
+    calls.append(value)
+    raise RuntimeError('boom')
+
+
+@override_settings(TASKS_EAGER=False)
+class TaskQueueTests(TransactionTestCase):
+    def setUp(self):
+        clear_caches()
+        calls.clear()
+        self.author = User.objects.create_user(username='author')
+        self.reader = User.objects.create_user(
+            username='reader', email='reader@example.com'
+        )
+
+    def test_post_side_effects_run_in_worker(self):
+        Subscription.objects.create(user=self.reader, author=self.author)
+        run_pending()
+        post = Post.objects.create(author=self.author, text='Птицы летят')
+        self.assertEqual(search_posts('птицы')[0], [])
+        self.assertFalse(TimelineEntry.objects.exists())
+        self.assertEqual(
+            set(Task.objects.filter(status=Task.PENDING).values_list(
+                'name', flat=True
+            )),
+            {
+                'posts.tasks.index_post',
+                'posts.tasks.fan_out',
+                'posts.tasks.notify_subscribers',
+            },
+        )
+        self.assertEqual(run_pending(), 3)
+        self.assertEqual(search_posts('птицы')[0], [post])
+        self.assertTrue(
+            TimelineEntry.objects.filter(user=self.reader, post=post).exists()
+        )
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ['reader@example.com'])
+        self.assertIn(post.text, mail.outbox[0].body)
+
+    def test_post_moved_back_is_fanned_out_again(self):
+        first = Group.objects.create(title='Первая', slug='first')
+        second = Group.objects.create(title='Вторая', slug='second')
+        post = Post.objects.create(
+            author=self.author, text='Пост', group=first
+        )
+        for group in (second, first):
+            post.group = group
+            post.save()
+        self.assertEqual(
+            Task.objects.filter(name='posts.tasks.fan_out').count(), 3
+        )
+
+    def test_rolled_back_writes_enqueue_nothing(self):
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                Post.objects.create(author=self.author, text='Откатится')
+                raise RuntimeError
+        self.assertFalse(Task.objects.exists())
+
+    def test_idempotency_key(self):
+        tasks.notify_subscribers.delay(1, key='notify:1')
+        tasks.notify_subscribers.delay(1, key='notify:1')
+        self.assertEqual(Task.objects.count(), 1)
+
+    def test_retries_then_fails(self):
+        flaky.delay('x')
+        with self.assertLogs('yatube.tasks', 'ERROR'):
+            run_pending()
+        row = Task.objects.get()
+        self.assertEqual((row.status, row.attempts), (Task.PENDING, 1))
+        self.assertGreater(row.run_at, timezone.now())
+        self.assertEqual(run_pending(), 0)
+        Task.objects.update(run_at=timezone.now())
+        with self.assertLogs('yatube.tasks', 'ERROR'):
+            run_pending()
+        row.refresh_from_db()
+        self.assertEqual((row.status, row.attempts), (Task.FAILED, 2))
+        self.assertIn('RuntimeError', row.last_error)
+        self.assertEqual(calls, ['x', 'x'])
+
+    def test_abandoned_tasks_are_requeued(self):
+        tasks.unindex_post.delay(1)
+        Task.objects.update(
+            status=Task.RUNNING,
+            locked_at=timezone.now() - timedelta(hours=1),
+        )
+        self.assertEqual(requeue_stale(), 1)
+        self.assertEqual(run_pending(), 1)
+        self.assertEqual(Task.objects.get().status, Task.DONE)
+
+    def test_abandoned_tasks_fail_after_last_attempt(self):
+        tasks.unindex_post.delay(1)
+        Task.objects.update(
+            status=Task.RUNNING,
+            attempts=F('max_attempts'),
+            locked_at=timezone.now() - timedelta(hours=1),
+        )
+        with self.assertLogs('yatube.tasks', 'ERROR'):
+            self.assertEqual(requeue_stale(), 0)
+        row = Task.objects.get()
+        self.assertEqual((row.status, row.locked_at), (Task.FAILED, None))
+        self.assertEqual(run_pending(), 0)
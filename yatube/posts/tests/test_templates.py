@@ -0,0 +1,69 @@
+import copy
+from unittest import mock
+
+from core import templating
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.template.loaders.filesystem import Loader
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from posts.models import Post
+
+User = get_user_model()
+
+
+LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+
+
+def templates(loaders):
+    templates = copy.deepcopy(settings.TEMPLATES)
+    templates[0]['OPTIONS']['loaders'] = loaders
+    return templates
+
+
+@override_settings(TEMPLATES=templates([
+    ('django.template.loaders.cached.Loader', LOADERS),
+]))
+class CachedTemplatesTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user(username='author')
+        Post.objects.bulk_create(
+            Post(author=cls.author, text=f'Пост {number}')
+            for number in range(10)
+        )
+
+    def setUp(self):
+        self.client.force_login(self.author)
+
+    def reads(self):
+        """Template files read from disk while rendering the feed."""
+        with mock.patch.object(
+            Loader, 'get_contents', autospec=True,
+            side_effect=Loader.get_contents,
+        ) as get_contents:
+            self.client.get(reverse('posts:index'))
+        return [
+            call.args[1].template_name
+            for call in get_contents.call_args_list
+        ]
+
+    def test_each_template_is_read_once(self):
+        reads = self.reads()
+        self.assertIn('includes/header.html', reads)
+        self.assertIn('includes/paginator.html', reads)
+        self.assertEqual(len(reads), len(set(reads)))
+        self.assertEqual(self.reads(), [])
+
+    def test_warm_up(self):
+        self.assertGreater(templating.warm_up(), 0)
+        self.assertEqual(self.reads(), [])
+
+
+@override_settings(TEMPLATES=templates(LOADERS))
+class UncachedTemplatesTests(TestCase):
+    def test_warm_up_needs_cached_loader(self):
+        self.assertEqual(templating.warm_up(), 0)
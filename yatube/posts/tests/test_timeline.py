@@ -0,0 +1,136 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from posts.cache import clear_caches
+from posts.models import AuthorCounter, Group, Post, TimelineEntry
+
+from .utils import QueryBudgetMixin
+
+User = get_user_model()
+
+# Session and user, timeline entries, popular sources, their posts, the page.
+TIMELINE_QUERY_BUDGET = 6
+
+
+class TimelineTests(QueryBudgetMixin, TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.reader = User.objects.create_user(username='reader')
+        cls.author = User.objects.create_user(username='author')
+        cls.stranger = User.objects.create_user(username='stranger')
+        cls.group = Group.objects.create(
+            title='Группа', slug='group', description='Описание'
+        )
+
+    def setUp(self):
+        clear_caches()
+        self.client.force_login(self.reader)
+
+    def follow(self, author=None, group=None):
+        if author is not None:
+            url = reverse('posts:profile_follow', args=(author.username,))
+        else:
+            url = reverse('posts:group_follow', args=(group.slug,))
+        self.client.post(url)
+
+    def timeline(self, cursor=None):
+        params = {'cursor': cursor} if cursor else {}
+        response = self.client.get(reverse('posts:follow_index'), params)
+        return response.context['posts'], response.context['next_cursor']
+
+    def test_new_posts_are_fanned_out_to_subscribers(self):
+        self.follow(author=self.author)
+        self.follow(group=self.group)
+        own = Post.objects.create(author=self.author, text='Автор')
+        grouped = Post.objects.create(
+            author=self.stranger, text='Группа', group=self.group
+        )
+        Post.objects.create(author=self.stranger, text='Чужой')
+        self.assertEqual(
+            set(TimelineEntry.objects.values_list('user', 'post')),
+            {(self.reader.pk, own.pk), (self.reader.pk, grouped.pk)},
+        )
+        posts, _ = self.timeline()
+        self.assertEqual(posts, [grouped, own])
+
+    def test_moved_post_leaves_old_group_readers(self):
+        other = Group.objects.create(title='Другая', slug='other')
+        author_reader = User.objects.create_user(username='author_reader')
+        self.follow(group=self.group)
+        self.client.force_login(author_reader)
+        self.follow(author=self.stranger)
+        self.follow(group=self.group)
+        post = Post.objects.create(
+            author=self.stranger, text='Пост', group=self.group
+        )
+        post.group = other
+        post.save()
+        self.assertEqual(
+            set(TimelineEntry.objects.values_list('user', 'post')),
+            {(author_reader.pk, post.pk)},
+        )
+
+    def test_follow_backfills_and_unfollow_removes(self):
+        old = Post.objects.create(
+            author=self.author, text='Раньше', group=self.group
+        )
+        self.follow(author=self.author)
+        self.follow(group=self.group)
+        self.assertEqual(self.timeline()[0], [old])
+        self.client.post(
+            reverse('posts:profile_unfollow', args=(self.author.username,))
+        )
+        self.assertEqual(self.timeline()[0], [old])
+        self.client.post(
+            reverse('posts:group_unfollow', args=(self.group.slug,))
+        )
+        self.assertEqual(self.timeline()[0], [])
+        self.assertEqual(
+            AuthorCounter.objects.get(author=self.author).subscribers_count, 0
+        )
+
+    def test_cannot_follow_self(self):
+        self.client.post(
+            reverse('posts:profile_follow', args=(self.reader.username,))
+        )
+        self.assertFalse(self.reader.subscriptions.exists())
+
+    @override_settings(POSTS_FANOUT_MAX_SUBSCRIBERS=0)
+    def test_popular_authors_are_merged_on_read(self):
+        self.follow(author=self.author)
+        self.follow(group=self.group)
+        posts = [
+            Post.objects.create(author=self.author, text=f'Пост {i}')
+            for i in range(15)
+        ]
+        self.assertFalse(TimelineEntry.objects.exists())
+        seen, cursor = self.timeline()
+        with self.assertMaxQueries(TIMELINE_QUERY_BUDGET):
+            page, cursor = self.timeline(cursor)
+        seen += page
+        self.assertIsNone(cursor)
+        self.assertEqual(seen, posts[::-1])
+
+    @override_settings(POSTS_TIMELINE_LENGTH=3)
+    def test_trim_keeps_newest_entries(self):
+        self.follow(author=self.author)
+        posts = [
+            Post.objects.create(author=self.author, text=f'Пост {i}')
+            for i in range(5)
+        ]
+        call_command('trim_timelines', stdout=StringIO())
+        self.assertEqual(
+            list(TimelineEntry.objects.order_by('-pub_date', '-post')
+                 .values_list('post', flat=True)),
+            [post.pk for post in posts[:1:-1]],
+        )
+
+    def test_follow_button_state(self):
+        url = reverse('posts:profile', args=(self.author.username,))
+        self.assertFalse(self.client.get(url).context['following'])
+        self.follow(author=self.author)
+        self.assertTrue(self.client.get(url).context['following'])
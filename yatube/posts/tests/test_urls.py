@@ -2,6 +2,7 @@ from http import HTTPStatus
 
 from django.contrib.auth import get_user_model
 from django.test import Client, TestCase
+from posts.cache import clear_caches
 from posts.models import Group, Post
 
 User = get_user_model()
@@ -37,6 +38,7 @@ class PostURLTests(TestCase):
         )
 
     def setUp(self):
+        clear_caches()
         self.guest_client = Client()
         self.user = User.objects.create_user(username='HasNoName')
         self.authorized_client = Client()
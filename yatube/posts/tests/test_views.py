@@ -2,8 +2,11 @@ from django import forms
 from django.contrib.auth import get_user_model
 from django.test import Client, TestCase
 from django.urls import reverse
+from posts.cache import clear_caches
 from posts.models import Group, Post
 
+from .utils import commit_hooks
+
 User = get_user_model()
 
 POSTS_ON_PAGE = 10
@@ -66,6 +69,7 @@ class PostPagesTests(TestCase):
         cls.post_edit = cls.url_templates[5][0]
 
     def setUp(self):
+        clear_caches()
         self.authorized_author_client = Client()
         self.authorized_author_client.force_login(self.author1)
 
@@ -92,6 +96,8 @@ class PostPagesTests(TestCase):
 
     def test_group_posts_show_correct_context(self):
         self.paginator_test(self.group_list, 13)
+        # ?page=1 above filled the cache for the first page.
+        clear_caches()
         response = self.client.get(self.group_list)
         for post in range(POSTS_ON_PAGE):
             group_title = response.context.get('page_obj')[post].group.title
@@ -99,11 +105,64 @@ class PostPagesTests(TestCase):
 
     def test_profile_posts_show_correct_context(self):
         self.paginator_test(self.profile, 13)
+        # ?page=1 above filled the cache for the first page.
+        clear_caches()
         response = self.client.get(self.profile)
         for post in range(POSTS_ON_PAGE):
             author = response.context.get('page_obj')[post].author.username
             self.assertEqual(author, self.author1.username)
 
+    def test_cursor_pages_walk_whole_feed(self):
+        urls = (
+            (self.index, 26),
+            (self.group_list, 13),
+            (self.profile, 13),
+        )
+        for url, objs in urls:
+            with self.subTest(url=url):
+                seen = []
+                page_obj = self.client.get(url).context['page_obj']
+                seen.extend(post.id for post in page_obj)
+                while page_obj.has_next():
+                    page_obj = self.client.get(
+                        url, {'cursor': page_obj.next_cursor}
+                    ).context['page_obj']
+                    seen.extend(post.id for post in page_obj)
+                self.assertEqual(len(seen), objs)
+                self.assertEqual(seen, sorted(seen, reverse=True))
+                previous_page = self.client.get(
+                    url, {'cursor': page_obj.previous_cursor}
+                ).context['page_obj']
+                self.assertEqual(
+                    [post.id for post in previous_page],
+                    seen[-POSTS_ON_PAGE - objs % POSTS_ON_PAGE:
+                         -(objs % POSTS_ON_PAGE)]
+                )
+
+    def test_feed_count_is_cached_until_post_is_written(self):
+        response = self.client.get(self.index)
+        self.assertEqual(response.context['page_obj'].paginator.count, 26)
+        with commit_hooks():
+            Post.objects.filter(author=self.author2).delete()
+        response = self.client.get(self.index)
+        self.assertEqual(response.context['page_obj'].paginator.count, 13)
+        with commit_hooks():
+            self.authorized_author_client.post(
+                self.post_create,
+                {'text': 'Новый пост', 'group': self.group.id},
+            )
+        for url, count in ((self.index, 14), (self.group_list, 14)):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(
+                    response.context['page_obj'].paginator.count, count
+                )
+
+    def test_invalid_cursor_shows_first_page(self):
+        response = self.client.get(self.index, {'cursor': 'not-a-cursor'})
+        self.assertEqual(len(response.context['page_obj']), POSTS_ON_PAGE)
+        self.assertFalse(response.context['page_obj'].has_previous())
+
     def test_detail_page_show_correct_context(self):
         response = self.client.get(self.post_detail)
         post_number = response.context.get('post').id
@@ -0,0 +1,36 @@
+from contextlib import contextmanager
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+class QueryBudgetMixin:
+    """Fail a test when a block runs more queries than it may afford."""
+
+    @contextmanager
+    def assertMaxQueries(self, budget):
+        with CaptureQueriesContext(connection) as context:
+            yield context
+        executed = len(context.captured_queries)
+        if executed > budget:
+            queries = '\n'.join(
+                query['sql'] for query in context.captured_queries
+            )
+            self.fail(
+                f'{executed} queries executed, budget is {budget}:\n'
+                f'{queries}'
+            )
+
+
+@contextmanager
+def commit_hooks():
+    """Run the on_commit callbacks registered in the block.
+
+    TestCase never commits its transaction, so they would never run.
+    """
+    start = len(connection.run_on_commit)
+    yield
+    callbacks = connection.run_on_commit[start:]
+    del connection.run_on_commit[start:]
+    for _, callback in callbacks:
+        callback()
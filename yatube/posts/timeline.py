@@ -0,0 +1,190 @@
+"""Home timelines of subscribers, precomputed on write.
+
+A new post is copied into a ``TimelineEntry`` of every subscriber of its
+author and group, so a timeline page is a range scan of one index.
+Authors and groups with more than ``POSTS_FANOUT_MAX_SUBSCRIBERS``
+subscribers are not fanned out; their posts are merged in on read.
+"""
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q
+
+from .models import (AuthorCounter, Group, Post, Subscription,
+                     TimelineEntry)
+from .paginators import (FEED_ORDERING, NEXT, InvalidCursor, decode_cursor,
+                         keyset_filter, pack_cursor)
+
+TRIM_SQL = (
+    'DELETE FROM {table} WHERE id IN ('
+    'SELECT id FROM ('
+    'SELECT id, ROW_NUMBER() OVER ('
+    'PARTITION BY user_id ORDER BY pub_date DESC, post_id DESC'
+    ') AS position FROM {table} WHERE user_id IN ({users})'
+    ') ranked WHERE position > %s)'
+)
+TRIM_BATCH = 500
+
+
+def is_popular(subscribers_count):
+    return subscribers_count > settings.POSTS_FANOUT_MAX_SUBSCRIBERS
+
+
+def fanout_sources(post):
+    """Q of the subscriptions whose readers get the post on write."""
+    sources = Q()
+    author_subscribers = AuthorCounter.objects.filter(
+        author_id=post.author_id
+    ).values_list('subscribers_count', flat=True).first()
+    if not is_popular(author_subscribers or 0):
+        sources |= Q(author_id=post.author_id)
+    if post.group_id is not None:
+        group_subscribers = Group.objects.filter(
+            pk=post.group_id
+        ).values_list('subscribers_count', flat=True).first()
+        if not is_popular(group_subscribers or 0):
+            sources |= Q(group_id=post.group_id)
+    return sources
+
+
+def fan_out(post):
+    """Deliver the post to its subscribers; safe to repeat.
+
+    A post moved to another group is also taken back from the readers
+    who got it only through the group it left.
+    """
+    followed = Q(author_id=post.author_id)
+    if post.group_id is not None:
+        followed |= Q(group_id=post.group_id)
+    TimelineEntry.objects.filter(post=post).exclude(
+        user__in=Subscription.objects.filter(followed).values('user_id')
+    ).delete()
+    sources = fanout_sources(post)
+    if not sources:
+        return
+    readers = Subscription.objects.filter(sources).exclude(
+        user_id=post.author_id
+    ).values_list('user_id', flat=True).distinct()
+    readers = list(readers)
+    TimelineEntry.objects.bulk_create(
+        (
+            TimelineEntry(user_id=user_id, post=post, pub_date=post.pub_date)
+            for user_id in readers
+        ),
+        ignore_conflicts=True,
+    )
+    # Trimming costs a scan of every reader's timeline, so it runs on a
+    # share of the posts; the trim_timelines command does a full pass.
+    if readers and post.pk % settings.POSTS_TIMELINE_TRIM_EVERY == 0:
+        trim_timelines(readers)
+
+
+def trim_timelines(user_ids):
+    """Keep the newest ``POSTS_TIMELINE_LENGTH`` entries of each user."""
+    table = TimelineEntry._meta.db_table
+    user_ids = list(user_ids)
+    with connection.cursor() as cursor:
+        for start in range(0, len(user_ids), TRIM_BATCH):
+            batch = user_ids[start:start + TRIM_BATCH]
+            cursor.execute(
+                TRIM_SQL.format(
+                    table=table, users=', '.join(['%s'] * len(batch))
+                ),
+                batch + [settings.POSTS_TIMELINE_LENGTH],
+            )
+
+
+def backfill(user_id, author_id=None, group_id=None):
+    """Copy the latest posts of a new subscription into the timeline."""
+    if author_id is not None:
+        posts = Post.objects.filter(author_id=author_id)
+    else:
+        posts = Post.objects.filter(group_id=group_id)
+    posts = posts.order_by(*FEED_ORDERING).values_list('pk', 'pub_date')
+    TimelineEntry.objects.bulk_create(
+        (
+            TimelineEntry(user_id=user_id, post_id=pk, pub_date=pub_date)
+            for pk, pub_date in posts[:settings.POSTS_TIMELINE_LENGTH]
+        ),
+        ignore_conflicts=True,
+    )
+
+
+def rebuild_timelines():
+    """Backfill every subscription, for posts created without fan-out."""
+    threshold = settings.POSTS_FANOUT_MAX_SUBSCRIBERS
+    subscriptions = Subscription.objects.exclude(
+        author__post_counter__subscribers_count__gt=threshold
+    ).exclude(
+        group__subscribers_count__gt=threshold
+    ).values_list('user_id', 'author_id', 'group_id')
+    readers = set()
+    for user_id, author_id, group_id in subscriptions.iterator():
+        backfill(user_id, author_id, group_id)
+        readers.add(user_id)
+    trim_timelines(readers)
+
+
+def remove_source(user_id, author_id=None, group_id=None):
+    """Drop posts the reader no longer gets through any subscription."""
+    entries = TimelineEntry.objects.filter(user_id=user_id)
+    others = Subscription.objects.filter(user_id=user_id)
+    if author_id is not None:
+        entries = entries.filter(post__author_id=author_id).exclude(
+            post__group__in=others.values('group_id').filter(
+                group__isnull=False
+            )
+        )
+    else:
+        entries = entries.filter(post__group_id=group_id).exclude(
+            post__author__in=others.values('author_id').filter(
+                author__isnull=False
+            )
+        )
+    entries.delete()
+
+
+def popular_sources(user):
+    """Popular authors and groups the user follows, merged in on read."""
+    threshold = settings.POSTS_FANOUT_MAX_SUBSCRIBERS
+    rows = Subscription.objects.filter(user=user).filter(
+        Q(author__post_counter__subscribers_count__gt=threshold)
+        | Q(group__subscribers_count__gt=threshold)
+    ).values_list('author_id', 'group_id')
+    authors = [author for author, _ in rows if author is not None]
+    groups = [group for _, group in rows if group is not None]
+    return authors, groups
+
+
+def timeline_page(user, cursor=None, limit=10):
+    """Page of the user's home timeline and the cursor of the next one."""
+    entries = TimelineEntry.objects.filter(user=user)
+    if cursor:
+        direction, pub_date, pk = decode_cursor(cursor)
+        if direction != NEXT:
+            raise InvalidCursor(cursor)
+        entries = entries.filter(pub_date__lte=pub_date).filter(
+            Q(pub_date__lt=pub_date) | Q(post_id__lt=pk)
+        )
+    hits = set(
+        entries.order_by('-pub_date', '-post_id')
+        .values_list('pub_date', 'post_id')[:limit + 1]
+    )
+    authors, groups = popular_sources(user)
+    if authors or groups:
+        posts = Post.objects.filter(
+            Q(author_id__in=authors) | Q(group_id__in=groups)
+        )
+        if cursor:
+            posts = keyset_filter(posts, cursor)
+        hits.update(
+            posts.order_by(*FEED_ORDERING)
+            .values_list('pub_date', 'pk')[:limit + 1]
+        )
+    hits = sorted(hits, reverse=True)
+    next_cursor = None
+    if len(hits) > limit:
+        hits = hits[:limit]
+        pub_date, pk = hits[-1]
+        next_cursor = pack_cursor(NEXT, pub_date.isoformat(), pk)
+    posts = Post.objects.feed().in_bulk([pk for _, pk in hits])
+    return [posts[pk] for _, pk in hits if pk in posts], next_cursor
@@ -1,6 +1,6 @@
 from django.urls import path
 
-from . import views
+from . import api, views
 
 app_name = 'posts'
 
@@ -11,4 +11,29 @@ urlpatterns = [
     path('posts/<int:post_id>/', views.post_detail, name='post_detail'),
     path('create/', views.post_create, name='post_create'),
     path('posts/<int:post_id>/edit/', views.post_edit, name='post_edit'),
+    path('search/', views.search, name='search'),
+    path('follow/', views.follow_index, name='follow_index'),
+    path(
+        'profile/<str:username>/follow/',
+        views.profile_follow,
+        name='profile_follow',
+    ),
+    path(
+        'profile/<str:username>/unfollow/',
+        views.profile_unfollow,
+        name='profile_unfollow',
+    ),
+    path('group/<slug:slug>/follow/', views.group_follow, name='group_follow'),
+    path(
+        'group/<slug:slug>/unfollow/',
+        views.group_unfollow,
+        name='group_unfollow',
+    ),
+    path('api/posts/', api.index_feed, name='api_index'),
+    path('api/group/<slug:slug>/posts/', api.group_feed, name='api_group'),
+    path(
+        'api/profile/<str:username>/posts/',
+        api.author_feed,
+        name='api_profile',
+    ),
 ]
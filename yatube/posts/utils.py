@@ -1,10 +1,28 @@
-from django.core.paginator import Paginator
+from .paginators import (FEED_ORDERING, NEXT, PREVIOUS, CursorPaginator,
+                         FeedPaginator, encode_cursor)
 
 AMOUNT_POSTS: int = 10
 
 
-def get_page(request, posts):
-    paginator = Paginator(posts, AMOUNT_POSTS)
+def get_page(request, posts, count_key=None, estimate=False):
+    cursor = request.GET.get('cursor')
+    if cursor:
+        return CursorPaginator(posts, AMOUNT_POSTS).get_page(cursor)
+    paginator = FeedPaginator(
+        posts.order_by(*FEED_ORDERING), AMOUNT_POSTS, count_key, estimate
+    )
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
+    set_cursors(page_obj)
     return page_obj
+
+
+def set_cursors(page_obj):
+    """Let numbered pages link to their neighbours by cursor as well."""
+    page_obj.next_cursor = page_obj.previous_cursor = None
+    if not page_obj.object_list:
+        return
+    if page_obj.has_next():
+        page_obj.next_cursor = encode_cursor(NEXT, page_obj[-1])
+    if page_obj.has_previous():
+        page_obj.previous_cursor = encode_cursor(PREVIOUS, page_obj[0])
@@ -1,24 +1,47 @@
+from core.routers import read_from_replica
+from django.conf import settings
 from django.contrib.auth.decorators import login_required
+from django.db import transaction
 from django.shortcuts import get_object_or_404, redirect, render
+from django.views.decorators.http import condition, require_POST
 
+from . import identity
+from .cache import (AUTHOR_FEED, GROUP_FEED, INDEX_FEED, cache_feed,
+                    cache_view, count_key)
+from .conditional import feed_etag, post_etag, post_page_key
+from .counters import author_posts_count, get_posts_count
 from .forms import PostForm
-from .models import Group, Post, User
-from .utils import get_page
+from .models import Post, Subscription
+from .paginators import InvalidCursor
+from .search import search_posts
+from .timeline import timeline_page
+from .utils import AMOUNT_POSTS, get_page
 
 
+@read_from_replica
+@condition(etag_func=feed_etag(INDEX_FEED))
+@cache_feed(INDEX_FEED)
 def index(request):
-    posts = Post.objects.all()
-    page_obj = get_page(request, posts)
+    posts = Post.objects.feed()
+    page_obj = get_page(
+        request,
+        posts,
+        count_key(INDEX_FEED),
+        settings.POSTS_ESTIMATE_INDEX_COUNT,
+    )
     context = {
         'page_obj': page_obj,
     }
     return render(request, 'posts/index.html', context)
 
 
+@read_from_replica
+@condition(etag_func=feed_etag(GROUP_FEED, 'slug', identity.get_group))
+@cache_feed(GROUP_FEED, 'slug', identity.get_group)
 def group_posts(request, slug):
-    group = get_object_or_404(Group, slug=slug)
-    posts = group.posts.all()
-    page_obj = get_page(request, posts)
+    group = identity.get_group(slug)
+    posts = group.posts.feed()
+    page_obj = get_page(request, posts, count_key(GROUP_FEED, group.id))
     context = {
         'group': group,
         'page_obj': page_obj,
@@ -26,26 +49,57 @@ def group_posts(request, slug):
     return render(request, 'posts/group_list.html', context)
 
 
+@read_from_replica
+@condition(
+    etag_func=feed_etag(AUTHOR_FEED, 'username', identity.get_author)
+)
+@cache_feed(AUTHOR_FEED, 'username', identity.get_author)
 def profile(request, username):
-    author = get_object_or_404(User, username=username)
-    posts = author.posts.all()
-    page_obj = get_page(request, posts)
+    author = identity.get_author(username)
+    posts = author.posts.feed()
+    page_obj = get_page(request, posts, count_key(AUTHOR_FEED, author.id))
     context = {
         'author': author,
-        'page_obj': page_obj
+        'posts_count': author_posts_count(author.id),
+        'page_obj': page_obj,
     }
     return render(request, 'posts/profile.html', context)
 
 
+@read_from_replica
+@condition(etag_func=post_etag)
+@cache_view('post', post_page_key)
 def post_detail(request, post_id):
-    post = get_object_or_404(Post, pk=post_id)
+    post = get_object_or_404(
+        Post.objects.select_related('author__post_counter', 'group'),
+        pk=post_id,
+    )
     context = {
         'post': post,
+        'posts_count': get_posts_count(post.author),
     }
     return render(request, 'posts/post_detail.html', context)
 
 
+@read_from_replica
+def search(request):
+    query = request.GET.get('q', '').strip()
+    try:
+        posts, next_cursor = search_posts(
+            query, request.GET.get('cursor'), AMOUNT_POSTS
+        )
+    except InvalidCursor:
+        posts, next_cursor = search_posts(query, None, AMOUNT_POSTS)
+    context = {
+        'query': query,
+        'posts': posts,
+        'next_cursor': next_cursor,
+    }
+    return render(request, 'posts/search.html', context)
+
+
 @login_required
+@transaction.atomic
 def post_create(request):
     form = PostForm(request.POST or None)
     if form.is_valid():
@@ -57,9 +111,13 @@ def post_create(request):
 
 
 @login_required
+@transaction.atomic
 def post_edit(request, post_id):
-    post = get_object_or_404(Post, pk=post_id)
-    if request.user == post.author:
+    # The save signals read the author's username and the group's slug.
+    post = get_object_or_404(
+        Post.objects.select_related('author', 'group'), pk=post_id
+    )
+    if request.user.pk == post.author_id:
         form = PostForm(request.POST or None, instance=post)
         if form.is_valid():
             form.save()
@@ -70,3 +128,54 @@ def post_edit(request, post_id):
         }
         return render(request, 'posts/create_post.html', context)
     return redirect('posts:post_detail', post_id)
+
+
+@read_from_replica
+@login_required
+def follow_index(request):
+    try:
+        posts, next_cursor = timeline_page(
+            request.user, request.GET.get('cursor'), AMOUNT_POSTS
+        )
+    except InvalidCursor:
+        posts, next_cursor = timeline_page(request.user, None, AMOUNT_POSTS)
+    context = {
+        'posts': posts,
+        'next_cursor': next_cursor,
+    }
+    return render(request, 'posts/follow.html', context)
+
+
+@login_required
+@require_POST
+def profile_follow(request, username):
+    author = identity.get_author(username)
+    if author != request.user:
+        Subscription.objects.get_or_create(user=request.user, author=author)
+    return redirect('posts:profile', username)
+
+
+@login_required
+@require_POST
+def profile_unfollow(request, username):
+    Subscription.objects.filter(
+        user=request.user, author__username=username
+    ).delete()
+    return redirect('posts:profile', username)
+
+
+@login_required
+@require_POST
+def group_follow(request, slug):
+    group = identity.get_group(slug)
+    Subscription.objects.get_or_create(user=request.user, group=group)
+    return redirect('posts:group_list', slug)
+
+
+@login_required
+@require_POST
+def group_unfollow(request, slug):
+    Subscription.objects.filter(
+        user=request.user, group__slug=slug
+    ).delete()
+    return redirect('posts:group_list', slug)
@@ -0,0 +1,67 @@
+from core.routers import use_primary
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS
+
+User = get_user_model()
+
+# Columns kept in the cache: everything but the password hash, which is
+# loaded from the database only when something asks for it.
+CACHED_FIELDS = tuple(
+    field.attname for field in User._meta.concrete_fields
+    if field.attname != 'password'
+)
+
+
+def users_cache():
+    return caches[settings.USERS_CACHE_ALIAS]
+
+
+def user_key(user_id):
+    return f'users:user:{user_id}'
+
+
+def forget_user(user_id):
+    users_cache().delete(user_key(user_id))
+
+
+def cached_user(entry):
+    values, session_hash = entry
+    user = User.from_db(DEFAULT_DB_ALIAS, CACHED_FIELDS, values)
+
+    def get_session_auth_hash():
+        # The session check compares this HMAC of the password hash, so it
+        # is cached instead of the hash, until the password is loaded.
+        if 'password' in user.__dict__:
+            return User.get_session_auth_hash(user)
+        return session_hash
+
+    user.get_session_auth_hash = get_session_auth_hash
+    return user
+
+
+class CachedModelBackend(ModelBackend):
+    """ModelBackend that loads the user of each request from a cache.
+
+    The users signals drop the entry whenever the user is saved, which
+    includes password changes, so the session hash check still logs
+    other sessions out.
+    """
+
+    def get_user(self, user_id):
+        key = user_key(user_id)
+        entry = users_cache().get(key)
+        if entry is None:
+            with use_primary():
+                user = super().get_user(user_id)
+            if user is None:
+                return None
+            entry = (
+                [getattr(user, name) for name in CACHED_FIELDS],
+                user.get_session_auth_hash(),
+            )
+            users_cache().set(key, entry, settings.USERS_CACHE_TIMEOUT)
+        user = cached_user(entry)
+        return user if self.user_can_authenticate(user) else None
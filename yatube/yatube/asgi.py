@@ -0,0 +1,13 @@
+import os
+
+from core.asgi import ThreadPoolASGIHandler
+from django.conf import settings
+from django.core.wsgi import get_wsgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yatube.settings')
+# Servers run production unless told otherwise; dev is for manage.py.
+os.environ.setdefault('DJANGO_ENV', 'prod')
+
+application = ThreadPoolASGIHandler(
+    get_wsgi_application(), settings.ASGI_THREADS
+)
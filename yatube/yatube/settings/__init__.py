@@ -0,0 +1,28 @@
+"""Settings of the profile named by DJANGO_ENV: dev (default), test, prod.
+
+`manage.py test` and pytest pick the test profile by themselves, and the
+WSGI and ASGI entry points default to prod, so a server never runs dev
+settings by accident.
+"""
+import os
+import sys
+
+# pytest-django loads settings before any conftest runs, so pytest is
+# recognised here; base.py reads the same variable.
+if 'pytest' in sys.modules:
+    os.environ.setdefault('DJANGO_ENV', 'test')
+
+ENVIRONMENT = os.getenv('DJANGO_ENV', 'dev')
+
+if ENVIRONMENT == 'prod':
+    from .prod import *  # noqa: F401,F403
+elif ENVIRONMENT == 'test':
+    from .test import *  # noqa: F401,F403
+elif ENVIRONMENT == 'dev':
+    from .dev import *  # noqa: F401,F403
+else:
+    from django.core.exceptions import ImproperlyConfigured
+
+    raise ImproperlyConfigured(
+        f'DJANGO_ENV must be dev, test or prod, not {ENVIRONMENT!r}.'
+    )
@@ -0,0 +1,298 @@
+import os
+
+BASE_DIR = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+
+# Settings profile: dev, test or prod, see yatube/settings/__init__.py.
+ENVIRONMENT = os.getenv('DJANGO_ENV', 'dev')
+
+SECRET_KEY = os.getenv('DJANGO_SECRET_KEY')
+
+DEBUG = os.getenv('DJANGO_DEBUG', str(int(ENVIRONMENT == 'dev'))) == '1'
+
+ALLOWED_HOSTS = os.getenv(
+    'DJANGO_ALLOWED_HOSTS', 'localhost,127.0.0.1,[::1],testserver'
+).split(',')
+
+
+INSTALLED_APPS = [
+    'about.apps.AboutConfig',
+    'core.apps.CoreConfig',
+    'users.apps.UsersConfig',
+    'posts.apps.PostsConfig',
+    'django.contrib.admin',
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+]
+
+MIDDLEWARE = [
+    'core.middleware.PerformanceMiddleware',
+    'core.middleware.PrimaryPinMiddleware',
+    'django.middleware.security.SecurityMiddleware',
+    'core.middleware.CompressionMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+]
+
+ROOT_URLCONF = 'yatube.urls'
+
+TEMPLATES_DIR = os.path.join(BASE_DIR, 'templates')
+# Parse every template once per process instead of on each render; on
+# by default unless DEBUG, when edits must show up without a restart.
+TEMPLATES_CACHED = os.getenv('TEMPLATES_CACHED', str(int(not DEBUG))) == '1'
+# Load every template of TEMPLATES_DIR into the cache at startup.
+TEMPLATES_WARMUP = os.getenv('TEMPLATES_WARMUP', '0') == '1'
+template_loaders = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+if TEMPLATES_CACHED:
+    template_loaders = [
+        ('django.template.loaders.cached.Loader', template_loaders),
+    ]
+TEMPLATES = [
+    {
+        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'DIRS': [TEMPLATES_DIR],
+        'OPTIONS': {
+            'loaders': template_loaders,
+            'context_processors': [
+                'django.template.context_processors.debug',
+                'django.template.context_processors.request',
+                'django.contrib.auth.context_processors.auth',
+                'django.contrib.messages.context_processors.messages',
+                'core.context_processors.year.year',
+            ],
+        },
+    },
+]
+
+WSGI_APPLICATION = 'yatube.wsgi.application'
+ASGI_APPLICATION = 'yatube.asgi.application'
+# Worker threads running views behind the ASGI entry point.
+ASGI_THREADS = int(os.getenv('ASGI_THREADS', 16))
+
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
+        # Seconds a connection is reused across requests, 0 to close it
+        # after each request.
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', 60)),
+    }
+}
+# Run on every new SQLite connection by core.signals.tune_sqlite.
+SQLITE_PRAGMAS = {
+    'journal_mode': 'wal',
+    'synchronous': 'normal',
+    'mmap_size': 256 * 2 ** 20,
+    # Negative sizes are in KiB: a 64 MiB page cache per connection.
+    'cache_size': -64 * 2 ** 10,
+    'busy_timeout': 5000,
+    'temp_store': 'memory',
+}
+if os.getenv('SQLITE_TUNING', '1') != '1':
+    SQLITE_PRAGMAS = {}
+
+# Read replicas of the default database, comma separated; with SQLite
+# these are files kept in step by `manage.py sync_replicas`.
+READ_REPLICAS = []
+for number, name in enumerate(
+    filter(None, os.getenv('REPLICA_DATABASES', '').split(',')), 1
+):
+    DATABASES[f'replica{number}'] = {
+        **DATABASES['default'],
+        'NAME': name,
+        'TEST': {'MIRROR': 'default'},
+    }
+    READ_REPLICAS.append(f'replica{number}')
+DATABASE_ROUTERS = ['core.routers.ReplicaRouter']
+# Seconds a replica's health check result is trusted.
+REPLICA_HEALTH_INTERVAL = 5
+# Seconds a client reads from the primary after it wrote.
+REPLICA_PIN_SECONDS = 15
+
+# Per-process caches suit a single process; CACHES_SHARED makes workers
+# refuse to start with one (core.apps.check_caches).
+CACHES_SHARED = False
+CACHES = {
+    # Counts, and the locks of core.caching that guard them.
+    'default': {
+        'BACKEND': os.getenv(
+            'DEFAULT_CACHE_BACKEND',
+            'django.core.cache.backends.locmem.LocMemCache',
+        ),
+        'LOCATION': os.getenv('DEFAULT_CACHE_LOCATION', ''),
+    },
+    # Feed versions and pages.
+    'feeds': {
+        'BACKEND': os.getenv(
+            'FEED_CACHE_BACKEND',
+            'django.core.cache.backends.locmem.LocMemCache',
+        ),
+        'LOCATION': os.getenv('FEED_CACHE_LOCATION', 'feeds'),
+    },
+    # Sessions and logged-in users. With several processes it must be a
+    # shared cache, or a password change logs other sessions out only on
+    # the process that handled it, after USERS_CACHE_TIMEOUT elsewhere.
+    'sessions': {
+        'BACKEND': os.getenv(
+            'SESSION_CACHE_BACKEND',
+            'django.core.cache.backends.locmem.LocMemCache',
+        ),
+        'LOCATION': os.getenv('SESSION_CACHE_LOCATION', 'sessions'),
+    },
+}
+
+# Cached values recomputed by one worker at a time (core.caching): how
+# long a stale value is still served, how long the recomputing worker
+# holds the lock, how long the others wait on a miss, and how eagerly
+# values are refreshed before they go stale (0 disables it). A waiting
+# worker holds its request thread, so the wait is kept short.
+CACHE_STALE_TIMEOUT = 60 * 5
+CACHE_LOCK_TIMEOUT = 30
+CACHE_LOCK_WAIT = 0.5
+CACHE_EARLY_REFRESH = 1.0
+
+# Responses of at least COMPRESSION_MIN_LENGTH bytes are compressed by
+# core.middleware.CompressionMiddleware, which keeps the output for the
+# last COMPRESSION_CACHE_SIZE pages anonymous users get from the page
+# cache.
+COMPRESSION_MIN_LENGTH = 500
+COMPRESSION_GZIP_LEVEL = 6
+COMPRESSION_BROTLI_QUALITY = 5
+COMPRESSION_CACHE_SIZE = 256
+
+# Sessions are read from the cache and written through to the database,
+# which still has them after a cache flush.
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+SESSION_CACHE_ALIAS = 'sessions'
+
+# Logins go through the cached backend; ModelBackend still serves the
+# sessions created before it was added.
+AUTHENTICATION_BACKENDS = [
+    'users.backends.CachedModelBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
+USERS_CACHE_ALIAS = 'sessions'
+USERS_CACHE_TIMEOUT = 60 * 5
+
+
+AUTH_PASSWORD_VALIDATORS = [
+    {
+        'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.CommonPasswordValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator',
+    },
+]
+
+
+LANGUAGE_CODE = 'ru'
+
+TIME_ZONE = 'UTC'
+
+USE_I18N = True
+
+USE_L10N = True
+
+USE_TZ = True
+
+
+STATIC_URL = '/static/'
+STATICFILES_DIRS = (os.path.join(BASE_DIR, 'static'),)
+STATIC_ROOT = os.getenv('STATIC_ROOT', os.path.join(BASE_DIR, 'collected_static'))
+# Browser cache lifetime of static files served by core.views.static:
+# content-hashed names for a year, others for an hour.
+STATIC_MAX_AGE = 60 * 60 * 24 * 365
+STATIC_PLAIN_MAX_AGE = 60 * 60
+
+LOGIN_URL = 'users:login'
+LOGIN_REDIRECT_URL = 'posts:index'
+
+SITE_URL = os.getenv('SITE_URL', 'http://127.0.0.1:8000')
+
+# Side effects of writes go through core.tasks. Eager mode runs them
+# inline; set TASKS_EAGER=0 and start `manage.py run_tasks` to take them
+# off the request.
+TASKS_EAGER = os.getenv('TASKS_EAGER', '1') == '1'
+TASKS_MAX_ATTEMPTS = 3
+# Seconds before the first retry, doubled for every next one.
+TASKS_RETRY_DELAY = 10
+# Seconds after which a running task is considered abandoned.
+TASKS_LOCK_TIMEOUT = 60 * 5
+
+POSTS_COUNT_CACHE_TIMEOUT = 60 * 60
+POSTS_FEED_CACHE_ALIAS = 'feeds'
+POSTS_FEED_CACHE_TIMEOUT = 60 * 10
+# Numbered feed pages past this one are rendered without the cache.
+POSTS_FEED_CACHE_PAGES = 50
+# Cache feed and post pages for logged-in users too, with the per-user
+# fragments ({% hole %} tags, see core.holes) rendered for every request.
+POSTS_HOLE_PUNCHING = os.getenv('POSTS_HOLE_PUNCHING', '1') == '1'
+POSTS_API_LIMIT = 100
+POSTS_API_MAX_LIMIT = 1000
+POSTS_ESTIMATE_INDEX_COUNT = False
+# Home timelines: entries kept per reader, the subscriber count above
+# which an author or group is merged in on read instead of fanned out,
+# and how often (every Nth post) a fan-out trims its readers' timelines.
+POSTS_TIMELINE_LENGTH = 800
+POSTS_FANOUT_MAX_SUBSCRIBERS = 1000
+POSTS_TIMELINE_TRIM_EVERY = 50
+# Groups by slug and authors by username (posts.identity): entries kept
+# per process and for how long, how long a miss is remembered (creating
+# the object forgets it at once in the same process), and an optional
+# cache alias shared by all processes with its own timeout.
+POSTS_IDENTITY_CACHE_SIZE = 1000
+POSTS_IDENTITY_LOCAL_TIMEOUT = 30
+POSTS_IDENTITY_MISS_TIMEOUT = 5
+POSTS_IDENTITY_CACHE_ALIAS = os.getenv('POSTS_IDENTITY_CACHE_ALIAS') or None
+POSTS_IDENTITY_SHARED_TIMEOUT = 60 * 60
+
+# Share of requests measured by core.middleware.PerformanceMiddleware,
+# and whether every client gets their Server-Timing header (staff always
+# do).
+METRICS_SAMPLE_RATE = float(os.getenv('METRICS_SAMPLE_RATE', 1.0))
+METRICS_SLOW_REQUEST_MS = 500
+METRICS_SERVER_TIMING = DEBUG
+# The /metrics/ endpoint is routed only when enabled. With a token it
+# wants "Authorization: Bearer <token>", otherwise a client address from
+# the list; behind a proxy every address is the proxy's, so set a token.
+METRICS_ENDPOINT = os.getenv('METRICS_ENDPOINT', str(int(DEBUG))) == '1'
+METRICS_TOKEN = os.getenv('METRICS_TOKEN') or None
+METRICS_ALLOWED_IPS = ['127.0.0.1', '::1']
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'yatube.performance': {
+            'handlers': ['console'],
+            'level': os.getenv('METRICS_LOG_LEVEL', 'WARNING'),
+            'propagate': False,
+        },
+        'yatube.tasks': {
+            'handlers': ['console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+    },
+}
@@ -0,0 +1,9 @@
+import os
+
+from .base import *  # noqa: F401,F403
+from .base import BASE_DIR, SECRET_KEY
+
+SECRET_KEY = SECRET_KEY or '1(p=*jnp5v6%!*(s53@)wt7c%qr93u5h953gtof(^6ogn%ku&n'
+
+EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
@@ -0,0 +1,45 @@
+import os
+
+from .base import *  # noqa: F401,F403
+from .base import INSTALLED_APPS, MIDDLEWARE, TEMPLATES
+
+# SECRET_KEY comes only from DJANGO_SECRET_KEY; Django refuses to start
+# without it.
+
+# Feed versions, count invalidation, the locks of core.caching and
+# logouts must reach every worker: workers refuse to start with a
+# per-process cache. DEFAULT_CACHE_*, FEED_CACHE_* and SESSION_CACHE_*
+# name the shared backends.
+CACHES_SHARED = True
+
+# The admin, and the messages framework only it uses, are loaded only
+# with DJANGO_ADMIN=1; every other worker boots and serves without them.
+ADMIN_ENABLED = os.getenv('DJANGO_ADMIN', '0') == '1'
+if not ADMIN_ENABLED:
+    INSTALLED_APPS = [
+        app for app in INSTALLED_APPS
+        if app not in ('django.contrib.admin', 'django.contrib.messages')
+    ]
+    MIDDLEWARE = [
+        middleware for middleware in MIDDLEWARE
+        if middleware != 'django.contrib.messages.middleware.MessageMiddleware'
+    ]
+TEMPLATES[0]['OPTIONS']['context_processors'] = [
+    processor for processor in TEMPLATES[0]['OPTIONS']['context_processors']
+    if processor != 'django.template.context_processors.debug'
+    and (ADMIN_ENABLED or 'messages' not in processor)
+]
+
+EMAIL_BACKEND = os.getenv(
+    'EMAIL_BACKEND', 'django.core.mail.backends.smtp.EmailBackend'
+)
+EMAIL_HOST = os.getenv('EMAIL_HOST', 'localhost')
+
+# Side effects of writes run in `manage.py run_tasks` workers.
+TASKS_EAGER = os.getenv('TASKS_EAGER', '0') == '1'
+
+# Workers parse the templates before taking traffic.
+TEMPLATES_WARMUP = os.getenv('TEMPLATES_WARMUP', '1') == '1'
+
+# collectstatic writes content-hashed and precompressed static files.
+STATICFILES_STORAGE = 'core.storage.CompressedManifestStaticFilesStorage'
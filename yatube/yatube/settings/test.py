@@ -0,0 +1,13 @@
+from .base import *  # noqa: F401,F403
+from .base import SECRET_KEY
+
+SECRET_KEY = SECRET_KEY or 'test-secret-key'
+
+# Hashing with PBKDF2 dominates tests that create or log in users.
+PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+
+TASKS_EAGER = True
+
+METRICS_ENDPOINT = True
@@ -1,10 +1,29 @@
+import re
+
+from core.views import metrics, static
+from django.apps import apps
+from django.conf import settings
 from django.contrib import admin
-from django.urls import include, path
+from django.urls import include, path, re_path
 
 urlpatterns = [
     path('', include('posts.urls', namespace='posts')),
-    path('admin/', admin.site.urls),
     path('auth/', include('users.urls', namespace='users')),
     path('auth/', include('django.contrib.auth.urls')),
     path('about/', include('about.urls', namespace='about')),
 ]
+
+if settings.METRICS_ENDPOINT:
+    urlpatterns.append(path('metrics/', metrics, name='metrics'))
+
+# The prod profile leaves the admin out unless DJANGO_ADMIN=1.
+if apps.is_installed('django.contrib.admin'):
+    urlpatterns.append(path('admin/', admin.site.urls))
+
+# Collected static files, for deployments without a web server in front.
+# Under DEBUG runserver serves STATICFILES_DIRS before this is reached.
+if settings.STATIC_URL.startswith('/'):
+    prefix = re.escape(settings.STATIC_URL[1:])
+    urlpatterns.append(
+        re_path(rf'^{prefix}(?P<path>.*)$', static, name='static')
+    )
@@ -3,5 +3,7 @@ import os
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yatube.settings')
+# Servers run production unless told otherwise; dev is for manage.py.
+os.environ.setdefault('DJANGO_ENV', 'prod')
 
 application = get_wsgi_application()